@@ -0,0 +1,113 @@
+import gc
+import math
+import statistics
+import unittest
+
+import hypothesis
+from hypothesis.strategies import floats, integers, lists, one_of, sampled_from, tuples
+
+from traitlite import traited, traits
+from traitlite.indexing import Indexed
+
+
+class TestAggregate(unittest.TestCase):
+    @hypothesis.given(lists(tuples(integers(0, 9),
+                                   one_of(integers(-100, 100), floats(-1e6, 1e6),
+                                          sampled_from([None, math.nan, 'a'])))))
+    def test_same_as_scan(self, assignments):
+        """Test the aggregates against computing them from all values."""
+        class Foo:
+            a = traits.BaseTrait()
+        stats = Foo.a.aggregate('count', 'sum', 'mean', 'min', 'max')
+        foos = [Foo() for _ in range(10)]
+        for i, value in assignments:
+            foos[i].a = value
+
+        values = [value for value in Foo.a.value.values()
+                  if isinstance(value, (int, float)) and not math.isnan(value)]
+        self.assertEqual(stats.count, len(values))
+        self.assertAlmostEqual(stats.sum, math.fsum(values), delta=1e-6)
+        if values:
+            self.assertAlmostEqual(stats.mean, statistics.fmean(values), delta=1e-6)
+            self.assertEqual(stats.min, min(values))
+            self.assertEqual(stats.max, max(values))
+        else:
+            self.assertIsNone(stats.mean)
+            self.assertIsNone(stats.min)
+            self.assertIsNone(stats.max)
+
+    def test_gc(self):
+        """Test that collected objects are removed from the aggregates."""
+        class Foo:
+            a = traits.TypeChecked(int)
+        foos = [Foo() for _ in range(5)]
+        for i, foo in enumerate(foos):
+            foo.a = i
+        stats = Foo.a.aggregate('max')
+        self.assertEqual((stats.count, stats.sum, stats.max), (5, 10, 4))
+
+        del foos[3:], foo
+        gc.collect()
+        self.assertEqual((stats.count, stats.sum, stats.max), (3, 3, 2))
+        self.assertEqual(stats['mean'], 1)
+
+    def test_same_aggregate(self):
+        """Test that a trait has a single aggregate, which can add min and max later."""
+        class Foo:
+            a = traits.BaseTrait()
+        foo = Foo()
+        foo.a = 3
+        stats = Foo.a.aggregate('sum')
+        with self.assertRaises(Exception):
+            stats.min
+        self.assertIs(Foo.a.aggregate('min'), stats)
+        self.assertEqual(stats.min, 3)
+        with self.assertRaises(Exception):
+            Foo.a.aggregate('median')
+
+    def test_stale_entries(self):
+        """Test that replaced values do not pile up in the heaps."""
+        class Foo:
+            a = traits.BaseTrait()
+        stats = Foo.a.aggregate('min', 'max')
+        foo = Foo()
+        for i in range(1000):
+            foo.a = i
+        self.assertEqual((stats.min, stats.max, stats.count), (999, 999, 1))
+        self.assertLess(len(stats.heaps['max'].entries), 100)
+
+    def test_float_sum(self):
+        """Test that adding and removing floats does not accumulate errors."""
+        class Foo:
+            a = traits.BaseTrait()
+        stats = Foo.a.aggregate('sum')
+        foo, bar = Foo(), Foo()
+        foo.a = 1.0
+        for _ in range(1000):
+            bar.a = 1e16
+            bar.a = 0.1
+        self.assertEqual(stats.sum, 1.1)
+
+    def test_combined(self):
+        """Test aggregates of a trait whose storage is already observed."""
+        class Foo:
+            a = Indexed()
+        foo = Foo()
+        foo.a = 2
+        stats = Foo.a.aggregate('max')
+        Foo().a = 1
+        self.assertEqual(Foo.a.find(2), [foo])
+        self.assertEqual((stats.count, stats.max), (1, 2))
+
+    def test_traited(self):
+        """Test aggregates of a field, which the generated __init__ sets directly."""
+        @traited
+        class Conn:
+            sent: int
+
+        first = Conn(3)
+        stats = Conn.sent.aggregate('sum', 'max')
+        second = Conn(7)
+        self.assertEqual(second.sent, 7)
+        self.assertEqual((stats.count, stats.sum, stats.max), (2, 10, 7))
+        self.assertEqual(first.sent, 3)
@@ -0,0 +1,105 @@
+import gc
+import unittest
+
+import hypothesis
+from hypothesis.strategies import integers, lists, sampled_from
+
+from traitlite import traits
+from traitlite.choices import Choice, ChoiceStorage
+from traitlite.indexing import Indexed, RangeIndexed
+
+STATUSES = ['queued', 'running', 'done', 'failed']
+
+
+class TestChoice(unittest.TestCase):
+    def test_choice(self):
+        class Foo:
+            a = Choice(STATUSES)
+
+        foo = Foo()
+        with self.assertRaises(AttributeError):
+            foo.a
+        foo.a = ''.join(['do', 'ne'])
+        self.assertIs(foo.a, STATUSES[2])
+        # The storage only keeps the code.
+        self.assertEqual(Foo.a.value.data[id(foo)], 2)
+
+        for value in ['paused', None, ['done']]:
+            with self.assertRaises(Exception):
+                foo.a = value
+        self.assertEqual(foo.a, 'done')
+
+    def test_definition(self):
+        with self.assertRaises(Exception):
+            Choice([])
+        with self.assertRaises(Exception):
+            Choice([[1]])
+        self.assertEqual(Choice([1, 2, 1]).choices, (1, 2))
+
+    def test_equal_values(self):
+        """Test that values equal to a choice return the choice."""
+        class Foo:
+            a = Choice([1, 'b'])
+
+        foo = Foo()
+        foo.a = True
+        self.assertIs(foo.a, 1)
+
+    @hypothesis.given(lists(sampled_from(STATUSES)))
+    def test_combined(self, values):
+        """Test that callbacks and indexes see the values, not the codes."""
+        changes = []
+
+        class Foo:
+            a = Choice(STATUSES) + traits.HasCallbackDelta(
+                [lambda old, new: changes.append((old, new))])
+            b = Indexed() + Choice(STATUSES)
+
+        foos = [Foo() for _ in values]
+        foo = None
+        for foo, value in zip(foos, values):
+            foo.a = value
+            foo.a = 'done'
+            foo.b = value
+        self.assertEqual(changes, [x for value in values for x in ((None, value), (value, 'done'))])
+        for value in STATUSES:
+            self.assertEqual(Foo.b.count(value), values.count(value))
+        self.assertIsInstance(Foo.b.value, ChoiceStorage)
+
+        del foos, foo
+        gc.collect()
+        self.assertEqual(list(Foo.b.distinct()), [])
+
+    def test_indexed(self):
+        """Test that indexes find the objects whichever order the traits were added in."""
+        class Foo:
+            a = Indexed() + Choice(['x', 'y'])
+            b = Choice(['x', 'y']) + Indexed()
+            c = RangeIndexed() + Choice([1, 2, 3])
+            d = Choice([1, 2, 3]) + RangeIndexed()
+
+        foo, bar = Foo(), Foo()
+        foo.a = foo.b = 'x'
+        bar.a = bar.b = 'y'
+        foo.c = foo.d = 3
+        bar.c = bar.d = 1
+        for trait in [Foo.a, Foo.b]:
+            self.assertIsInstance(trait.value, ChoiceStorage)
+            self.assertEqual((trait.find('x'), trait.count('x')), ([foo], 1))
+            self.assertEqual(trait.find('y'), [bar])
+        for trait in [Foo.c, Foo.d]:
+            self.assertIsInstance(trait.value, ChoiceStorage)
+            self.assertEqual(trait.top_k(1), [foo])
+            self.assertEqual(trait.range(1, 2), [bar])
+
+    @hypothesis.given(lists(integers(0, 3), min_size=1))
+    def test_aggregate(self, values):
+        class Foo:
+            a = Choice([0, 1, 2, 3])
+
+        stats = Foo.a.aggregate('sum', 'max')
+        foos = [Foo() for _ in values]
+        for foo, value in zip(foos, values):
+            foo.a = value
+        self.assertEqual(stats.sum, sum(values))
+        self.assertEqual(stats.max, max(values))
@@ -0,0 +1,370 @@
+import copy
+import unittest
+from unittest.mock import patch
+
+import hypothesis
+from hypothesis.strategies import integers, lists, text
+
+from traitlite import containers
+from traitlite import traits
+
+
+class TestTypedList(unittest.TestCase):
+    def setUp(self):
+        class Foo:
+            a = containers.TypedList(int)
+        self.Foo = Foo
+        self.foo = Foo()
+        self.foo.a = [1, 2]
+
+    @hypothesis.given(lists(integers()))
+    def test__set__(self, list_):
+        """Test that assigning a list stores a tracked copy."""
+        self.foo.a = list_
+        self.assertEqual(self.foo.a, list_)
+        self.assertIsNot(self.foo.a, list_)
+        self.assertIsInstance(self.foo.a, list)
+
+    def test__set__wrong_type(self):
+        """Test that assigning a wrong container or wrong items fails."""
+        with self.assertRaisesRegex(Exception, 'is of type'):
+            self.foo.a = (1, 2)
+        with self.assertRaisesRegex(Exception, "contain items of type 'int', not 'str'"):
+            self.foo.a = [1, 'a']
+        with self.assertRaisesRegex(Exception, 'contain items'):
+            self.foo.a = [True]
+        self.assertEqual(self.foo.a, [1, 2])
+
+    def test_mutation(self):
+        """Test that in-place changes are checked."""
+        a = self.foo.a
+        a.append(3)
+        a.extend([4, 5])
+        a.insert(0, 0)
+        a[0] = -1
+        a[1:2] = [10, 11]
+        a += [6]
+        self.assertEqual(self.foo.a, [-1, 10, 11, 2, 3, 4, 5, 6])
+
+        for change in [
+                lambda: a.append('a'),
+                lambda: a.extend([7, 'a']),
+                lambda: a.insert(0, 1.0),
+                lambda: a.__setitem__(0, None),
+                lambda: a.__setitem__(slice(0, 1), ['a']),
+                lambda: a.__iadd__(['a'])]:
+            with self.assertRaisesRegex(Exception, 'contain items'):
+                change()
+
+        # Failed changes leave the list untouched.
+        self.assertEqual(self.foo.a, [-1, 10, 11, 2, 3, 4, 5, 6])
+
+    def test_only_new_items_checked(self):
+        """Test that appending does not check the existing items."""
+        self.foo.a = list(range(1000))
+
+        checked = []
+        check_items = self.Foo.a.check_items
+        with patch.object(self.Foo.a, 'check_items',
+                          side_effect=lambda obj, items: (checked.extend(items),
+                                                          check_items(obj, items))):
+            self.foo.a.append(1)
+        self.assertEqual(checked, [1])
+
+    def test_augmented_assignment(self):
+        """Test that ``+=`` keeps the stored list and only checks the new items."""
+        self.foo.a = list(range(1000))
+        a = self.foo.a
+
+        checked = []
+        check_items = self.Foo.a.check_items
+        with patch.object(self.Foo.a, 'check_items',
+                          side_effect=lambda obj, items: (checked.extend(items),
+                                                          check_items(obj, items))):
+            self.foo.a += [1]
+        self.assertEqual(checked, [1])
+        self.assertIs(self.foo.a, a)
+
+    def test_copy(self):
+        """Test that copies of the stored list are plain lists."""
+        self.assertIs(type(copy.copy(self.foo.a)), list)
+        self.assertIs(type(copy.deepcopy(self.foo.a)), list)
+
+    def test_combined(self):
+        """Test combining container traits with other traits."""
+        class Foo:
+            a = containers.TypedList(int) + traits.ReadOnly()
+        foo = Foo()
+        foo.a = [1]
+        foo.a.append(2)
+        with self.assertRaisesRegex(Exception, 'read-only'):
+            foo.a = []
+        with self.assertRaisesRegex(Exception, 'contain items'):
+            foo.a.append('a')
+
+
+class TestTypedDict(unittest.TestCase):
+    # The keys used by the test itself are left out of the generated keys.
+    @hypothesis.given(lists(text().filter(lambda key: key not in {'new', 'v', 'w', 'x', 'y', 'z'})))
+    def test_mutation(self, keys):
+        """Test that in-place changes are checked."""
+        class Foo:
+            a = containers.TypedDict(str, float)
+        foo = Foo()
+        foo.a = {key: 1.0 for key in keys}
+
+        foo.a['x'] = 2.0
+        foo.a.update({'y': 3.0}, z=4.0)
+        foo.a.setdefault('w', 5.0)
+        foo.a |= {'v': 6.0}
+        self.assertEqual(foo.a['z'], 4.0)
+
+        with self.assertRaisesRegex(Exception, 'contain keys'):
+            foo.a[1] = 1.0
+        with self.assertRaisesRegex(Exception, 'contain values'):
+            foo.a['x'] = 1
+        with self.assertRaisesRegex(Exception, 'contain values'):
+            foo.a.update(x=1.0, y='a')
+        with self.assertRaisesRegex(Exception, 'contain values'):
+            foo.a.setdefault('new')
+        with self.assertRaisesRegex(Exception, 'contain values'):
+            foo.a = {'a': None}
+        self.assertEqual(foo.a['x'], 2.0)
+        self.assertEqual(foo.a['y'], 3.0)
+
+        # setdefault on an existing key does not add anything.
+        foo.a.setdefault('x')
+
+
+class TestTypedSet(unittest.TestCase):
+    def test_mutation(self):
+        """Test that in-place changes are checked."""
+        class Foo:
+            a = containers.TypedSet(str)
+        foo = Foo()
+        foo.a = {'a'}
+
+        foo.a.add('b')
+        foo.a.update(['c'], {'d'})
+        foo.a |= {'e'}
+        foo.a ^= {'a', 'f'}
+        self.assertEqual(foo.a, {'b', 'c', 'd', 'e', 'f'})
+
+        for change in [
+                lambda: foo.a.add(1),
+                lambda: foo.a.update(['g'], [1]),
+                lambda: foo.a.__ior__({1}),
+                lambda: foo.a.__ixor__({1})]:
+            with self.assertRaisesRegex(Exception, 'contain items'):
+                change()
+        self.assertEqual(foo.a, {'b', 'c', 'd', 'e', 'f'})
+
+        with self.assertRaisesRegex(Exception, 'is of type'):
+            foo.a = ['a']
+
+
+def apply_list_change(list_, change):
+    list_[change.index:change.index + len(change.removed)] = change.added
+
+
+def apply_dict_change(dict_, change):
+    for key in change.removed:
+        del dict_[key]
+    dict_.update(change.added)
+
+
+class TestObservableList(unittest.TestCase):
+    def setUp(self):
+        class Foo:
+            a = containers.ObservableList()
+        self.foo = Foo()
+        self.foo.a = []
+
+        # Keep a mirror of the list which is only updated through the change
+        # records.
+        self.changes = []
+        self.mirror = []
+
+        def callback(change):
+            self.changes.append(change)
+            apply_list_change(self.mirror, change)
+
+        Foo.a.add_callback(self.foo, callback)
+
+    def test_assignment(self):
+        """Test that assigning reports the whole list as replaced."""
+        self.foo.a = [1, 2]
+        self.assertEqual(self.changes, [containers.ListChange(0, [], [1, 2])])
+        self.foo.a = [3]
+        self.assertEqual(self.changes[-1], containers.ListChange(0, [1, 2], [3]))
+
+    def test_replaced_list(self):
+        """Test that a replaced list no longer reports or checks its changes."""
+        self.foo.a = [1, 2]
+        old = self.foo.a
+        self.foo.a = [7]
+        old.append(99)
+        self.assertEqual(self.changes[-1], containers.ListChange(0, [1, 2], [7]))
+        self.assertEqual(self.mirror, [7])
+
+    def test_augmented_assignment(self):
+        """Test that ``+=`` only reports the added items."""
+        self.foo.a = [1, 2]
+        self.foo.a += [3]
+        self.assertEqual(self.changes[-1], containers.ListChange(2, [], [3]))
+        self.assertEqual(len(self.changes), 2)
+        self.assertEqual(self.mirror, [1, 2, 3])
+
+    def test_changes(self):
+        """Test the change records of single operations."""
+        a = self.foo.a
+        a.extend([1, 2, 3])
+        self.assertEqual(self.changes[-1], containers.ListChange(0, [], [1, 2, 3]))
+        a.append(4)
+        self.assertEqual(self.changes[-1], containers.ListChange(3, [], [4]))
+        a[-1] = 5
+        self.assertEqual(self.changes[-1], containers.ListChange(3, [4], [5]))
+        del a[0]
+        self.assertEqual(self.changes[-1], containers.ListChange(0, [1], []))
+        a.pop()
+        self.assertEqual(self.changes[-1], containers.ListChange(2, [5], []))
+        self.assertEqual(self.mirror, [2, 3])
+
+    @hypothesis.settings(max_examples=50)
+    @hypothesis.given(lists(integers(0, 12), max_size=30), lists(integers(-5, 5), max_size=10))
+    def test_mirror(self, operations, values):
+        """Test that applying the change records reproduces the list."""
+        a = self.foo.a
+        a.extend(values)
+        for operation, value in zip(operations, values * 3):
+            if operation == 0:
+                a.append(value)
+            elif operation == 1:
+                a.insert(value, value)
+            elif operation == 2 and a:
+                a[value % len(a)] = value
+            elif operation == 3:
+                a[value:value + 2] = [value] * 3
+            elif operation == 4:
+                a[::2] = [value] * len(a[::2])
+            elif operation == 5 and a:
+                del a[value % len(a)]
+            elif operation == 6:
+                del a[::3]
+            elif operation == 7 and a:
+                a.pop(value % len(a))
+            elif operation == 8 and value in a:
+                a.remove(value)
+            elif operation == 9:
+                a.sort()
+            elif operation == 10:
+                a.reverse()
+            elif operation == 11:
+                a *= value % 3
+            elif operation == 12:
+                a += [value]
+            self.assertEqual(self.mirror, a)
+
+    def test_typed_and_observable(self):
+        """Test that typed and observable container traits can be combined."""
+        changes = []
+
+        class Foo:
+            a = containers.TypedList(int) + containers.ObservableList(
+                [lambda change: changes.append(change)])
+        foo = Foo()
+        foo.a = [1]
+        foo.a.append(2)
+        with self.assertRaisesRegex(Exception, 'contain items'):
+            foo.a.append('a')
+        self.assertEqual(len(changes), 2)
+
+    def test_bad_callback(self):
+        with self.assertRaisesRegex(Exception, 'a single'):
+            containers.ObservableList([lambda a, b: None])
+
+
+class TestObservableDict(unittest.TestCase):
+    @hypothesis.settings(max_examples=50)
+    @hypothesis.given(lists(integers(0, 7), max_size=30), lists(integers(0, 5), min_size=1))
+    def test_mirror(self, operations, keys):
+        """Test that applying the change records reproduces the dict."""
+        class Foo:
+            a = containers.ObservableDict()
+        foo = Foo()
+        mirror = {}
+        Foo.a.add_callback(foo, lambda change: apply_dict_change(mirror, change))
+
+        foo.a = {key: key for key in keys}
+        d = foo.a
+        for operation, key in zip(operations, keys * 10):
+            if operation == 0:
+                d[key] = -key
+            elif operation == 1:
+                d.update({key: 1, key + 1: 2})
+            elif operation == 2:
+                d.setdefault(key, 3)
+            elif operation == 3 and key in d:
+                del d[key]
+            elif operation == 4:
+                d.pop(key, None)
+            elif operation == 5 and d:
+                d.popitem()
+            elif operation == 6:
+                d.clear()
+            elif operation == 7:
+                d |= {key: 4}
+            self.assertEqual(mirror, d)
+
+
+class TestObservableSet(unittest.TestCase):
+    @hypothesis.settings(max_examples=50)
+    @hypothesis.given(lists(integers(0, 9), max_size=30), lists(integers(0, 5), min_size=1))
+    def test_mirror(self, operations, items):
+        """Test that applying the change records reproduces the set."""
+        class Foo:
+            a = containers.ObservableSet()
+        foo = Foo()
+        mirror = set()
+
+        def callback(change):
+            self.assertFalse(change.removed & change.added)
+            mirror.difference_update(change.removed)
+            mirror.update(change.added)
+
+        Foo.a.add_callback(foo, callback)
+
+        foo.a = set(items)
+        s = foo.a
+        for operation, item in zip(operations, items * 10):
+            if operation == 0:
+                s.add(item)
+            elif operation == 1:
+                s.update([item, item + 1])
+            elif operation == 2:
+                s ^= {item, item + 2}
+            elif operation == 3:
+                s.discard(item)
+            elif operation == 4 and s:
+                s.pop()
+            elif operation == 5:
+                s.clear()
+            elif operation == 6:
+                s -= {item}
+            elif operation == 7:
+                s &= {item, item + 1}
+            elif operation == 8:
+                s |= {item}
+            elif operation == 9 and item in s:
+                s.remove(item)
+            self.assertEqual(mirror, s)
+
+    def test_augmented_assignment(self):
+        class Foo:
+            a = containers.ObservableSet()
+        foo = Foo()
+        foo.a = {1}
+        changes = []
+        Foo.a.add_callback(foo, changes.append)
+        foo.a |= {1, 2}
+        self.assertEqual(changes, [containers.SetChange(set(), {2})])
@@ -1,7 +1,7 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
-from traitlite import debug
+from traitlite import debug, traits
 
 
 class TestBreakOnRead(unittest.TestCase):
@@ -111,3 +111,162 @@ class TestBreakOnChangeDelta(unittest.TestCase):
             # Called because the new value is lower than the old.
             foo.bar = 3
             mock.assert_called_once()
+
+
+class TestArm(unittest.TestCase):
+    def tearDown(self):
+        debug.arm()
+
+    def test_disarm(self):
+        """Test that disarmed traits only store the value."""
+        class Foo:
+            bar = debug.BreakOnRead()
+            fizz = debug.BreakOnWrite() + traits.TypeChecked(int)
+            buzz = debug.BreakOnChange(lambda value: True)
+            condition = MagicMock()
+            delta = debug.BreakOnChangeDelta(condition)
+
+        debug.disarm()
+        self.assertIs(type(Foo.bar).__get__, traits.BaseTrait.__get__)
+        self.assertIs(type(Foo.bar).__set__, traits.BaseTrait.__set__)
+        self.assertIs(type(Foo.buzz).__set__, traits.HasCallback.__set__)
+        self.assertFalse(debug.is_armed(Foo.fizz))
+
+        foo = Foo()
+        with patch('sys.breakpointhook') as mock:
+            foo.bar = 1
+            foo.fizz = 2
+            foo.buzz = 3
+            foo.delta = 4
+            self.assertEqual((foo.bar, foo.fizz, foo.buzz, foo.delta), (1, 2, 3, 4))
+            mock.assert_not_called()
+            Foo.condition.assert_not_called()
+
+            # Combined traits keep the other traits.
+            with self.assertRaises(Exception):
+                foo.fizz = 'a'
+
+            debug.arm()
+            foo.fizz = 3
+            foo.delta = 5
+            self.assertEqual(mock.call_count, 2)
+            Foo.condition.assert_called_once_with(4, 5)
+            self.assertEqual(foo.fizz, 3)
+
+    def test_arm_class_and_attribute(self):
+        """Test arming the traits of a single class or attribute."""
+        # The traits are looked up with vars, since reading an armed
+        # BreakOnRead from the class starts the debugger.
+        class Foo:
+            bar = debug.BreakOnRead()
+            fizz = debug.BreakOnRead()
+
+        class Bar:
+            bar = debug.BreakOnRead()
+
+        debug.disarm()
+        debug.arm(Foo, 'bar')
+        self.assertTrue(debug.is_armed(vars(Foo)['bar']))
+        self.assertFalse(debug.is_armed(vars(Foo)['fizz']))
+        self.assertFalse(debug.is_armed(vars(Bar)['bar']))
+
+        debug.arm(Foo)
+        self.assertTrue(debug.is_armed(vars(Foo)['fizz']))
+        self.assertFalse(debug.is_armed(vars(Bar)['bar']))
+
+        debug.disarm(Foo)
+        self.assertFalse(debug.is_armed(vars(Foo)['bar']))
+
+    def test_new_traits(self):
+        """Test that traits added to a class while disarmed are disarmed."""
+        debug.disarm()
+
+        class Foo:
+            bar = debug.BreakOnRead()
+
+        self.assertFalse(debug.is_armed(vars(Foo)['bar']))
+
+    def test_environment(self):
+        """Test that the default comes from the environment."""
+        environments = [
+            ({}, True),
+            ({'PYTHONBREAKPOINT': '0'}, False),
+            ({'PYTHONBREAKPOINT': '0', 'TRAITLITE_DEBUG': '1'}, True),
+            ({'TRAITLITE_DEBUG': '0'}, False),
+        ]
+        for environment, armed in environments:
+            with patch.dict('os.environ', environment, clear=True):
+                self.assertEqual(debug._armed_by_default(), armed)
+
+
+class TestWatch(unittest.TestCase):
+    def test_records(self):
+        """Test that reads and writes are recorded with their stack."""
+        class Foo:
+            bar = debug.Watch(stack_depth=2)
+        foo = Foo()
+
+        foo.bar = [1]
+        _ = foo.bar
+        self.assertEqual([record['event'] for record in Foo.bar.records], ['write', 'read'])
+
+        record = Foo.bar.records[0]
+        self.assertEqual(record['owner'], 'Foo')
+        self.assertEqual(record['attribute'], 'bar')
+        self.assertEqual(record['id'], id(foo))
+        self.assertEqual(record['value'], '[1]')
+        self.assertEqual(len(record['stack']), 2)
+        self.assertIn('in test_records', record['stack'][0])
+
+    def test_sampling(self):
+        """Test that only a fraction of the accesses is recorded."""
+        class Foo:
+            bar = debug.Watch(rate=0.1, reads=False, capacity=10000)
+        foo = Foo()
+
+        for i in range(10000):
+            foo.bar = i
+            _ = foo.bar
+        self.assertEqual(Foo.bar.accesses, 10000)
+        self.assertTrue(500 < len(Foo.bar.records) < 1500)
+
+        Foo.bar.clear()
+        self.assertEqual(len(Foo.bar.records), 0)
+
+    def test_capacity(self):
+        """Test that the buffer keeps the latest records."""
+        class Foo:
+            bar = debug.Watch(capacity=3)
+        foo = Foo()
+
+        for i in range(10):
+            foo.bar = i
+        self.assertEqual([record['value'] for record in Foo.bar.records], ['7', '8', '9'])
+
+    def test_export(self):
+        """Test exporting the records as JSON lines."""
+        import io
+        import json
+
+        class Foo:
+            bar = debug.Watch(reads=False, max_value_length=3)
+        foo = Foo()
+        foo.bar = 'abcdef'
+        foo.bar = 2
+
+        file = io.StringIO()
+        lines = Foo.bar.export(file)
+        self.assertEqual(file.getvalue(), lines)
+        records = [json.loads(line) for line in lines.splitlines()]
+        self.assertEqual([record['value'] for record in records], ["'ab", '2'])
+
+    def test_not_disarmed(self):
+        class Foo:
+            bar = debug.Watch()
+
+        debug.disarm()
+        try:
+            Foo().bar = 1
+        finally:
+            debug.arm()
+        self.assertEqual(len(Foo.bar.records), 1)
@@ -0,0 +1,108 @@
+import unittest
+
+import hypothesis
+from hypothesis.strategies import integers, text
+
+from traitlite import traits
+from traitlite import field, traited
+from traitlite.frozen import freeze, freeze_after_init, frozen_class, trait_names
+
+
+class Point:
+    x = traits.TypeChecked(int) + traits.ReadOnly()
+    y = traits.ReadOnly()
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def norm(self):
+        return abs(self.x) + abs(self.y)
+
+
+class TestFreeze(unittest.TestCase):
+    def test_values(self):
+        point = Point(1, 2)
+        point.label = 'a'
+        frozen = freeze(point)
+
+        self.assertEqual((frozen.x, frozen.y, frozen.label), (1, 2, 'a'))
+        self.assertIsInstance(frozen, Point)
+        self.assertEqual(frozen.norm(), 3)
+
+        # The values are kept in slots instead of in the traits.
+        self.assertNotIn(frozen, Point.x.value)
+        self.assertIs(type(frozen), frozen_class(Point))
+        self.assertIs(freeze(frozen), frozen)
+
+    def test_immutable(self):
+        frozen = freeze(Point(1, 2))
+        with self.assertRaises(Exception):
+            frozen.x = 3
+        with self.assertRaises(Exception):
+            frozen.label = 'a'
+        with self.assertRaises(Exception):
+            del frozen.y
+
+    def test_unset(self):
+        """Test that traits which were never set stay unset."""
+        point = Point.__new__(Point)
+        point.x = 1
+        frozen = freeze(point)
+        self.assertEqual(frozen.x, 1)
+        with self.assertRaises(AttributeError):
+            frozen.y
+
+    @hypothesis.given(integers(), text(), integers(), text())
+    def test_hash_and_eq(self, x1, y1, x2, y2):
+        a = freeze(Point(x1, y1))
+        b = freeze(Point(x2, y2))
+        self.assertEqual(a == b, (x1, y1) == (x2, y2))
+        if a == b:
+            self.assertEqual(hash(a), hash(b))
+        self.assertEqual({a: 1}[freeze(Point(x1, y1))], 1)
+
+    def test_subclass(self):
+        class Point3(Point):
+            z = traits.ReadOnly()
+
+            def __init__(self, x, y, z):
+                super().__init__(x, y)
+                self.z = z
+
+        self.assertEqual(trait_names(Point3), ('x', 'y', 'z'))
+        frozen = freeze(Point3(1, 2, 3))
+        self.assertEqual((frozen.x, frozen.y, frozen.z), (1, 2, 3))
+        self.assertNotEqual(frozen, freeze(Point(1, 2)))
+
+    def test_traited(self):
+        @traited
+        class Foo:
+            a: int = field(read_only=True)
+            b: str = 'b'
+
+        frozen = freeze(Foo(1))
+        self.assertEqual(repr(frozen), repr(Foo(1)))
+        self.assertEqual(frozen, freeze(Foo(1)))
+
+
+class TestFreezeAfterInit(unittest.TestCase):
+    def test_freeze_after_init(self):
+        @freeze_after_init
+        class Foo:
+            a = traits.TypeChecked(int) + traits.ReadOnly()
+
+            def __init__(self, a):
+                self.a = a
+
+        foo = Foo(3)
+        self.assertIsInstance(foo, Foo)
+        self.assertEqual(foo.a, 3)
+        self.assertEqual(foo, Foo(3))
+        self.assertEqual(len({foo, Foo(3), Foo(4)}), 2)
+        with self.assertRaises(Exception):
+            foo.a = 4
+
+        # __init__ still runs the traits.
+        with self.assertRaises(Exception):
+            Foo('a')
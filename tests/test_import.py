@@ -0,0 +1,103 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+# The cumulative time `import traitlite` may take, in microseconds, as reported
+# by `python -X importtime`. This is generous so that slow machines do not fail,
+# but it is well below the time it takes to import typing and inspect.
+IMPORT_TIME_BUDGET = 20000
+
+# Modules which must not be imported by `import traitlite`.
+DEFERRED_MODULES = [
+    'copy',
+    'inspect',
+    'typing',
+    'traitlite.debug',
+]
+
+
+def import_traitlite(*arguments, cache=None):
+    """
+    Import traitlite in a fresh interpreter and return its stderr and stdout.
+    If given, bytecode is cached in the ``cache`` directory.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    env = dict(os.environ)
+    if cache is not None:
+        # Without cached bytecode, the time to compile the modules would be
+        # measured as well, which an installed package does not pay. The cache
+        # is kept out of the source tree.
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+        env['PYTHONPYCACHEPREFIX'] = cache
+
+    result = subprocess.run(
+        [sys.executable, *arguments, '-c',
+         'import sys, traitlite; print(" ".join(sys.modules))'],
+        cwd=root,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    return result.stderr, result.stdout
+
+
+class TestImport(unittest.TestCase):
+    def test_import_time(self):
+        """Test that importing traitlite stays within the time budget."""
+        with tempfile.TemporaryDirectory() as cache:
+            # The first import writes the bytecode cache.
+            import_traitlite(cache=cache)
+            stderr, _ = import_traitlite('-X', 'importtime', cache=cache)
+
+        # Each line looks like "import time: self | cumulative | name".
+        times = {}
+        for line in stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = line.split('|')
+            times[name.strip()] = int(cumulative)
+
+        self.assertIn('traitlite', times)
+        self.assertLess(times['traitlite'], IMPORT_TIME_BUDGET)
+
+    def test_deferred_modules(self):
+        """Test that expensive modules are not imported with traitlite."""
+        _, stdout = import_traitlite()
+        modules = stdout.split()
+        for module in DEFERRED_MODULES:
+            self.assertNotIn(module, modules)
+
+    def test_lazy_debug(self):
+        """Test that the debug traits are available from the package."""
+        import traitlite
+        from traitlite import debug
+
+        self.assertIs(traitlite.debug, debug)
+        self.assertIs(traitlite.BreakOnRead, debug.BreakOnRead)
+        self.assertIs(traitlite.BreakOnChangeDelta, debug.BreakOnChangeDelta)
+
+        with self.assertRaises(AttributeError):
+            traitlite.DoesNotExist
+
+
+class TestMro(unittest.TestCase):
+    def test_no_generic(self):
+        """Test that traits do not have typing.Generic in their mro at runtime."""
+        from typing import Generic
+        from traitlite import traits
+
+        for trait in [traits.BaseTrait, traits.HasCallback, traits.HasValidatorDelta]:
+            self.assertNotIn(Generic, trait.__mro__)
+
+    def test_subscript(self):
+        """Test that traits can still be subscripted in annotations."""
+        from traitlite import traits
+
+        self.assertIs(traits.BaseTrait[object, int], traits.BaseTrait)
+        self.assertIs(traits.HasCallback[object, int], traits.HasCallback)
@@ -0,0 +1,181 @@
+import gc
+import math
+import unittest
+
+import hypothesis
+from hypothesis.strategies import floats, integers, lists, one_of, sampled_from, tuples
+
+from traitlite import traits
+from traitlite.indexing import Indexed, RangeIndexed, _SortedList
+from traitlite.interning import Interned
+
+
+class Foo:
+    status = traits.TypeChecked(str) + Indexed()
+
+
+class TestIndexed(unittest.TestCase):
+    @hypothesis.given(lists(tuples(integers(0, 9), sampled_from(['ok', 'failed', 'retry']))))
+    def test_same_as_scan(self, assignments):
+        """Test that the index finds the same objects as a scan over all values."""
+        class Foo:
+            status = traits.TypeChecked(str) + Indexed()
+        foos = [Foo() for _ in range(10)]
+        for i, status in assignments:
+            foos[i].status = status
+
+        for status in ['ok', 'failed', 'retry']:
+            expected = [foo for foo in foos if Foo.status.value.get(foo) == status]
+            self.assertCountEqual(Foo.status.find(status), expected)
+            self.assertEqual(Foo.status.count(status), len(expected))
+        self.assertCountEqual(Foo.status.distinct(), set(Foo.status.value.values()))
+
+    def test_order(self):
+        """Test that objects are found in the order they were given the value."""
+        foos = [Foo() for _ in range(3)]
+        for foo in reversed(foos):
+            foo.status = 'ok'
+        self.assertEqual(Foo.status.find('ok'), foos[::-1])
+
+    def test_gc(self):
+        """Test that collected objects are removed from the index."""
+        class Bar:
+            status = Indexed()
+        bars = [Bar() for _ in range(5)]
+        for bar in bars:
+            bar.status = 'ok'
+        del bars[1:], bar
+        gc.collect()
+        self.assertEqual(Bar.status.find('ok'), bars)
+        self.assertEqual(Bar.status.count('ok'), 1)
+        self.assertEqual(Bar.status.find('failed'), [])
+
+    def test_unhashable(self):
+        class Bar:
+            value = Indexed()
+        bar = Bar()
+        bar.value = [1]
+        bar.value = 1
+        self.assertEqual(Bar.value.find(1), [bar])
+
+    def test_interned(self):
+        """Test combining the index with interned values."""
+        class Bar:
+            status = Interned() + Indexed()
+        bars = [Bar(), Bar()]
+        bars[0].status = ''.join(['o', 'k'])
+        bars[1].status = ''.join(['o', 'k'])
+        self.assertIs(bars[0].status, bars[1].status)
+        self.assertEqual(Bar.status.find('ok'), bars)
+
+
+class TestSortedList(unittest.TestCase):
+    @hypothesis.given(lists(tuples(sampled_from(['add', 'remove']), integers(0, 20),
+                                   integers(0, 3))))
+    def test_same_as_list(self, operations):
+        """Test the buckets against a plain sorted list, with small buckets."""
+        items = _SortedList(load=2)
+        expected = []
+        for operation, value, key_id in operations:
+            if operation == 'add':
+                items.add(value, key_id)
+                expected.append((value, key_id))
+            elif (value, key_id) in expected:
+                items.remove(value, key_id)
+                expected.remove((value, key_id))
+            else:
+                with self.assertRaises(ValueError):
+                    items.remove(value, key_id)
+
+        # Equal values are in no particular order.
+        self.assertEqual(len(items), len(expected))
+        self.assertCountEqual(list(items), [key_id for _, key_id in expected])
+        values = [value for values in items.values for value in values]
+        self.assertEqual(values, sorted(value for value, _ in expected))
+        self.assertEqual(list(reversed(items)), list(items)[::-1])
+        self.assertCountEqual(list(items.irange(5, 10)),
+                              [key_id for value, key_id in expected if 5 <= value <= 10])
+        for bucket, maximum in zip(items.values, items.maxes):
+            self.assertLessEqual(len(bucket), 4)
+            self.assertEqual(bucket[-1], maximum)
+
+
+class TestRangeIndexed(unittest.TestCase):
+    @hypothesis.given(lists(tuples(integers(0, 19), one_of(integers(-5, 5), floats(-5, 5)))),
+                      integers(-6, 6), integers(-6, 6), integers(0, 25))
+    def test_same_as_scan(self, assignments, low, high, k):
+        """Test that the index finds the same objects as a scan over all values."""
+        class Foo:
+            a = RangeIndexed()
+        foos = [Foo() for _ in range(20)]
+        for i, value in assignments:
+            foos[i].a = value
+
+        values = Foo.a.value
+        expected = sorted((foo for foo in foos if foo in values and low <= values[foo] <= high),
+                          key=lambda foo: values[foo])
+        found = Foo.a.range(low, high)
+        self.assertCountEqual(found, expected)
+        self.assertEqual([values[foo] for foo in found], [values[foo] for foo in expected])
+
+        ordered = sorted(values.values())
+        self.assertEqual([values[foo] for foo in Foo.a.bottom_k(k)], ordered[:k])
+        self.assertEqual([values[foo] for foo in Foo.a.top_k(k)], ordered[::-1][:k])
+
+    def test_open_range(self):
+        class Foo:
+            a = traits.TypeChecked(float) + RangeIndexed()
+        foos = [Foo() for _ in range(3)]
+        for foo, value in zip(foos, [2.0, -math.inf, math.inf]):
+            foo.a = value
+
+        self.assertEqual(Foo.a.range(), [foos[1], foos[0], foos[2]])
+        self.assertEqual(Foo.a.range(low=0), [foos[0], foos[2]])
+        self.assertEqual(Foo.a.range(high=2), [foos[1], foos[0]])
+
+    def test_not_indexed(self):
+        """Test that NaN and values which are not numbers are left out."""
+        class Foo:
+            a = RangeIndexed()
+        foos = [Foo() for _ in range(3)]
+        for foo, value in zip(foos, [math.nan, 'a', 1]):
+            foo.a = value
+        self.assertEqual(Foo.a.range(), [foos[2]])
+        foos[2].a = math.nan
+        self.assertEqual(Foo.a.range(), [])
+
+    def test_gc(self):
+        class Foo:
+            a = RangeIndexed()
+        foos = [Foo() for _ in range(10)]
+        for i, foo in enumerate(foos):
+            foo.a = i
+        del foos[5:], foo
+        gc.collect()
+        self.assertEqual(Foo.a.top_k(2), [foos[4], foos[3]])
+        self.assertEqual(len(Foo.a.range_index.items), 5)
+
+    def test_query_during_removal(self):
+        """Test that objects which are being removed are skipped by queries."""
+        class Foo:
+            a = RangeIndexed()
+        foos = [Foo() for _ in range(3)]
+        for i, foo in enumerate(foos):
+            foo.a = i
+        del foo
+
+        seen = []
+
+        class Observer:
+            def stored(self, key_id, old, new):
+                pass
+
+            def removed(self, key_id, old):
+                # The entry is already gone, but the index still has it.
+                seen.append(Foo.a.top_k(3))
+
+        Foo.a.value.observers.insert(0, Observer())
+        del foos[2]
+        gc.collect()
+        self.assertEqual(seen, [[foos[1], foos[0]]])
+        self.assertEqual(Foo.a.top_k(3), [foos[1], foos[0]])
@@ -0,0 +1,86 @@
+import gc
+import unittest
+
+import hypothesis
+from hypothesis.strategies import floats, integers, lists, one_of, text, tuples
+
+from traitlite import traits
+from traitlite.interning import Interned, InternPool
+
+
+def copy(value):
+    """Returns an equal value which is a different object, where possible."""
+    if isinstance(value, str):
+        return ''.join(list(value))
+    if isinstance(value, tuple):
+        return tuple(list(value))
+    return value
+
+
+class TestInternPool(unittest.TestCase):
+    def test_types(self):
+        """Test that values are only shared with values of the same type."""
+        pool = InternPool()
+        for value in [1, 1.0, True, 0.0, -0.0, (1,), (1.0,)]:
+            self.assertIs(pool.acquire(value), value)
+        self.assertEqual(len(pool), 7)
+        self.assertEqual(pool.hits, 0)
+
+    def test_unhashable(self):
+        pool = InternPool()
+        value = [1]
+        self.assertIs(pool.acquire(value), value)
+        pool.release(value)
+        self.assertEqual(len(pool), 0)
+
+    @hypothesis.given(lists(one_of(text(max_size=3), integers(0, 3),
+                                   tuples(text(max_size=1), floats(allow_nan=False)))))
+    def test_counts(self, values):
+        """Test that a value stays in the pool while it has users."""
+        pool = InternPool()
+        pooled = [pool.acquire(copy(value)) for value in values]
+        self.assertEqual(pool.hits + pool.misses, len(values))
+        for a, b in zip(values, pooled):
+            self.assertEqual(a, b)
+            self.assertIs(type(a), type(b))
+
+        for value in pooled:
+            pool.release(value)
+        self.assertEqual(len(pool), 0)
+
+
+class TestInterned(unittest.TestCase):
+    def test_shared(self):
+        class Foo:
+            a = traits.TypeChecked(str) + Interned()
+        foos = [Foo() for _ in range(4)]
+        for foo, value in zip(foos, ['ab', 'ab', 'cd', 'ab']):
+            foo.a = copy(value)
+
+        self.assertIs(foos[0].a, foos[1].a)
+        self.assertIs(foos[0].a, foos[3].a)
+        self.assertEqual(len(Foo.a.pool), 2)
+        self.assertEqual(Foo.a.pool.hit_rate, 0.5)
+
+        # Values are forgotten when they are no longer stored.
+        foos[2].a = 'ab'
+        self.assertEqual(len(Foo.a.pool), 1)
+        del foos[:], foo
+        gc.collect()
+        self.assertEqual(len(Foo.a.pool), 0)
+
+        with self.assertRaises(Exception):
+            Foo().a = 1
+
+    def test_pool(self):
+        """Test sharing a pool between traits."""
+        pool = InternPool()
+
+        class Foo:
+            a = Interned(pool)
+            b = Interned(pool)
+        foo = Foo()
+        foo.a = copy('region')
+        foo.b = copy('region')
+        self.assertIs(foo.a, foo.b)
+        self.assertEqual(pool.values['region'][1], 2)
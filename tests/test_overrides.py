@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import unittest
+
+from traitlite import traits
+from traitlite.overrides import override
+
+
+class Config:
+    timeout = traits.TypeChecked(float)
+    retries = traits.TypeChecked(int) + traits.Default(3)
+    name = 'config'
+
+
+class TestOverride(unittest.TestCase):
+    def test_override(self):
+        config = Config()
+        config.timeout = 1.0
+        other = Config()
+        other.timeout = 2.0
+
+        with override(config, timeout=5.0, retries=0) as overridden:
+            self.assertIs(overridden, config)
+            self.assertEqual((config.timeout, config.retries), (5.0, 0))
+            self.assertEqual(other.timeout, 2.0)
+
+            with override(config, timeout=6.0):
+                self.assertEqual((config.timeout, config.retries), (6.0, 0))
+            self.assertEqual(config.timeout, 5.0)
+
+            # Setting changes the value which is seen after the block.
+            config.timeout = 3.0
+            self.assertEqual(config.timeout, 5.0)
+
+        self.assertEqual((config.timeout, config.retries), (3.0, 3))
+        self.assertEqual(Config.timeout.value[config], 3.0)
+
+    def test_unset(self):
+        config = Config()
+        with override(config, timeout=1.0):
+            self.assertEqual(config.timeout, 1.0)
+        with self.assertRaises(AttributeError):
+            config.timeout
+
+    def test_not_a_trait(self):
+        for name in ['name', 'missing']:
+            with self.assertRaisesRegex(Exception, 'not a trait'):
+                override(Config(), **{name: 1})
+
+    def test_threads(self):
+        config = Config()
+        config.timeout = 1.0
+        seen = []
+        inside = threading.Event()
+        done = threading.Event()
+
+        def run():
+            with override(config, timeout=5.0):
+                inside.set()
+                done.wait()
+                seen.append(config.timeout)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        inside.wait()
+        seen.append(config.timeout)
+        done.set()
+        thread.join()
+        self.assertEqual(seen, [1.0, 5.0])
+
+    def test_tasks(self):
+        config = Config()
+        config.timeout = 1.0
+
+        async def child():
+            await asyncio.sleep(0)
+            return config.timeout
+
+        async def handle(timeout):
+            with override(config, timeout=timeout):
+                await asyncio.sleep(0)
+                # Tasks started in the block see the override.
+                task = asyncio.ensure_future(child())
+                return config.timeout, await task
+
+        async def main():
+            return await asyncio.gather(handle(5.0), handle(10.0))
+
+        self.assertEqual(asyncio.run(main()), [(5.0, 5.0), (10.0, 10.0)])
+        self.assertEqual(config.timeout, 1.0)
@@ -0,0 +1,221 @@
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+
+import hypothesis
+from hypothesis.strategies import floats, integers, lists
+
+from traitlite import traits
+from traitlite import persistent
+from traitlite.choices import Choice
+from traitlite.indexing import Indexed, RangeIndexed
+
+
+class PersistentTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'store.bin')
+
+
+class TestMappedStore(PersistentTestCase):
+    def test_allocate_and_attach(self):
+        """Test that objects can be attached to allocated records."""
+        class Foo: pass
+        store = persistent.MappedStore(self.path, [('a', 'q')])
+        self.addCleanup(store.close)
+        self.assertEqual(len(store), 0)
+
+        foo = Foo()
+        index = store.allocate(foo)
+        self.assertEqual(len(store), 1)
+        self.assertEqual(store.index_of(foo), index)
+
+        bar = Foo()
+        store.attach(bar, index)
+        self.assertEqual(store.index_of(bar), index)
+
+        # Attaching to a record which does not exist should fail.
+        with self.assertRaises(IndexError):
+            store.attach(bar, 1)
+
+    def test_grow(self):
+        """Test that the file grows when the capacity is exhausted."""
+        class Foo:
+            a = persistent.Persistent(
+                persistent.MappedStore(self.path, [('a', 'q')], capacity=2))
+        self.addCleanup(Foo.a.store.close)
+
+        foos = [Foo() for _ in range(5)]
+        for i, foo in enumerate(foos):
+            foo.a = i
+        self.assertGreaterEqual(Foo.a.store.capacity, 5)
+        self.assertEqual([foo.a for foo in foos], list(range(5)))
+
+    def test_capacity(self):
+        with self.assertRaisesRegex(Exception, 'capacity must be at least 1'):
+            persistent.MappedStore(self.path, [('a', 'q')], capacity=0)
+
+    def test_schema_mismatch(self):
+        """Test that reopening a file with a different schema fails."""
+        persistent.MappedStore(self.path, [('a', 'q')]).close()
+        with self.assertRaisesRegex(Exception, 'schema'):
+            persistent.MappedStore(self.path, [('a', 'd')])
+
+    def test_bad_fields(self):
+        """Test that stores need between 1 and 64 fields."""
+        with self.assertRaisesRegex(Exception, 'between'):
+            persistent.MappedStore(self.path, [])
+        with self.assertRaisesRegex(Exception, 'between'):
+            persistent.MappedStore(self.path, [(str(i), 'b') for i in range(65)])
+
+
+class TestPersistent(PersistentTestCase):
+    def test__get__and__set__(self):
+        """Test that values are stored in and read from the store."""
+        store = persistent.MappedStore(self.path, [('a', 'q'), ('b', 'd'), ('c', '4s')])
+        self.addCleanup(store.close)
+
+        class Foo:
+            a = persistent.Persistent(store)
+            b = persistent.Persistent(store)
+            code = persistent.Persistent(store, field='c')
+
+        foo = Foo()
+        self.assertNotIn(foo, Foo.a.value)
+        with self.assertRaises(AttributeError):
+            foo.a
+
+        foo.a = 3
+        foo.b = 0.5
+        foo.code = b'ab'
+        self.assertIn(foo, Foo.a.value)
+        self.assertEqual(foo.a, 3)
+        self.assertEqual(foo.b, 0.5)
+        self.assertEqual(foo.code, b'ab\x00\x00')
+
+        # All attributes of an object share a record.
+        self.assertEqual(len(store), 1)
+
+    def test_bad_value(self):
+        """Test that values which do not fit the field raise an exception."""
+        class Foo:
+            a = persistent.Persistent(persistent.MappedStore(self.path, [('a', 'b')]))
+        self.addCleanup(Foo.a.store.close)
+
+        foo = Foo()
+        with self.assertRaisesRegex(Exception, 'cannot be stored'):
+            foo.a = 1000
+
+    def test_combined_traits(self):
+        """Test that other traits can be combined with persistent storage."""
+        class Foo:
+            a = traits.TypeChecked(int) + persistent.Persistent(
+                persistent.MappedStore(self.path, [('a', 'q')]))
+        self.addCleanup(Foo.a.store.close)
+
+        foo = Foo()
+        foo.a = 2
+        self.assertEqual(foo.a, 2)
+        with self.assertRaisesRegex(Exception, 'is of type'):
+            foo.a = 2.0
+
+    def test_observed_traits(self):
+        """Test that traits which observe the storage cannot be made persistent."""
+        store = persistent.MappedStore(self.path, [('a', 'q')])
+        self.addCleanup(store.close)
+        for Trait in [Indexed, RangeIndexed]:
+            for trait in [Trait() + persistent.Persistent(store),
+                          persistent.Persistent(store) + Trait()]:
+                with self.assertRaisesRegex(Exception, 'cannot be observed'):
+                    trait.__set_name__(object, 'a')
+
+    def test_choice(self):
+        """Test that choices, which encode their values, cannot be made persistent."""
+        store = persistent.MappedStore(self.path, [('a', 'q')])
+        self.addCleanup(store.close)
+        for trait in [Choice(['x']) + persistent.Persistent(store),
+                      persistent.Persistent(store) + Choice(['x'])]:
+            with self.assertRaisesRegex(Exception, 'cannot be (a choice|persistent)'):
+                trait.__set_name__(object, 'a')
+
+    @hypothesis.settings(deadline=None)
+    @hypothesis.given(lists(integers(-2 ** 63, 2 ** 63 - 1)), floats(allow_nan=False))
+    def test_reopen(self, values, b):
+        """Test that values are still there after reopening the store."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+        fields = [('a', 'q'), ('b', 'd')]
+        store = persistent.MappedStore(self.path, fields)
+
+        class Foo:
+            a = persistent.Persistent(store)
+            b = persistent.Persistent(store)
+
+        for value in values:
+            foo = Foo()
+            foo.a = value
+        store.flush()
+        store.close()
+
+        store = persistent.MappedStore(self.path, fields)
+        self.addCleanup(store.close)
+        Foo.a.value = store.column('a')
+        Foo.b.value = store.column('b')
+
+        self.assertEqual(len(store), len(values))
+        for index, value in enumerate(values):
+            foo = Foo.__new__(Foo)
+            store.attach(foo, index)
+            self.assertEqual(foo.a, value)
+            # b was never written, so it should not be present.
+            with self.assertRaises(AttributeError):
+                foo.b
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), 'Crash semantics are tested on Linux')
+class TestCrashConsistency(PersistentTestCase):
+    def test_process_crash(self):
+        """Test that completed writes survive the process dying without a flush."""
+        script = textwrap.dedent('''
+            import os, sys
+            from traitlite.persistent import MappedStore, Persistent
+
+            store = MappedStore(sys.argv[1], [('a', 'q'), ('b', 'q')])
+
+            class Foo:
+                a = Persistent(store)
+                b = Persistent(store)
+
+            for i in range(100):
+                foo = Foo()
+                foo.a = i
+                if i % 2:
+                    foo.b = -i
+
+            # Die without flushing, closing or running any cleanup.
+            os._exit(0)
+        ''')
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.check_call([sys.executable, '-c', script, self.path], cwd=root)
+
+        store = persistent.MappedStore(self.path, [('a', 'q'), ('b', 'q')])
+        self.addCleanup(store.close)
+
+        class Foo:
+            a = persistent.Persistent(store)
+            b = persistent.Persistent(store)
+
+        self.assertEqual(len(store), 100)
+        for i in range(100):
+            foo = Foo.__new__(Foo)
+            store.attach(foo, i)
+            self.assertEqual(foo.a, i)
+            if i % 2:
+                self.assertEqual(foo.b, -i)
+            else:
+                self.assertNotIn(foo, Foo.b.value)
@@ -0,0 +1,56 @@
+import time
+import unittest
+
+import traitlite
+from traitlite import traits
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestProfile(unittest.TestCase):
+    def test_phases(self):
+        """Test that samples are attributed to the attribute and phase."""
+        class Foo:
+            slow = traits.HasValidator([lambda value: busy(0.002) or value])
+            noisy = traits.HasCallback([lambda value: busy(0.002)])
+
+        foo = Foo()
+        with traitlite.profile(interval=0.0005) as profiler:
+            end = time.perf_counter() + 0.3
+            while time.perf_counter() < end:
+                foo.slow = 1
+                foo.noisy = 2
+
+        phases = {(owner, attribute, phase) for owner, attribute, phase, _ in profiler.samples}
+        self.assertIn(('TestProfile.test_phases.<locals>.Foo', 'slow', 'validator'), phases)
+        self.assertIn(('TestProfile.test_phases.<locals>.Foo', 'noisy', 'callback'), phases)
+
+        top = profiler.top(2)
+        self.assertEqual({attribute for _, attribute, _ in top}, {'slow', 'noisy'})
+        self.assertGreater(profiler.total, sum(profiler.samples.values()) - 1)
+
+        call_sites = {call_site for _, _, _, call_site in profiler.samples}
+        self.assertTrue(all('test_profiling.py' in site and 'test_phases' in site
+                            for site in call_sites))
+
+        report = profiler.report(top=2)
+        self.assertIn('Foo.slow', report)
+        self.assertIn('validator', report)
+
+        for line in profiler.collapsed().splitlines():
+            stack, count = line.rsplit(' ', 1)
+            self.assertGreater(int(count), 0)
+            self.assertRegex(stack, r'Foo\.(slow:validator|noisy:callback|slow:set|noisy:set)$')
+
+    def test_background(self):
+        """Test starting and stopping the profiler."""
+        profiler = traitlite.profile().start()
+        with self.assertRaisesRegex(Exception, 'already running'):
+            profiler.start()
+        profiler.stop()
+        profiler.stop()
+        self.assertEqual(profiler.report().count('\n'), 1)
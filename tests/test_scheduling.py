@@ -0,0 +1,260 @@
+import asyncio
+import gc
+import os
+import sys
+import threading
+import unittest
+
+import hypothesis
+from hypothesis.strategies import floats, integers, lists
+
+from traitlite import traits
+from traitlite.scheduling import AsyncioScheduler, Scheduler
+
+from .test_traits import magic_mock_with_single_argument, magic_mock_with_two_arguments
+
+
+class Clock:
+    """A clock which only moves when told to."""
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+def manual_scheduler():
+    clock = Clock()
+    return clock, Scheduler(clock=clock, threaded=False)
+
+
+class TestScheduler(unittest.TestCase):
+    @hypothesis.given(lists(floats(min_value=0, max_value=10)))
+    def test_order(self, delays):
+        """Test that calls are run in the order of their deadlines."""
+        clock, scheduler = manual_scheduler()
+        called = []
+        for i, delay in enumerate(delays):
+            scheduler.call_later(delay, lambda i=i: called.append(i))
+
+        self.assertEqual(scheduler.run_pending(), delays.count(0))
+        clock.time = 10
+        scheduler.run_pending()
+        self.assertEqual(called, sorted(range(len(delays)), key=lambda i: delays[i]))
+
+    def test_thread(self):
+        """Test that a single background thread runs the calls."""
+        scheduler = Scheduler()
+        done = threading.Event()
+        threads = []
+
+        def call():
+            threads.append(threading.current_thread())
+            if len(threads) == 2:
+                done.set()
+
+        scheduler.call_later(0.01, call)
+        scheduler.call_later(0, call)
+        self.assertTrue(done.wait(5))
+        self.assertIs(threads[0], threads[1])
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_asyncio(self):
+        """Test running the calls on an event loop."""
+        async def main():
+            scheduler = AsyncioScheduler(asyncio.get_running_loop())
+            future = asyncio.get_running_loop().create_future()
+            scheduler.call_later(0.01, lambda: future.set_result(True))
+            return await asyncio.wait_for(future, 5)
+
+        self.assertTrue(asyncio.run(main()))
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), 'Forking is tested on Linux')
+class TestFork(unittest.TestCase):
+    def test_fork(self):
+        """Test that delayed callbacks are called in a forked child."""
+        called = []
+
+        class Foo:
+            a = traits.HasCallback([called.append], dispatch='debounce', interval=0.01)
+        foo = Foo()
+
+        # Start the scheduler thread in the parent.
+        foo.a = 1
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.close(read)
+                foo.a = 2
+                for _ in range(500):
+                    if 2 in called:
+                        os.write(write, b'1')
+                        break
+                    threading.Event().wait(0.01)
+            finally:
+                os._exit(0)
+
+        os.close(write)
+        with os.fdopen(read, 'rb') as pipe:
+            result = pipe.read()
+        os.waitpid(pid, 0)
+        self.assertEqual(result, b'1')
+
+
+class TestDebounce(unittest.TestCase):
+    def setUp(self):
+        self.clock, self.scheduler = manual_scheduler()
+
+    @hypothesis.given(lists(integers(), min_size=1))
+    def test_latest_value(self, values):
+        """Test that only the latest value of a burst is passed on."""
+        clock, scheduler = manual_scheduler()
+        callback = magic_mock_with_single_argument()
+
+        class Foo:
+            a = traits.HasCallback([callback], dispatch='debounce', interval=1,
+                                   scheduler=scheduler)
+        foo = Foo()
+
+        for value in values:
+            foo.a = value
+            clock.time += 0.5
+            scheduler.run_pending()
+        callback.assert_not_called()
+
+        clock.time += 0.5
+        scheduler.run_pending()
+        callback.assert_called_once_with(values[-1])
+
+    def test_single_timer(self):
+        """Test that setting the value does not schedule a call every time."""
+        class Foo:
+            a = traits.HasCallback([magic_mock_with_single_argument()], dispatch='debounce',
+                                   interval=1, scheduler=self.scheduler)
+        foo = Foo()
+
+        for i in range(100):
+            foo.a = i
+        self.assertEqual(len(self.scheduler.queue), 1)
+
+    def test_delta(self):
+        """Test that the old value is the one before the burst."""
+        callback = magic_mock_with_two_arguments()
+
+        class Foo:
+            a = traits.HasCallbackDelta([callback], dispatch='debounce', interval=1,
+                                        scheduler=self.scheduler)
+        foo = Foo()
+
+        foo.a = 1
+        foo.a = 2
+        self.clock.time = 1
+        self.scheduler.run_pending()
+        callback.assert_called_once_with(None, 2)
+
+        foo.a = 3
+        foo.a = 4
+        self.clock.time = 2
+        self.scheduler.run_pending()
+        callback.assert_called_with(2, 4)
+
+    def test_garbage_collected(self):
+        """Test that pending calls do not keep the object alive."""
+        callback = magic_mock_with_single_argument()
+
+        class Foo:
+            a = traits.HasCallback([callback], dispatch='debounce', interval=1,
+                                   scheduler=self.scheduler)
+        foo = Foo()
+        foo.a = 1
+        del foo
+        gc.collect()
+
+        self.clock.time = 1
+        self.scheduler.run_pending()
+        callback.assert_not_called()
+
+
+class TestThrottle(unittest.TestCase):
+    def setUp(self):
+        self.clock, self.scheduler = manual_scheduler()
+
+    def test_throttle(self):
+        """Test that the first and the latest value in each interval are passed on."""
+        callback = magic_mock_with_single_argument()
+
+        class Foo:
+            a = traits.HasCallback([callback], dispatch='throttle', interval=1,
+                                   scheduler=self.scheduler)
+        foo = Foo()
+
+        foo.a = 1
+        callback.assert_called_once_with(1)
+
+        foo.a = 2
+        foo.a = 3
+        self.clock.time = 0.5
+        self.scheduler.run_pending()
+        self.assertEqual(callback.call_count, 1)
+
+        self.clock.time = 1
+        self.scheduler.run_pending()
+        callback.assert_called_with(3)
+        self.assertEqual(callback.call_count, 2)
+
+        # The value was just passed on, so the next one waits for the interval.
+        foo.a = 4
+        self.assertEqual(callback.call_count, 2)
+        self.clock.time = 2
+        self.scheduler.run_pending()
+        callback.assert_called_with(4)
+
+        # After a quiet interval, the next value is passed on right away.
+        self.clock.time = 5
+        foo.a = 5
+        callback.assert_called_with(5)
+        self.assertEqual(callback.call_count, 4)
+
+    @hypothesis.given(lists(integers(), min_size=1))
+    def test_rate(self, values):
+        """Test that the callbacks are called at most once per interval plus once."""
+        clock, scheduler = manual_scheduler()
+        callback = magic_mock_with_single_argument()
+
+        class Foo:
+            a = traits.HasCallback([callback], dispatch='throttle', interval=1,
+                                   scheduler=scheduler)
+        foo = Foo()
+
+        for value in values:
+            foo.a = value
+            clock.time += 0.1
+            scheduler.run_pending()
+        clock.time += 1
+        scheduler.run_pending()
+
+        callback.assert_called_with(values[-1])
+        self.assertLessEqual(callback.call_count, len(values) // 10 + 2)
+
+    def test_notify(self):
+        """Test that unchanged values are not passed on."""
+        callback = magic_mock_with_single_argument()
+
+        class Foo:
+            a = traits.HasCallback([callback], notify='changed', dispatch='throttle',
+                                   interval=1, scheduler=self.scheduler)
+        foo = Foo()
+
+        foo.a = 1
+        foo.a = 1
+        self.clock.time = 1
+        self.scheduler.run_pending()
+        callback.assert_called_once_with(1)
+
+    def test_bad_arguments(self):
+        with self.assertRaisesRegex(Exception, 'dispatch must be'):
+            traits.HasCallback(dispatch='later')
+        with self.assertRaisesRegex(Exception, 'interval must be positive'):
+            traits.HasCallback(dispatch='throttle', interval=0)
@@ -0,0 +1,43 @@
+import pickle
+import unittest
+
+import hypothesis
+from hypothesis.strategies import dictionaries, integers, lists, sets
+
+from traitlite.snapshots import FrozenDict, FrozenList, snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    @hypothesis.given(lists(integers()), dictionaries(integers(), integers()), sets(integers()))
+    def test_equal(self, items, mapping, elements):
+        for value in [items, mapping, elements, bytearray(len(items))]:
+            copy = snapshot(value)
+            self.assertEqual(copy, value)
+            self.assertIsNot(copy, value)
+
+    def test_immutable(self):
+        items = snapshot([1, 2])
+        self.assertIsInstance(items, FrozenList)
+        for change in [lambda: items.append(3), lambda: items.__setitem__(0, 3),
+                       lambda: items.sort(), lambda: items.__iadd__([3])]:
+            with self.assertRaises(Exception):
+                change()
+        self.assertEqual(items, [1, 2])
+
+        mapping = snapshot({'a': 1})
+        self.assertIsInstance(mapping, FrozenDict)
+        with self.assertRaises(Exception):
+            mapping['b'] = 2
+        with self.assertRaises(Exception):
+            mapping.update(b=2)
+        self.assertEqual(mapping, {'a': 1})
+
+        self.assertIsInstance(snapshot({1}), frozenset)
+
+    def test_other_values(self):
+        value = (1, [2])
+        self.assertIs(snapshot(value), value)
+
+    def test_pickle(self):
+        self.assertIs(type(pickle.loads(pickle.dumps(snapshot([1])))), list)
+        self.assertIs(type(pickle.loads(pickle.dumps(snapshot({1: 2})))), dict)
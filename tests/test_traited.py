@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import unittest
+from typing import ClassVar, List, Optional
+
+import hypothesis
+from hypothesis.strategies import integers, text
+
+from traitlite import field, traited, traits
+
+from .test_traits import magic_mock_with_single_argument
+
+
+@traited
+class Point:
+    x: int
+    y: int = 0
+    label: Optional[str] = field(None, read_only=True)
+    tags: List[str] = field(default_factory=list)
+    dimensions: ClassVar[int] = 2
+
+
+class TestTraited(unittest.TestCase):
+    @hypothesis.given(integers(), integers(), text())
+    def test_init(self, x, y, label):
+        """Test that the generated __init__ checks and stores the fields."""
+        point = Point(x, y, label)
+        self.assertEqual((point.x, point.y, point.label, point.tags), (x, y, label, []))
+        self.assertIsNot(Point(x).tags, Point(x).tags)
+        self.assertEqual(Point.dimensions, 2)
+
+        with self.assertRaisesRegex(Exception, r"'Point.x' is of type 'int', not 'str'"):
+            Point('a')
+        with self.assertRaisesRegex(Exception, 'read-only'):
+            point.label = 'b'
+        with self.assertRaisesRegex(Exception, "'Point.y' is of type 'int'"):
+            point.y = 1.0
+
+    def test_repr_and_eq(self):
+        self.assertEqual(repr(Point(1, 2)), "Point(x=1, y=2, label=None, tags=[])")
+        self.assertEqual(Point(1, 2), Point(1, 2))
+        self.assertNotEqual(Point(1, 2), Point(1, 3))
+        self.assertNotEqual(Point(1), (1,))
+
+        # Equal objects must have equal hashes, so they are unhashable.
+        with self.assertRaises(TypeError):
+            hash(Point(1))
+
+        @traited(eq=False)
+        class Identity:
+            x: int
+
+        self.assertEqual(len({Identity(1), Identity(1)}), 2)
+
+        @traited
+        class Hashable:
+            x: int
+
+            def __hash__(self):
+                return hash(self.x)
+
+        self.assertEqual(len({Hashable(1), Hashable(1)}), 1)
+
+    def test_validators_and_callbacks(self):
+        """Test that callbacks are called once the object is fully constructed."""
+        seen = []
+
+        @traited
+        class Foo:
+            a: int = field(validators=[lambda value: int(value)], callbacks=[lambda value: seen.append(value)])
+            b: int = 0
+
+            def __post_init__(self):
+                seen.append('post_init')
+
+        foo = Foo('3', 4)
+        self.assertEqual(foo.a, 3)
+        self.assertEqual(seen, ['post_init', 3])
+
+        foo.a = '5'
+        self.assertEqual(seen[-1], 5)
+
+    def test_callbacks_see_all_fields(self):
+        callback = magic_mock_with_single_argument()
+
+        @traited
+        class Foo:
+            a: int = field(callbacks=[lambda value: callback(foo_fields())])
+            b: int = 2
+
+        objects = []
+
+        def foo_fields():
+            return objects[-1].b
+
+        original_init = Foo.__init__
+
+        def init(self, *args):
+            objects.append(self)
+            original_init(self, *args)
+
+        Foo.__init__ = init
+        Foo(1, 3)
+        callback.assert_called_once_with(3)
+
+    def test_extra_traits(self):
+        """Test fields with further traits."""
+        callback = magic_mock_with_single_argument()
+        extra = traits.HasCallback()
+
+        @traited
+        class Foo:
+            a: int = field(traits=[extra])
+
+        foo = Foo(1)
+        Foo.a.add_callback(foo, callback)
+        foo.a = 2
+        callback.assert_called_once_with(2)
+
+    def test_inheritance(self):
+        @traited
+        class Point3D(Point):
+            z: int = 0
+
+        point = Point3D(1, 2, z=3)
+        self.assertTrue(repr(point).endswith("Point3D(x=1, y=2, label=None, tags=[], z=3)"))
+
+    def test_bad_fields(self):
+        with self.assertRaisesRegex(Exception, 'without a default follows'):
+            @traited
+            class Foo:
+                a: int = 0
+                b: int
+
+        with self.assertRaisesRegex(Exception, 'both a default'):
+            field(1, default_factory=list)
+
+    def test_options(self):
+        @traited(repr=False, eq=False)
+        class Foo:
+            a: int
+
+        self.assertNotEqual(Foo(1), Foo(1))
+        self.assertNotIn('a=', repr(Foo(1)))
+
+
+@traited
+class Row:
+    name: str
+    count: int
+    ratio: float = 1.0
+    active: bool = False
+
+
+class TestFromRecords(unittest.TestCase):
+    def test_dicts(self):
+        """Test creating objects from dicts with strings, like csv.DictReader gives."""
+        import csv
+        import io
+
+        file = io.StringIO('name,count,ratio,extra\na,1,0.5,x\nb,2,3,y\n')
+        rows = list(Row.from_records(csv.DictReader(file)))
+        self.assertEqual(rows, [Row('a', 1, 0.5), Row('b', 2, 3.0)])
+
+    def test_sequences(self):
+        rows = list(Row.from_records([('a', 1, 2, 'true'), ['b', '3']]))
+        self.assertEqual(rows, [Row('a', 1, 2.0, True), Row('b', 3)])
+
+    def test_errors(self):
+        """Test that bad records are reported without stopping the stream."""
+        errors = []
+        records = [{'name': 'a', 'count': '1'}, {'name': 'b', 'count': 'x'},
+                   {'count': 2}, {'name': 3, 'count': 3}, {'name': 'e', 'count': 5}]
+        rows = list(Row.from_records(records, on_error=errors.append))
+
+        self.assertEqual([row.name for row in rows], ['a', 'e'])
+        self.assertEqual([error.index for error in errors], [1, 2, 3])
+        self.assertIs(errors[1].record, records[2])
+        self.assertRegex(str(errors[2]), r"Record 3: .*'Row.name' is of type 'str'")
+
+        with self.assertRaisesRegex(Exception, 'Record 1'):
+            list(Row.from_records(records))
+
+    def test_converters(self):
+        rows = Row.from_records([{'name': ' a ', 'count': '1'}], converters={'name': str.strip})
+        self.assertEqual(next(rows).name, 'a')
+
+    def test_lazy(self):
+        """Test that the records are consumed one at a time."""
+        def records():
+            for i in range(10 ** 9):
+                yield {'name': str(i), 'count': i}
+
+        rows = Row.from_records(records())
+        self.assertEqual([next(rows).count for _ in range(3)], [0, 1, 2])
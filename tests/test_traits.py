@@ -85,6 +85,24 @@ class TestBaseTrait(unittest.TestCase):
         self.assertIs(Foo.bar.value[foo], obj)
         self.assertIs(foo.bar, obj)
 
+    def test_owner_equality(self):
+        """Test that owners are told apart by identity, even if unhashable."""
+        class Foo:
+            bar = traits.HasValidator([lambda x: x]) + traits.HasCallback([lambda x: None])
+
+            def __eq__(self, other):
+                return True
+            __hash__ = None
+
+        foo_1 = Foo()
+        foo_2 = Foo()
+        foo_1.bar = 1
+        foo_2.bar = 2
+        self.assertEqual((foo_1.bar, foo_2.bar), (1, 2))
+
+        del foo_1
+        self.assertEqual(len(Foo.bar.value), 1)
+
     @hypothesis.given(strategy_BaseTrait(), strategy_BaseTrait())
     def test__dict__on__add__(self, Trait_1, Trait_2):
         """Test that the state of a combined trait is correct."""
@@ -161,6 +179,88 @@ class TestReadOnly(unittest.TestCase):
             foo.a = 4
 
 
+class TestDefault(unittest.TestCase):
+    def test_default(self):
+        """Test that a plain default is returned without being stored."""
+        class Foo:
+            a = traits.TypeChecked(int) + traits.Default(3)
+        foo = Foo()
+
+        self.assertEqual(foo.a, 3)
+        self.assertNotIn(foo, Foo.a.value)
+        foo.a = 4
+        self.assertEqual(foo.a, 4)
+        self.assertEqual(Foo().a, 3)
+
+    def test_default_factory(self):
+        """Test that every object gets its own value, which is stored on the first read."""
+        class Foo:
+            a = traits.Default(default_factory=list)
+        foo = Foo()
+        bar = Foo()
+
+        self.assertNotIn(foo, Foo.a.value)
+        foo.a.append(1)
+        self.assertIn(foo, Foo.a.value)
+        self.assertEqual(foo.a, [1])
+        self.assertEqual(bar.a, [])
+
+    def test_hooks(self):
+        """Test that the hooks only run for the default if asked to."""
+        callback = magic_mock_with_single_argument()
+
+        class Foo:
+            a = traits.HasValidator([lambda x: x + 1]) + traits.HasCallback([callback]) + \
+                traits.Default(1)
+            b = traits.HasValidator([lambda x: x + 1]) + traits.HasCallback([callback]) + \
+                traits.Default(1, hooks=True)
+            c = traits.ReadOnly() + traits.Default(default_factory=list, hooks=True)
+        foo = Foo()
+
+        self.assertEqual(foo.a, 1)
+        callback.assert_not_called()
+
+        self.assertEqual(foo.b, 2)
+        callback.assert_called_once_with(2)
+        self.assertEqual(foo.b, 2)
+        self.assertEqual(callback.call_count, 1)
+
+        self.assertIs(foo.c, foo.c)
+        with self.assertRaises(Exception):
+            foo.c = []
+
+    def test_combined_get(self):
+        """Test that reads still go through traits which override __get__."""
+        class Reads(traits.BaseTrait):
+            reads = 0
+
+            def __get__(self, obj, objtype):
+                if obj is not None:
+                    Reads.reads += 1
+                return super().__get__(obj, objtype)
+
+        class Foo:
+            a = Reads() + traits.Default(1)
+            b = traits.Default(1) + Reads()
+        foo = Foo()
+
+        self.assertTrue(Foo.b.direct_get)
+        self.assertFalse(Foo.a.direct_get)
+        self.assertEqual((foo.a, foo.b), (1, 1))
+        foo.a = foo.b = 2
+        self.assertEqual((foo.a, foo.b), (2, 2))
+        self.assertEqual(Reads.reads, 3)
+
+    def test_missing(self):
+        """Test that other traits still raise AttributeError for missing values."""
+        class Foo:
+            a = traits.TypeChecked(int)
+        with self.assertRaises(AttributeError):
+            Foo().a
+        with self.assertRaises(Exception):
+            traits.Default(1, default_factory=list)
+
+
 class TestTypeChecked(unittest.TestCase):
     @hypothesis.given(strategy_Types(), strategy_Types())
     def test_typechecking_different_types(self, type_1, type_2):
@@ -292,6 +392,28 @@ class TestHasCallback(unittest.TestCase):
             class Foo:
                 a = traits.HasCallback([callback])
 
+    def test_no_callbacks(self):
+        """Test that a trait without callbacks switches over when the first one is added."""
+        class Foo:
+            a = traits.HasCallback(notify='changed')
+        foo = Foo()
+        bar = Foo()
+
+        foo.a = 1
+        foo.a = 1
+        self.assertFalse(Foo.a.has_callbacks)
+        self.assertEqual(Foo.a.suppressed, 0)
+        self.assertNotIn(foo, Foo.a.callbacks)
+
+        callback = magic_mock_with_single_argument()
+        Foo.a.add_callback(bar, callback)
+        self.assertTrue(Foo.a.has_callbacks)
+        foo.a = 2
+        bar.a = 2
+        bar.a = 2
+        callback.assert_called_once_with(2)
+        self.assertEqual(foo.a, 2)
+
 
 class TestHasCallbackDelta(unittest.TestCase):
     def test_add_callback(self):
@@ -367,6 +489,157 @@ class TestHasCallbackDelta(unittest.TestCase):
             class Foo:
                 a = traits.HasCallbackDelta([callback])
 
+    def test_snapshot(self):
+        """Test that containers changed in place get a distinct old value."""
+        changes = []
+
+        class Foo:
+            a = traits.HasCallbackDelta(snapshot=True)
+            b = traits.HasCallbackDelta([lambda old, new: changes.append((old, list(new)))])
+
+        foo = Foo()
+        foo.a = [1]
+        foo.a.append(2)
+        Foo.a.add_callback(foo, lambda old, new: changes.append((old, list(new))))
+        foo.a = foo.a
+        foo.a.append(3)
+        foo.a = foo.a
+        self.assertEqual(changes, [([1], [1, 2]), ([1, 2], [1, 2, 3])])
+
+        # Without snapshots, the old value is the changed list.
+        changes.clear()
+        foo.b = [1]
+        foo.b.append(2)
+        foo.b = foo.b
+        self.assertEqual(changes, [(None, [1]), ([1, 2], [1, 2])])
+
+    def test_snapshot_notify(self):
+        """Test that snapshots compare equal to unchanged containers."""
+        callback = magic_mock_with_two_arguments()
+
+        class Foo:
+            a = traits.HasCallbackDelta([callback], notify='changed', snapshot=True)
+
+        foo = Foo()
+        foo.a = {'x': 1}
+        foo.a = foo.a
+        self.assertEqual(callback.call_count, 1)
+        foo.a['y'] = 2
+        foo.a = foo.a
+        self.assertEqual(callback.call_count, 2)
+        callback.assert_called_with({'x': 1}, {'x': 1, 'y': 2})
+
+
+class TestNotify(unittest.TestCase):
+    def make(self, trait_type, notify, callback):
+        class Foo:
+            a = trait_type([callback], notify=notify)
+        return Foo, Foo()
+
+    @hypothesis.given(hypothesis.strategies.integers(), hypothesis.strategies.text())
+    def test_changed(self, integer, string):
+        """Test that callbacks are skipped for equal values."""
+        callback = magic_mock_with_single_argument()
+        Foo, foo = self.make(traits.HasCallback, 'changed', callback)
+
+        foo.a = integer
+        foo.a = integer
+        foo.a = string
+        foo.a = str(string)
+        self.assertEqual(callback.call_count, 2)
+        self.assertEqual(Foo.a.suppressed, 2)
+
+        # Equal values of different types are still equal.
+        foo.a = 1
+        foo.a = 1.0
+        self.assertEqual(callback.call_count, 3)
+
+    def test_identity(self):
+        """Test that callbacks are skipped for the same object only."""
+        callback = magic_mock_with_single_argument()
+        Foo, foo = self.make(traits.HasCallback, 'identity', callback)
+
+        value = [1]
+        foo.a = value
+        foo.a = value
+        foo.a = [1]
+        self.assertEqual(callback.call_count, 2)
+        self.assertEqual(Foo.a.suppressed, 1)
+
+    def test_always(self):
+        """Test that callbacks are called on every assignment by default."""
+        callback = magic_mock_with_two_arguments()
+        Foo, foo = self.make(traits.HasCallbackDelta, 'always', callback)
+
+        foo.a = 1
+        foo.a = 1
+        self.assertEqual(callback.call_count, 2)
+        self.assertEqual(Foo.a.suppressed, 0)
+
+    def test_comparator(self):
+        """Test using a callable to compare the values."""
+        callback = magic_mock_with_two_arguments()
+        Foo, foo = self.make(
+            traits.HasCallbackDelta, lambda old, new: abs(old - new) < 1, callback)
+
+        foo.a = 1
+        foo.a = 1.5
+        foo.a = 3
+        callback.assert_called_with(1.5, 3)
+        self.assertEqual(callback.call_count, 2)
+        self.assertEqual(Foo.a.suppressed, 1)
+
+    def test_digest(self):
+        """Test that buffers changed in place are detected by their digest."""
+        callback = magic_mock_with_single_argument()
+        Foo, foo = self.make(traits.HasCallback, 'digest', callback)
+
+        buffer = bytearray(b'abc')
+        foo.a = buffer
+        foo.a = buffer
+        self.assertEqual(callback.call_count, 1)
+
+        buffer[0] = 0
+        foo.a = buffer
+        self.assertEqual(callback.call_count, 2)
+
+        # Values without a buffer are compared with ==.
+        foo.a = 1
+        foo.a = 1
+        self.assertEqual(callback.call_count, 3)
+        self.assertEqual(Foo.a.suppressed, 2)
+
+        # A buffer after a value without one is a change.
+        foo.a = bytes(buffer)
+        self.assertEqual(callback.call_count, 4)
+
+    def test_digest_strided(self):
+        """Test buffers which are not contiguous."""
+        callback = magic_mock_with_single_argument()
+        _, foo = self.make(traits.HasCallback, 'digest', callback)
+
+        foo.a = memoryview(b'abcdef')[::2]
+        foo.a = memoryview(b'aXcXeX')[::2]
+        foo.a = memoryview(b'abcdef')[1::2]
+        self.assertEqual(callback.call_count, 2)
+        self.assertEqual(foo.a.tobytes(), b'bdf')
+
+    def test_unorderable_equality(self):
+        """Test values whose == does not return a bool."""
+        class Array:
+            def __eq__(self, other):
+                raise ValueError('The truth value of an array is ambiguous')
+
+        callback = magic_mock_with_single_argument()
+        _, foo = self.make(traits.HasCallback, 'changed', callback)
+        foo.a = Array()
+        foo.a = Array()
+        self.assertEqual(callback.call_count, 2)
+
+    def test_bad_policy(self):
+        with self.assertRaisesRegex(Exception, 'notify must be'):
+            traits.HasCallback(notify='sometimes')
+
 
 class TestHasValidator(unittest.TestCase):
     def test_add_validator(self):
@@ -510,6 +783,24 @@ class TestHasValidator(unittest.TestCase):
             class Foo:
                 a = traits.HasValidator([validator])
 
+    def test_no_validators(self):
+        """Test that a trait without validators switches over when the first one is added."""
+        class Foo:
+            a = traits.HasValidator()
+            b = traits.HasValidatorDelta()
+        foo = Foo()
+
+        foo.a = foo.b = -1
+        self.assertFalse(Foo.a.has_validators)
+        self.assertFalse(Foo.b.has_validators)
+
+        Foo.a.add_validator(foo, lambda x: max(0, x))
+        Foo.b.add_validator(foo, lambda old, new: max(old, new))
+        foo.a = -2
+        foo.b = -2
+        self.assertEqual((foo.a, foo.b), (0, -1))
+        self.assertTrue(traits.HasValidator([lambda x: x]).has_validators)
+
 
 class TestHasValidatorDelta(unittest.TestCase):
     def test_add_validator(self):
@@ -620,6 +911,37 @@ class TestHasValidatorDelta(unittest.TestCase):
             class Foo:
                 a = traits.HasValidatorDelta([validator])
 
+    def test_snapshot(self):
+        """Test that validators can compare a container with its old items."""
+        def only_grow(old, new):
+            if old is not None and not set(old) <= set(new):
+                raise Exception('Items cannot be removed')
+            return new
+
+        class Foo:
+            a = traits.HasValidatorDelta([only_grow], snapshot=True)
+
+        foo = Foo()
+        foo.a = {1, 2}
+        foo.a.add(3)
+        foo.a = foo.a
+        foo.a.discard(1)
+        with self.assertRaises(Exception):
+            foo.a = foo.a
+
+    def test_custom_snapshot(self):
+        olds = []
+
+        class Foo:
+            a = traits.HasValidatorDelta([lambda old, new: olds.append(old) or new],
+                                         snapshot=lambda value: [list(row) for row in value])
+
+        foo = Foo()
+        foo.a = [[1]]
+        foo.a[0].append(2)
+        foo.a = foo.a
+        self.assertEqual(olds, [None, [[1]]])
+
 
 class TestResolve_mro(unittest.TestCase):
     def test_resolve_mro(self):
@@ -0,0 +1,141 @@
+import collections.abc
+import typing
+import unittest
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple, Union
+
+import hypothesis
+from hypothesis.strategies import integers, lists, text
+
+from traitlite import traits
+from traitlite import typecheck
+
+
+def check(type_, value, **kwargs):
+    """Compile the type and check a single value with it."""
+    accepted, checker = typecheck.compile_type(type_, **kwargs)
+    return type(value) in accepted or checker(value)
+
+
+class TestCompileType(unittest.TestCase):
+    def test_class(self):
+        """Test checking plain classes, including the bool special case."""
+        self.assertTrue(check(int, 3))
+        self.assertFalse(check(int, 3.0))
+        self.assertFalse(check(int, True))
+        self.assertTrue(check(bool, True))
+        self.assertTrue(check(collections.abc.Sized, []))
+
+    def test_accepted_types(self):
+        """Test that the types of accepted values are remembered."""
+        class Int(int): pass
+
+        accepted, checker = typecheck.compile_type(int)
+        self.assertIn(int, accepted)
+        self.assertNotIn(Int, accepted)
+
+        self.assertTrue(checker(Int(3)))
+        self.assertIn(Int, accepted)
+
+        # Rejected types are never remembered.
+        self.assertFalse(checker(True))
+        self.assertNotIn(bool, accepted)
+
+    def test_any(self):
+        self.assertTrue(check(Any, object()))
+
+    def test_optional_and_union(self):
+        self.assertTrue(check(Optional[int], None))
+        self.assertTrue(check(Optional[int], 3))
+        self.assertFalse(check(Optional[int], 'a'))
+
+        self.assertTrue(check(Union[int, str], 'a'))
+        self.assertFalse(check(Union[int, str], b'a'))
+        self.assertFalse(check(Union[int, str], True))
+
+    @unittest.skipUnless(hasattr(typing, 'Literal'), 'Literal requires python 3.8')
+    def test_literal(self):
+        Mode = typing.Literal['r', 'w', 1]
+        self.assertTrue(check(Mode, 'r'))
+        self.assertTrue(check(Mode, 1))
+        self.assertFalse(check(Mode, 'x'))
+        self.assertFalse(check(Mode, True))
+        self.assertFalse(check(Mode, 1.0))
+        self.assertFalse(check(Mode, []))
+
+    def test_collections(self):
+        self.assertTrue(check(List[int], [1, 2]))
+        self.assertFalse(check(List[int], [1, 'a']))
+        self.assertFalse(check(List[int], (1, 2)))
+        self.assertTrue(check(Set[str], {'a'}))
+        self.assertTrue(check(FrozenSet[str], frozenset()))
+        self.assertTrue(check(Sequence[int], (1, 2)))
+        self.assertTrue(check(List, ['a']))
+
+    def test_mappings(self):
+        self.assertTrue(check(Dict[str, float], {'a': 1.0}))
+        self.assertFalse(check(Dict[str, float], {'a': 1}))
+        self.assertFalse(check(Dict[str, float], {1: 1.0}))
+        self.assertTrue(check(Dict[str, List[int]], {'a': [1]}))
+
+    def test_tuples(self):
+        self.assertTrue(check(Tuple[int, str], (1, 'a')))
+        self.assertFalse(check(Tuple[int, str], (1, 2)))
+        self.assertFalse(check(Tuple[int, str], (1,)))
+        self.assertTrue(check(Tuple[int, ...], (1, 2, 3)))
+        self.assertFalse(check(Tuple[int, ...], (1, 'a')))
+        self.assertTrue(check(Tuple[()], ()))
+
+    @unittest.skipUnless(hasattr(typing, 'Protocol'), 'Protocol requires python 3.8')
+    def test_protocol(self):
+        @typing.runtime_checkable
+        class Closeable(typing.Protocol):
+            def close(self): ...
+
+        class File:
+            def close(self): pass
+
+        self.assertTrue(check(Closeable, File()))
+        self.assertFalse(check(Closeable, object()))
+
+        class NotRuntime(typing.Protocol):
+            def close(self): ...
+
+        with self.assertRaisesRegex(Exception, 'runtime_checkable'):
+            typecheck.compile_type(NotRuntime)
+
+    def test_unsupported(self):
+        with self.assertRaisesRegex(Exception, 'does not support'):
+            typecheck.compile_type(typing.Callable[[int], int])
+        with self.assertRaisesRegex(Exception, 'container_check'):
+            typecheck.compile_type(List[int], container_check='none')
+
+    @hypothesis.given(lists(integers(), min_size=20))
+    def test_first(self, list_):
+        """Test that only the first elements are checked."""
+        self.assertTrue(check(List[int], list_ + ['a'], container_check='first', sample_size=5))
+        self.assertFalse(check(List[int], ['a'] + list_, container_check='first', sample_size=5))
+
+    @hypothesis.given(lists(text(), min_size=1))
+    def test_sample(self, list_):
+        """Test that a sample of the elements are checked."""
+        # If all elements are wrong, any sample will find it.
+        self.assertFalse(check(List[int], list_, container_check='sample', sample_size=3))
+        self.assertTrue(check(List[str], list_, container_check='sample', sample_size=3))
+        self.assertFalse(check(Set[int], set(list_), container_check='sample', sample_size=3))
+
+    def test_type_name(self):
+        self.assertEqual(typecheck.type_name(int), 'int')
+        self.assertEqual(typecheck.type_name(List[int]), 'List[int]')
+
+
+class TestTypeCheckedAnnotations(unittest.TestCase):
+    def test_annotations(self):
+        """Test that TypeChecked accepts typing annotations."""
+        class Foo:
+            a = traits.TypeChecked(Optional[List[int]])
+        foo = Foo()
+
+        foo.a = None
+        foo.a = [1, 2]
+        with self.assertRaisesRegex(Exception, r"is of type 'Optional\[List\[int\]\]', not 'list'"):
+            foo.a = ['a']
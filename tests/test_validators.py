@@ -0,0 +1,135 @@
+import unittest
+
+import hypothesis
+from hypothesis.strategies import integers, lists, one_of
+
+from traitlite import traits
+from traitlite import field, traited
+from traitlite.validators import Bounds, Predicate, compile_validators
+
+
+def interpreted(validators, delta=False):
+    """Run the validators in a loop, like the traits did before compiling them."""
+    def validate(*args):
+        if not delta:
+            value, = args
+            for validator in validators:
+                value = validator(value)
+            return value
+
+        old, value = args
+        for validator in validators:
+            previous = value
+            if isinstance(validator, (Bounds, Predicate)):
+                value = validator(value)
+            else:
+                value = validator(old, value)
+            old = previous
+        return value
+    return validate
+
+
+class TestBounds(unittest.TestCase):
+    def test_raise(self):
+        bounds = Bounds(0, 10)
+        self.assertEqual(bounds(0), 0)
+        self.assertEqual(bounds(10), 10)
+        with self.assertRaises(Exception):
+            bounds(-1)
+        with self.assertRaises(Exception):
+            bounds(11)
+
+    def test_clamp(self):
+        bounds = Bounds(0, 10, clamp=True)
+        self.assertEqual(bounds(-1), 0)
+        self.assertEqual(bounds(5), 5)
+        self.assertEqual(bounds(11), 10)
+
+    def test_open(self):
+        """Test that a missing bound is not checked."""
+        self.assertEqual(Bounds(low=0)(10 ** 9), 10 ** 9)
+        self.assertEqual(Bounds(high=0)(-10 ** 9), -10 ** 9)
+        with self.assertRaises(Exception):
+            Bounds(low=0)(-1)
+
+
+class TestPredicate(unittest.TestCase):
+    def test_predicate(self):
+        predicate = Predicate(str.isidentifier, 'must be an identifier')
+        self.assertEqual(predicate('a'), 'a')
+        with self.assertRaisesRegex(Exception, "'a b' must be an identifier"):
+            predicate('a b')
+
+
+class TestCompileValidators(unittest.TestCase):
+    @hypothesis.given(lists(one_of(integers(-5, 5).map(lambda n: ('add', n)),
+                                   integers(-5, 5).map(lambda n: ('clamp', n)))),
+                      integers(-20, 20))
+    def test_same_as_loop(self, steps, value):
+        """Test that the compiled validators give the same result as a loop."""
+        validators = []
+        for kind, n in steps:
+            if kind == 'add':
+                validators.append(lambda x, n=n: x + n)
+            else:
+                validators.append(Bounds(n - 3, n + 3, clamp=True))
+        self.assertEqual(compile_validators(validators)(value),
+                         interpreted(validators)(value))
+
+    @hypothesis.given(lists(one_of(integers(-5, 5).map(lambda n: ('max', n)),
+                                   integers(-5, 5).map(lambda n: ('clamp', n)))),
+                      integers(-20, 20), integers(-20, 20))
+    def test_delta_same_as_loop(self, steps, old, value):
+        """Test that every validator gets the value before the previous one as the old value."""
+        validators = []
+        for kind, n in steps:
+            if kind == 'max':
+                validators.append(lambda old, new, n=n: max(old + n, new))
+            else:
+                validators.append(Bounds(n - 3, n + 3, clamp=True))
+        self.assertEqual(compile_validators(validators, delta=True)(old, value),
+                         interpreted(validators, delta=True)(old, value))
+
+
+class TestTraits(unittest.TestCase):
+    def test_has_validator(self):
+        class Foo:
+            a = traits.HasValidator([Bounds(0, 10, clamp=True)])
+        foo = Foo()
+        bar = Foo()
+
+        foo.a = 11
+        self.assertEqual(foo.a, 10)
+
+        # Adding a validator recompiles the validators of that instance only.
+        Foo.a.add_validator(foo, Predicate(lambda x: x % 2 == 0))
+        with self.assertRaises(Exception):
+            foo.a = 3
+        bar.a = 3
+        self.assertEqual(bar.a, 3)
+        self.assertIn(foo, Foo.a.pipelines)
+        self.assertNotIn(bar, Foo.a.pipelines)
+
+    def test_has_validator_delta(self):
+        class Foo:
+            a = traits.HasValidatorDelta([lambda old, new: max(old or 0, new),
+                                          Bounds(high=10, clamp=True)])
+        foo = Foo()
+        foo.a = 5
+        foo.a = 3
+        self.assertEqual(foo.a, 5)
+        foo.a = 20
+        self.assertEqual(foo.a, 10)
+
+    def test_traited(self):
+        """Test that traited classes inline the validators in __init__."""
+        @traited
+        class Foo:
+            a: int = field(validators=[Bounds(0, 10)])
+
+        self.assertEqual(Foo(3).a, 3)
+        with self.assertRaises(Exception):
+            Foo(11)
+        foo = Foo(3)
+        with self.assertRaises(Exception):
+            foo.a = -1
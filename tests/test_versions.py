@@ -0,0 +1,139 @@
+import gc
+import threading
+import unittest
+
+from traitlite import traited, traits
+from traitlite.versions import _versions, snapshot, transaction, versioned
+
+
+@versioned
+class Account:
+    balance = traits.TypeChecked(int)
+    pending = traits.TypeChecked(int) + traits.HasCallback()
+
+
+class TestVersions(unittest.TestCase):
+    def test_set_and_get(self):
+        account = Account()
+        with self.assertRaises(AttributeError):
+            account.balance
+        account.balance = 1
+        self.assertEqual(account.balance, 1)
+        self.assertIn(account, Account.balance.value)
+        self.assertNotIn(account, Account.pending.value)
+        del Account.balance.value[account]
+        with self.assertRaises(AttributeError):
+            account.balance
+
+    def test_transaction(self):
+        account = Account()
+        account.balance = 1
+        seen = []
+
+        with transaction(account):
+            account.balance = 2
+            account.pending = 3
+            # The writer reads its own changes, others the published version.
+            thread = threading.Thread(target=lambda: seen.append(account.balance))
+            thread.start()
+            thread.join()
+            self.assertEqual(account.balance, 2)
+            with transaction(account):
+                account.balance = 4
+        self.assertEqual(seen, [1])
+        self.assertEqual((account.balance, account.pending), (4, 3))
+
+    def test_rollback(self):
+        account = Account()
+        account.balance = 1
+        with self.assertRaises(ValueError):
+            with transaction(account):
+                account.balance = 2
+                raise ValueError
+        self.assertEqual(account.balance, 1)
+
+        # Invalid values are still rejected when they are set.
+        with self.assertRaises(Exception):
+            with transaction(account):
+                account.balance = 'a'
+
+    def test_snapshot(self):
+        account = Account()
+        account.balance = 1
+        with snapshot(account) as view:
+            account.balance = 2
+            self.assertEqual(view.balance, 1)
+            with self.assertRaises(AttributeError):
+                view.pending
+            with self.assertRaises(Exception):
+                view.balance = 3
+        self.assertEqual(view.balance, 1)
+        self.assertEqual(repr(view), 'AccountSnapshot(balance=1)')
+
+        # Readers of the same version share its snapshot.
+        self.assertIs(snapshot(account), snapshot(account))
+        with transaction(account):
+            account.pending = 4
+            self.assertEqual(snapshot(account).pending, 4)
+        self.assertEqual((snapshot(account).balance, snapshot(account).pending), (2, 4))
+
+        class Subclass(Account):
+            pass
+
+        with self.assertRaises(Exception):
+            snapshot(Subclass())
+
+    def test_collected(self):
+        account = Account()
+        account.balance = 1
+        count = len(_versions)
+        del account
+        gc.collect()
+        self.assertEqual(len(_versions), count - 1)
+
+    def test_traited(self):
+        """Test versioning the fields of a traited class, which its __init__ sets."""
+        @versioned
+        @traited
+        class Acc:
+            balance: int
+            pending: int = 0
+
+        acc = Acc(5)
+        self.assertEqual((acc.balance, acc.pending), (5, 0))
+        with transaction(acc):
+            acc.balance -= 2
+            acc.pending += 2
+        with snapshot(acc) as view:
+            self.assertEqual((view.balance, view.pending), (3, 2))
+        self.assertEqual(acc, Acc(3, 2))
+
+    def test_consistent_reads(self):
+        """Test that readers never see a transaction half done."""
+        account = Account()
+        account.balance = 100
+        account.pending = 0
+        torn = []
+        done = threading.Event()
+
+        def write():
+            for _ in range(2000):
+                with transaction(account):
+                    account.balance -= 1
+                    account.pending += 1
+            done.set()
+
+        def read():
+            while not done.is_set():
+                with snapshot(account) as view:
+                    if view.balance + view.pending != 100:
+                        torn.append((view.balance, view.pending))
+
+        threads = [threading.Thread(target=read) for _ in range(3)]
+        threads.append(threading.Thread(target=write))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(torn, [])
+        self.assertEqual((account.balance, account.pending), (-1900, 2000))
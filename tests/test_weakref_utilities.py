@@ -140,3 +140,59 @@ class TestDefaultWeakKeyDictionary(unittest.TestCase):
             dset = weakref_utilities.DefaultWeakKeyDictionary(factory)
             obj = Foo()
             self.assertIsInstance(dset[obj], factory)
+
+
+class TestWeakIdentityDictionary(unittest.TestCase):
+    def test_identity(self):
+        """Test that keys are compared by identity, without calling __eq__ or __hash__."""
+        class Foo:
+            def __eq__(self, other):
+                raise AssertionError('__eq__ was called')
+            __hash__ = None
+
+        a, b = Foo(), Foo()
+        wdict = weakref_utilities.WeakIdentityDictionary()
+        wdict[a] = 1
+        wdict[b] = 2
+        self.assertEqual((wdict[a], wdict[b]), (1, 2))
+        self.assertIn(a, wdict)
+        self.assertEqual(wdict.get(Foo(), 3), 3)
+        self.assertEqual(len(wdict), 2)
+
+        self.assertEqual(wdict.pop(a), 1)
+        self.assertNotIn(a, wdict)
+        with self.assertRaises(KeyError):
+            wdict.pop(a)
+        self.assertIsNone(wdict.pop(a, None))
+        self.assertEqual([key is b for key in wdict], [True])
+
+    @hypothesis.given(lists(integers(), max_size=20))
+    def test_gc(self, values):
+        """Test that entries are removed when their keys are collected."""
+        class Foo: pass
+
+        wdict = weakref_utilities.WeakIdentityDictionary()
+        keys = [Foo() for _ in values]
+        for key, value in zip(keys, values):
+            wdict[key] = value
+            del key
+        self.assertEqual(sorted(wdict[key] for key in keys), sorted(values))
+
+        del keys[::2]
+        self.assertEqual(len(wdict), len(keys))
+        self.assertEqual(len(wdict.refs), len(keys))
+
+        # A deleted entry must not be removed again when its key is collected.
+        for key in keys:
+            del wdict[key]
+            del key
+        keys.clear()
+        self.assertEqual(len(wdict), 0)
+
+    def test_default(self):
+        class Foo: pass
+
+        wdict = weakref_utilities.DefaultWeakIdentityDictionary(list)
+        foo = Foo()
+        wdict[foo].append(1)
+        self.assertEqual(wdict[foo], [1])
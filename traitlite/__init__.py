@@ -1,10 +1,64 @@
 from .traits import *
+from .containers import (
+    ObservableDict,
+    ObservableList,
+    ObservableSet,
+    TypedDict,
+    TypedList,
+    TypedSet,
+)
+from .traited import field, traited
+from .validators import Bounds, Predicate
 
 __all__ = [
     'ReadOnly',
+    'Default',
     'TypeChecked',
     'HasCallback',
     'HasCallbackDelta',
     'HasValidator',
     'HasValidatorDelta',
+    'TypedList',
+    'TypedDict',
+    'TypedSet',
+    'ObservableList',
+    'ObservableDict',
+    'ObservableSet',
+    'Bounds',
+    'Predicate',
+    'field',
+    'traited',
 ]
+
+# Submodules and names which are only imported the first time they are
+# accessed, so that they do not slow down `import traitlite`.
+_lazy_attributes = {
+    'debug': ('.debug', None),
+    'BreakOnRead': ('.debug', 'BreakOnRead'),
+    'BreakOnWrite': ('.debug', 'BreakOnWrite'),
+    'BreakOnChange': ('.debug', 'BreakOnChange'),
+    'BreakOnChangeDelta': ('.debug', 'BreakOnChangeDelta'),
+    'Watch': ('.debug', 'Watch'),
+    'profile': ('.profiling', 'profile'),
+    'freeze': ('.frozen', 'freeze'),
+    'freeze_after_init': ('.frozen', 'freeze_after_init'),
+    'Interned': ('.interning', 'Interned'),
+    'InternPool': ('.interning', 'InternPool'),
+    'Indexed': ('.indexing', 'Indexed'),
+    'RangeIndexed': ('.indexing', 'RangeIndexed'),
+    'Choice': ('.choices', 'Choice'),
+    'override': ('.overrides', 'override'),
+    'versioned': ('.versions', 'versioned'),
+    'transaction': ('.versions', 'transaction'),
+    'snapshot': ('.versions', 'snapshot'),
+}
+
+
+def __getattr__(name):
+    if name not in _lazy_attributes:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    import importlib
+    module_name, attribute = _lazy_attributes[name]
+    module = importlib.import_module(module_name, __name__)
+    return module if attribute is None else getattr(module, attribute)
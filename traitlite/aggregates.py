@@ -0,0 +1,192 @@
+"""
+Aggregates over the values of a trait across all live objects, which are
+kept up to date as the values are set and their objects are garbage
+collected, so reading them does not iterate over the objects.
+::
+
+    from traitlite import TypeChecked
+
+    class Connection:
+        bytes_sent = TypeChecked(int)
+
+    stats = Connection.bytes_sent.aggregate('sum', 'mean', 'max')
+
+    connections = [Connection() for _ in range(3)]
+    for connection, sent in zip(connections, [10, 20, 60]):
+        connection.bytes_sent = sent
+
+    print(stats.sum, stats.mean, stats.max) # 90 30.0 60
+    del connections[2]
+    print(stats.max) # 20
+
+Only real numbers are aggregated: other values and NaN are left out,
+including from ``count``. ``count`` and ``sum`` are updated in constant
+time, and ``min`` and ``max`` with heaps in logarithmic time. Sums of
+floats use compensated summation, so adding and removing values does not
+accumulate rounding errors.
+"""
+from __future__ import annotations
+
+import heapq
+
+from .weakref_utilities import _MISSING, ObservedWeakIdentityDictionary, observe
+
+# Avoid importing typing at runtime, see traits.py.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, List, Optional, Tuple
+
+    from .traits import BaseTrait
+
+
+AGGREGATES = ('count', 'sum', 'mean', 'min', 'max')
+
+
+def _aggregated(value: Any) -> bool:
+    """Returns whether a value is a real number other than NaN."""
+    if type(value) is int or type(value) is float:
+        return value == value
+    import numbers
+    return isinstance(value, numbers.Real) and value == value
+
+
+class _Heap:
+    """
+    A heap of ``(key, id)`` entries with lazy deletion: entries whose value
+    is no longer stored are only dropped when they reach the top.
+    """
+    def __init__(self, sign: int) -> None:
+        # -1 turns the min-heap into a max-heap.
+        self.sign = sign
+        self.entries: List[Tuple[Any, int]] = []
+
+    def push(self, key_id: int, value: Any) -> None:
+        heapq.heappush(self.entries, (self.sign * value, key_id))
+
+    def top(self, storage: ObservedWeakIdentityDictionary) -> Any:
+        entries = self.entries
+        while entries:
+            key, key_id = entries[0]
+            value = storage.value_of(key_id)
+            if value is not _MISSING and _aggregated(value) and self.sign * value == key:
+                return value
+            heapq.heappop(entries)
+        return None
+
+    def rebuild(self, storage: ObservedWeakIdentityDictionary) -> None:
+        self.entries = [(self.sign * value, key_id) for key_id, value in storage.id_items()
+                        if _aggregated(value)]
+        heapq.heapify(self.entries)
+
+
+class Aggregate:
+    """
+    The aggregates of a trait, see the module documentation. Use
+    :meth:`~traitlite.traits.BaseTrait.aggregate` to get it. The aggregates
+    are attributes, and are None while there are no values.
+    """
+    # The storage of the trait, which is observed before any aggregate is enabled.
+    storage: ObservedWeakIdentityDictionary
+
+    def __init__(self) -> None:
+        self.count = 0
+        # The sum is kept as an exact integer part and a compensated float part.
+        self.int_sum = 0
+        self.float_sum = 0.0
+        self.compensation = 0.0
+        self.heaps: Dict[str, _Heap] = {}
+
+    def enable(self, names: Tuple[str, ...]) -> None:
+        """Starts keeping the heaps for the given aggregates, if they are min or max."""
+        for name in names:
+            if name not in AGGREGATES:
+                raise Exception(
+                    f"The aggregate must be one of {', '.join(AGGREGATES)}, not '{name}'")
+            if name in ('min', 'max') and name not in self.heaps:
+                heap = _Heap(1 if name == 'min' else -1)
+                heap.rebuild(self.storage)
+                self.heaps[name] = heap
+
+    def stored(self, key_id: int, old: Any, new: Any) -> None:
+        if old is new:
+            return
+        if old is not _MISSING:
+            self.removed(key_id, old)
+        if not _aggregated(new):
+            return
+
+        self.count += 1
+        self.add(new)
+        for heap in self.heaps.values():
+            heap.push(key_id, new)
+
+        # Keep the stale entries of the heaps from piling up.
+        for heap in self.heaps.values():
+            if len(heap.entries) > 2 * self.count + 64:
+                heap.rebuild(self.storage)
+
+    def removed(self, key_id: int, old: Any) -> None:
+        if _aggregated(old):
+            self.count -= 1
+            self.add(-old)
+
+    def add(self, value: Any) -> None:
+        if type(value) is int:
+            self.int_sum += value
+            return
+
+        # Neumaier's compensated summation.
+        value = float(value)
+        total = self.float_sum + value
+        if abs(self.float_sum) >= abs(value):
+            self.compensation += (self.float_sum - total) + value
+        else:
+            self.compensation += (value - total) + self.float_sum
+        self.float_sum = total
+
+    @property
+    def sum(self) -> Any:
+        if not self.count:
+            return 0
+        if self.float_sum == 0.0 and self.compensation == 0.0:
+            return self.int_sum
+        return self.int_sum + (self.float_sum + self.compensation)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    @property
+    def min(self) -> Any:
+        return self._top('min')
+
+    @property
+    def max(self) -> Any:
+        return self._top('max')
+
+    def _top(self, name: str) -> Any:
+        heap = self.heaps.get(name)
+        if heap is None:
+            raise Exception(f"The aggregate '{name}' was not requested")
+        return heap.top(self.storage)
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in AGGREGATES:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __repr__(self) -> str:
+        names = ('count', 'sum', 'mean') + tuple(self.heaps)
+        values = ', '.join(f'{name}={self[name]!r}' for name in names)
+        return f'<{self.__class__.__name__} {values}>'
+
+
+def aggregate(trait: BaseTrait, names: Tuple[str, ...]) -> Aggregate:
+    """Returns the aggregate of a trait, creating it on the first call."""
+    aggregate = trait.__dict__.get('aggregates')
+    if aggregate is None:
+        aggregate = Aggregate()
+        aggregate.storage = observe(trait, aggregate)
+        trait.__dict__['aggregates'] = aggregate
+    aggregate.enable(names)
+    return aggregate
@@ -0,0 +1,163 @@
+"""
+Attributes restricted to a fixed set of values.
+::
+
+    from traitlite import Choice
+
+    class Job:
+        status = Choice(['queued', 'running', 'done', 'failed'])
+
+    job = Job()
+    job.status = 'running'
+    job.status = 'paused' # This raises an exception
+
+:class:`Choice` checks a value with a single lookup in a table built when the
+trait is created, instead of comparing it with each allowed value. Each
+object stores the small integer code of its value, which is decoded to the
+allowed value when the attribute is read. Values which were created
+separately, for example parsed from a file, are therefore not kept alive by
+the objects: the attribute always returns the object from the list of
+choices.
+"""
+from __future__ import annotations
+
+import weakref
+
+from .traits import BaseTrait
+from .weakref_utilities import (
+    _MISSING,
+    ObservedWeakIdentityDictionary,
+    WeakIdentityDictionary,
+)
+
+# Avoid importing typing at runtime, see traits.py.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterable, List, Tuple, Type
+
+    from .traits import Owner, Value
+
+
+class ChoiceStorage(ObservedWeakIdentityDictionary):
+    """
+    The value storage of a :class:`Choice` trait, which stores the code of
+    each value and decodes it when it is read. Its observers are given the
+    decoded values, so a :class:`Choice` can be combined with traits which
+    observe the storage, like :class:`~traitlite.indexing.Indexed`.
+    """
+    def __init__(self, choices: Tuple[Any, ...], codes: Dict[Any, int]) -> None:
+        super().__init__()
+        self.choices = choices
+        self.codes = codes
+
+    def encode(self, value: Any) -> int:
+        """Returns the code of a value, raising KeyError if it is not a choice."""
+        try:
+            return self.codes[value]
+        except TypeError:
+            raise KeyError(value) from None
+
+    def __getitem__(self, key: Owner) -> Any:
+        return self.choices[self.data[id(key)]]
+
+    def get(self, key: Owner, default: Any = None) -> Any:
+        code = self.data.get(id(key))
+        return default if code is None else self.choices[code]
+
+    def __setitem__(self, key: Owner, value: Any) -> None:
+        code = self.encode(value)
+        key_id = id(key)
+        old = self.data.get(key_id, _MISSING)
+        if old is _MISSING and key_id not in self.refs:
+            self.refs[key_id] = weakref.KeyedRef(key, self._remove, key_id)
+        self.data[key_id] = code
+        if self.observers:
+            old = _MISSING if old is _MISSING else self.choices[old]
+            for observer in self.observers:
+                observer.stored(key_id, old, self.choices[code])
+
+    def __delitem__(self, key: Owner) -> None:
+        old = self.choices[self.data[id(key)]]
+        WeakIdentityDictionary.__delitem__(self, key)
+        for observer in self.observers:
+            observer.removed(id(key), old)
+
+    def pop(self, key: Owner, default: Any = _MISSING) -> Any:
+        if key not in self:
+            return WeakIdentityDictionary.pop(self, key, default)
+        old = self.choices[WeakIdentityDictionary.pop(self, key)]
+        for observer in self.observers:
+            observer.removed(id(key), old)
+        return old
+
+    def collected(self, key_id: int) -> None:
+        code = self.data.get(key_id)
+        WeakIdentityDictionary.collected(self, key_id)
+        if code is not None:
+            for observer in self.observers:
+                observer.removed(key_id, self.choices[code])
+
+    def value_of(self, key_id: int, default: Any = _MISSING) -> Any:
+        code = self.data.get(key_id)
+        return default if code is None else self.choices[code]
+
+    def id_items(self) -> List[Tuple[int, Any]]:
+        return [(key_id, self.choices[code]) for key_id, code in self.data.items()]
+
+
+class Choice(BaseTrait):
+    """
+    A trait which only accepts one of the given values, see the module
+    documentation.
+
+    Values are looked up by equality, like in a set, so they must be
+    hashable. Since ``1 == 1.0 == True``, a value equal to a choice is
+    accepted and the attribute then returns the choice.
+    """
+    def __init__(self, values: Iterable[Value]) -> None:
+        """
+        :param values: The allowed values. Duplicates are ignored.
+        :type values:  iterable
+        """
+        super().__init__()
+        choices: List[Any] = []
+        codes: Dict[Any, int] = {}
+        for value in values:
+            try:
+                if value in codes:
+                    continue
+            except TypeError:
+                raise Exception(f'The choices must be hashable, not {value!r}') from None
+            codes[value] = len(choices)
+            choices.append(value)
+        if not choices:
+            raise Exception('At least one choice must be given')
+
+        self.choices: Tuple[Any, ...] = tuple(choices)
+        self.codes = codes
+        self.value = ChoiceStorage(self.choices, codes)
+
+    def __set_name__(self, owner: Type[Owner], name: str) -> None:
+        # Adding traits may have kept the plain storage of another trait. It
+        # is replaced before the traits combined with this one get their
+        # name, so that those which observe the storage, like Indexed,
+        # observe the choice storage whichever order they were added in.
+        storage = self.value
+        if type(storage) is WeakIdentityDictionary:
+            self.value = ChoiceStorage(self.choices, self.codes)
+        elif not isinstance(storage, ChoiceStorage):
+            raise Exception(
+                f"The storage of '{name}' cannot be a choice: {type(storage).__name__}")
+        super().__set_name__(owner, name)
+
+    def __set__(self, obj: Owner, value: Value) -> None:
+        try:
+            valid = value in self.codes
+        except TypeError:
+            valid = False
+        if not valid:
+            choices = ', '.join(map(repr, self.choices))
+            raise Exception(
+                f"The attribute '{obj.__class__.__name__}.{self.name}' "
+                f"must be one of {choices}, not {value!r}")
+        super().__set__(obj, value)
@@ -0,0 +1,717 @@
+"""
+Traits for lists, dicts and sets which keep track of in-place changes.
+
+The traits store a tracked copy of the container which is assigned to them.
+The tracked containers behave exactly like the builtin ones, but tell the trait
+about every change, so that only the new items need to be looked at. The
+observable traits describe each change with a :class:`ListChange`,
+:class:`DictChange` or :class:`SetChange` record, so that consumers can apply
+small patches instead of comparing whole containers.
+"""
+from __future__ import annotations
+
+import weakref
+
+from .traits import BaseTrait, HasCallback, Owner, Value
+from .typecheck import compile_type, type_name
+from .weakref_utilities import DefaultWeakIdentityDictionary
+
+# Avoid importing typing at runtime, see traits.py.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class _Change:
+    """A base class for change records."""
+    __slots__: Tuple[str, ...] = ()
+    __hash__ = None  # type: ignore
+
+    def __eq__(self, other: Any) -> bool:
+        return type(self) is type(other) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{self.__class__.__name__}({fields})'
+
+
+class ListChange(_Change):
+    """
+    A change of a list: starting at ``index``, the items in ``removed`` were
+    replaced by the items in ``added``. Applying the change to a copy of the
+    old list gives the new list:
+    ::
+
+        old[change.index:change.index + len(change.removed)] = change.added
+    """
+    __slots__ = ('index', 'removed', 'added')
+
+    def __init__(self, index: int, removed: List[Any], added: List[Any]) -> None:
+        self.index = index
+        self.removed = removed
+        self.added = added
+
+
+class DictChange(_Change):
+    """
+    A change of a dict. ``removed`` maps removed or overwritten keys to their
+    old values, ``added`` maps added or overwritten keys to their new values.
+    """
+    __slots__ = ('removed', 'added')
+
+    def __init__(self, removed: Dict[Any, Any], added: Dict[Any, Any]) -> None:
+        self.removed = removed
+        self.added = added
+
+
+class SetChange(_Change):
+    """A change of a set, given as the items which were removed and added."""
+    __slots__ = ('removed', 'added')
+
+    def __init__(self, removed: Set[Any], added: Set[Any]) -> None:
+        self.removed = removed
+        self.added = added
+
+
+def _clamp(index: int, length: int) -> int:
+    """Turn an index into a position the way list.insert does."""
+    if index < 0:
+        index += length
+    return min(max(index, 0), length)
+
+
+def _position(index: int, length: int) -> int:
+    """Turn a possibly negative index into a position."""
+    return index + length if index < 0 else index
+
+
+class _Detached:
+    """
+    The trait of a tracked container which has been replaced by another one,
+    so that its changes are no longer checked or reported.
+    """
+    observed = False
+
+    def check_items(self, obj: Optional[Owner], items: List[Any]) -> None:
+        pass
+
+
+_DETACHED = _Detached()
+
+
+class _TrackedList(list):
+    """A list which passes new items to its trait before they are added."""
+    __slots__ = ('_trait', '_owner')
+
+    def __init__(self, trait: _ContainerTrait, owner: Any, items: Iterable[Any]) -> None:
+        super().__init__(items)
+        self._trait = trait
+        self._owner = weakref.ref(owner)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Copies and pickles are plain lists.
+        return list, (list(self),)
+
+    def _check(self, items: List[Any]) -> None:
+        self._trait.check_items(self._owner(), items)
+
+    def _changed(self, index: int, removed: List[Any], added: List[Any]) -> None:
+        owner = self._owner()
+        if owner is not None:
+            self._trait.container_changed(owner, ListChange(index, removed, added))
+
+    def append(self, item: Any) -> None:
+        self._check([item])
+        super().append(item)
+        if self._trait.observed:
+            self._changed(len(self) - 1, [], [item])
+
+    def extend(self, items: Iterable[Any]) -> None:
+        items = list(items)
+        self._check(items)
+        index = len(self)
+        super().extend(items)
+        if self._trait.observed:
+            self._changed(index, [], items)
+
+    def insert(self, index: int, item: Any) -> None:  # type: ignore
+        self._check([item])
+        index = _clamp(index, len(self))
+        super().insert(index, item)
+        if self._trait.observed:
+            self._changed(index, [], [item])
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if not isinstance(index, slice):
+            self._check([value])
+            index = _position(index, len(self))
+            old = self[index]
+            super().__setitem__(index, value)
+            if self._trait.observed:
+                self._changed(index, [old], [value])
+            return
+
+        value = list(value)
+        self._check(value)
+        start, stop, step = index.indices(len(self))
+        removed = self[index]
+        super().__setitem__(index, value)
+        if not self._trait.observed:
+            return
+
+        if step == 1:
+            self._changed(start, removed, value)
+        else:
+            # Extended slices replace items one by one.
+            for position, old, new in zip(range(start, stop, step), removed, value):
+                self._changed(position, [old], [new])
+
+    def __delitem__(self, index: Any) -> None:
+        if not isinstance(index, slice):
+            index = _position(index, len(self))
+            old = self[index]
+            super().__delitem__(index)
+            if self._trait.observed:
+                self._changed(index, [old], [])
+            return
+
+        start, stop, step = index.indices(len(self))
+        removed = self[index]
+        super().__delitem__(index)
+        if not self._trait.observed:
+            return
+
+        if step == 1:
+            self._changed(start, removed, [])
+        else:
+            # Report the removals from the back, so that each index is still
+            # valid when the changes are applied in order.
+            positions = list(zip(range(start, stop, step), removed))
+            for position, old in sorted(positions, key=lambda p: p[0], reverse=True):
+                self._changed(position, [old], [])
+
+    def __iadd__(self, items: Iterable[Any]) -> _TrackedList:  # type: ignore
+        self.extend(items)
+        return self
+
+    def __imul__(self, count: int) -> _TrackedList:  # type: ignore
+        length = len(self)
+        removed = list(self) if count <= 0 else []
+        super().__imul__(count)
+        if self._trait.observed:
+            if removed:
+                self._changed(0, removed, [])
+            elif count > 1:
+                self._changed(length, [], self[length:])
+        return self
+
+    def pop(self, index: int = -1) -> Any:  # type: ignore
+        position = _position(index, len(self))
+        item = super().pop(index)
+        if self._trait.observed:
+            self._changed(position, [item], [])
+        return item
+
+    def remove(self, item: Any) -> None:
+        self.__delitem__(self.index(item))
+
+    def clear(self) -> None:
+        removed = list(self)
+        super().clear()
+        if self._trait.observed and removed:
+            self._changed(0, removed, [])
+
+    def sort(self, *, key: Optional[Callable[[Any], Any]] = None,
+             reverse: bool = False) -> None:
+        old = list(self) if self._trait.observed else []
+        super().sort(key=key, reverse=reverse)
+        if self._trait.observed:
+            self._changed(0, old, list(self))
+
+    def reverse(self) -> None:
+        old = list(self) if self._trait.observed else []
+        super().reverse()
+        if self._trait.observed:
+            self._changed(0, old, list(self))
+
+
+class _TrackedDict(dict):
+    """A dict which passes new items to its trait before they are added."""
+    __slots__ = ('_trait', '_owner')
+
+    def __init__(self, trait: _ContainerTrait, owner: Any, items: Any) -> None:
+        super().__init__(items)
+        self._trait = trait
+        self._owner = weakref.ref(owner)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return dict, (dict(self),)
+
+    def _check(self, items: List[Tuple[Any, Any]]) -> None:
+        self._trait.check_items(self._owner(), items)
+
+    def _changed(self, removed: Dict[Any, Any], added: Dict[Any, Any]) -> None:
+        owner = self._owner()
+        if owner is not None:
+            self._trait.container_changed(owner, DictChange(removed, added))
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._check([(key, value)])
+        removed = {key: self[key]} if key in self else {}
+        super().__setitem__(key, value)
+        if self._trait.observed:
+            self._changed(removed, {key: value})
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        items = list(dict(*args, **kwargs).items())
+        self._check(items)
+        removed = {key: self[key] for key, _ in items if key in self}
+        super().update(items)
+        if self._trait.observed and items:
+            self._changed(removed, dict(items))
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+
+        self._check([(key, default)])
+        super().setdefault(key, default)
+        if self._trait.observed:
+            self._changed({}, {key: default})
+        return default
+
+    def __ior__(self, other: Any) -> _TrackedDict:  # type: ignore
+        self.update(other)
+        return self
+
+    def __delitem__(self, key: Any) -> None:
+        value = self[key]
+        super().__delitem__(key)
+        if self._trait.observed:
+            self._changed({key: value}, {})
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        if key not in self:
+            return super().pop(key, *default)
+
+        value = super().pop(key)
+        if self._trait.observed:
+            self._changed({key: value}, {})
+        return value
+
+    def popitem(self) -> Tuple[Any, Any]:
+        key, value = super().popitem()
+        if self._trait.observed:
+            self._changed({key: value}, {})
+        return key, value
+
+    def clear(self) -> None:
+        removed = dict(self)
+        super().clear()
+        if self._trait.observed and removed:
+            self._changed(removed, {})
+
+
+class _TrackedSet(set):
+    """A set which passes new items to its trait before they are added."""
+    __slots__ = ('_trait', '_owner')
+
+    def __init__(self, trait: _ContainerTrait, owner: Any, items: Iterable[Any]) -> None:
+        super().__init__(items)
+        self._trait = trait
+        self._owner = weakref.ref(owner)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return set, (set(self),)
+
+    def _check(self, items: List[Any]) -> None:
+        self._trait.check_items(self._owner(), items)
+
+    def _changed(self, removed: Set[Any], added: Set[Any]) -> None:
+        owner = self._owner()
+        if owner is not None and (removed or added):
+            self._trait.container_changed(owner, SetChange(removed, added))
+
+    def add(self, item: Any) -> None:
+        self._check([item])
+        new = item not in self
+        super().add(item)
+        if self._trait.observed and new:
+            self._changed(set(), {item})
+
+    def update(self, *others: Iterable[Any]) -> None:
+        items = [item for other in others for item in other]
+        self._check(items)
+        added = {item for item in items if item not in self}
+        super().update(items)
+        if self._trait.observed:
+            self._changed(set(), added)
+
+    def symmetric_difference_update(self, other: Iterable[Any]) -> None:
+        other = set(other)
+        added = other - self
+        self._check(list(added))
+        removed = other & self
+        super().symmetric_difference_update(other)
+        if self._trait.observed:
+            self._changed(removed, added)
+
+    def __ior__(self, other: Any) -> _TrackedSet:  # type: ignore
+        self.update(other)
+        return self
+
+    def __ixor__(self, other: Any) -> _TrackedSet:  # type: ignore
+        self.symmetric_difference_update(other)
+        return self
+
+    def remove(self, item: Any) -> None:
+        super().remove(item)
+        if self._trait.observed:
+            self._changed({item}, set())
+
+    def discard(self, item: Any) -> None:
+        if item in self:
+            self.remove(item)
+
+    def pop(self) -> Any:
+        item = super().pop()
+        if self._trait.observed:
+            self._changed({item}, set())
+        return item
+
+    def clear(self) -> None:
+        removed = set(self)
+        super().clear()
+        if self._trait.observed:
+            self._changed(removed, set())
+
+    def difference_update(self, *others: Iterable[Any]) -> None:
+        removed = {item for other in others for item in other if item in self}
+        super().difference_update(removed)
+        if self._trait.observed:
+            self._changed(removed, set())
+
+    def intersection_update(self, *others: Iterable[Any]) -> None:
+        # Every item could be removed, so this is O(n) like the set operation.
+        removed = set(self).difference(set(self).intersection(*others))
+        super().difference_update(removed)
+        if self._trait.observed:
+            self._changed(removed, set())
+
+    def __isub__(self, other: Any) -> _TrackedSet:  # type: ignore
+        self.difference_update(other)
+        return self
+
+    def __iand__(self, other: Any) -> _TrackedSet:  # type: ignore
+        self.intersection_update(other)
+        return self
+
+
+class _ContainerTrait(BaseTrait[Owner, Value]):
+    """
+    A base class for traits which store a tracked container. This should not
+    be instantiated.
+    """
+    container_type: Any = object
+    tracked_type: Any = object
+
+    # Whether container_changed needs to be called. Building the change
+    # records is skipped for traits which only validate. The list, dict and
+    # set traits define replacement, which returns the change record for
+    # replacing the whole container.
+    observed = False
+
+    def __set__(self, obj: Owner, value: Any) -> None:
+        old: Any = self.value.get(obj)
+        if old is not None and value is old:
+            # Augmented assignments like ``foo.bar += [1]`` assign the stored
+            # container, whose changes were already checked and reported.
+            super().__set__(obj, value)
+            return
+
+        if not isinstance(value, self.container_type):
+            raise Exception(
+                f"The attribute '{obj.__class__.__name__}.{self.name}' "
+                f"is of type '{self.container_type.__name__}', not '{type(value).__name__}'")
+
+        items = list(value.items()) if isinstance(value, dict) else list(value)
+        self.check_items(obj, items)
+
+        tracked = self.tracked_type(self, obj, value)
+        super().__set__(obj, tracked)
+
+        if old is None:
+            old = self.container_type()
+        elif isinstance(old, self.tracked_type):
+            # The old container may still be referenced elsewhere, but its
+            # changes no longer concern the object.
+            old._trait = _DETACHED
+
+        if self.observed:
+            self.container_changed(obj, self.replacement(old, tracked))
+
+    def check_items(self, obj: Optional[Owner], items: List[Any]) -> None:
+        """
+        Called with the items which are about to be added to the container of
+        the given object. For dicts, the items are ``(key, value)`` pairs.
+        Raising an exception prevents the change.
+        """
+        pass
+
+    def container_changed(self, obj: Owner, change: _Change) -> None:
+        """
+        Called with a change record after the container of the given object
+        has changed, if :attr:`observed` is True.
+        """
+        pass
+
+    def replacement(self, old: Any, new: Any) -> _Change:
+        """Returns the change record for replacing the whole container."""
+        raise NotImplementedError
+
+    def _compile_item_type(self, item_type: Any) -> Tuple[Any, ...]:
+        accepted, check = compile_type(item_type)
+        return item_type, accepted, check
+
+    def _check_item(self, obj: Optional[Owner], kind: str,
+                    compiled: Tuple[Any, ...], item: Any) -> None:
+        item_type, accepted, check = compiled
+        if type(item) not in accepted and not check(item):
+            raise Exception(
+                f"The attribute '{obj.__class__.__name__}.{self.name}' can only "
+                f"contain {kind} of type '{type_name(item_type)}', not '{type(item).__name__}'")
+
+
+class _ListTrait(_ContainerTrait):
+    container_type = list
+    tracked_type = _TrackedList
+
+    def replacement(self, old: Any, new: Any) -> ListChange:
+        """Returns the change record for replacing the whole list."""
+        return ListChange(0, list(old), list(new))
+
+
+class _DictTrait(_ContainerTrait):
+    container_type = dict
+    tracked_type = _TrackedDict
+
+    def replacement(self, old: Any, new: Any) -> DictChange:
+        """Returns the change record for replacing the whole dict."""
+        return DictChange(dict(old), dict(new))
+
+
+class _SetTrait(_ContainerTrait):
+    container_type = set
+    tracked_type = _TrackedSet
+
+    def replacement(self, old: Any, new: Any) -> SetChange:
+        """Returns the change record for replacing the whole set."""
+        return SetChange(set(old) - set(new), set(new) - set(old))
+
+
+class TypedList(_ListTrait):
+    """
+    A trait which stores a list and checks the type of every item which is
+    added to it, including items added by changing the list in place. Only
+    the new items are checked, so appending to a long list stays cheap.
+    ::
+
+        from traitlite import TypedList
+
+        class Foo:
+            bar = TypedList(int)
+
+            def __init__(self, bar):
+                self.bar = bar
+
+        foo = Foo([1, 2]) # This is okay
+        foo.bar.append(3) # This is okay
+        foo.bar.append(3.0) # This raises an exception
+
+    The trait stores a copy of the assigned list, so changes to the original
+    list are not seen by the trait.
+    """
+    def __init__(self, item_type: Any) -> None:
+        """
+        :param item_type: The type of the items, which may be any annotation
+                          supported by :class:`TypeChecked`.
+        :type item_type:  type
+        """
+        super().__init__()
+        self.item_type = self._compile_item_type(item_type)
+
+    def check_items(self, obj: Optional[Owner], items: List[Any]) -> None:
+        for item in items:
+            self._check_item(obj, 'items', self.item_type, item)
+        super().check_items(obj, items)
+
+
+class TypedDict(_DictTrait):
+    """
+    A trait which stores a dict and checks the types of every key and value
+    which is added to it, including items added by changing the dict in place.
+    ::
+
+        from traitlite import TypedDict
+
+        class Foo:
+            bar = TypedDict(str, float)
+
+            def __init__(self):
+                self.bar = {}
+
+        foo = Foo()
+        foo.bar['a'] = 1.0 # This is okay
+        foo.bar.update(b=2) # This raises an exception
+    """
+    def __init__(self, key_type: Any, value_type: Any) -> None:
+        """
+        :param key_type:   The type of the keys.
+        :type key_type:    type
+        :param value_type: The type of the values.
+        :type value_type:  type
+        """
+        super().__init__()
+        self.key_type = self._compile_item_type(key_type)
+        self.value_type = self._compile_item_type(value_type)
+
+    def check_items(self, obj: Optional[Owner], items: List[Any]) -> None:
+        for key, value in items:
+            self._check_item(obj, 'keys', self.key_type, key)
+            self._check_item(obj, 'values', self.value_type, value)
+        super().check_items(obj, items)
+
+
+class TypedSet(_SetTrait):
+    """
+    A trait which stores a set and checks the type of every item which is
+    added to it, including items added by changing the set in place.
+    ::
+
+        from traitlite import TypedSet
+
+        class Foo:
+            bar = TypedSet(str)
+
+            def __init__(self):
+                self.bar = set()
+
+        foo = Foo()
+        foo.bar.add('a') # This is okay
+        foo.bar |= {1} # This raises an exception
+    """
+    def __init__(self, item_type: Any) -> None:
+        """
+        :param item_type: The type of the items.
+        :type item_type:  type
+        """
+        super().__init__()
+        self.item_type = self._compile_item_type(item_type)
+
+    def check_items(self, obj: Optional[Owner], items: List[Any]) -> None:
+        for item in items:
+            self._check_item(obj, 'items', self.item_type, item)
+        super().check_items(obj, items)
+
+
+class _ObservableContainer(_ContainerTrait):
+    """
+    A base class for traits which pass change records of their container to
+    callbacks. This should not be instantiated.
+    """
+    observed = True
+
+    def __init__(self, callbacks: Optional[List[Callable[[_Change], None]]] = None) -> None:
+        """
+        :param callbacks: A list of callbacks to use for every instance of this trait.
+        :type callbacks:  list
+        """
+        super().__init__()
+        for callback in callbacks or []:
+            self.check_callback(callback)
+
+        self.callbacks: DefaultWeakIdentityDictionary[Any, List[Callable[[_Change], None]]] = \
+            DefaultWeakIdentityDictionary(lambda: list(callbacks or []))
+
+    def container_changed(self, obj: Owner, change: _Change) -> None:
+        for callback in self.callbacks[obj]:
+            callback(change)
+        super().container_changed(obj, change)
+
+    def add_callback(self, obj: Owner, func: Callable[[_Change], None]) -> None:
+        """
+        Adds a callback to be called after the container has changed. The
+        callback must be a callable object which takes the change record as
+        its argument.
+        """
+        self.check_callback(func)
+        self.callbacks[obj].append(func)
+
+    check_callback = staticmethod(HasCallback.check_callback)
+
+
+class ObservableList(_ObservableContainer, _ListTrait):
+    """
+    A trait which stores a list and calls its callbacks with a
+    :class:`ListChange` whenever the list is assigned or changed in place.
+    ::
+
+        from traitlite import ObservableList
+
+        def print_change(change):
+            print(change)
+
+        class Foo:
+            bar = ObservableList([print_change])
+
+            def __init__(self):
+                self.bar = [1, 2]  # ListChange(index=0, removed=[], added=[1, 2])
+
+        foo = Foo()
+        foo.bar.append(3)  # ListChange(index=2, removed=[], added=[3])
+        del foo.bar[0]     # ListChange(index=0, removed=[1], added=[])
+
+    Container traits can be added together, e.g. ``TypedList(int) +
+    ObservableList()`` checks new items and reports the changes.
+    """
+    pass
+
+
+class ObservableDict(_ObservableContainer, _DictTrait):
+    """
+    A trait which stores a dict and calls its callbacks with a
+    :class:`DictChange` whenever the dict is assigned or changed in place.
+    ::
+
+        from traitlite import ObservableDict
+
+        class Foo:
+            bar = ObservableDict()
+
+        foo = Foo()
+        foo.bar = {}
+        Foo.bar.add_callback(foo, lambda change: print(change))
+        foo.bar['a'] = 1  # DictChange(removed={}, added={'a': 1})
+        foo.bar['a'] = 2  # DictChange(removed={'a': 1}, added={'a': 2})
+    """
+    pass
+
+
+class ObservableSet(_ObservableContainer, _SetTrait):
+    """
+    A trait which stores a set and calls its callbacks with a
+    :class:`SetChange` whenever the set is assigned or changed in place.
+    ::
+
+        from traitlite import ObservableSet
+
+        class Foo:
+            bar = ObservableSet()
+
+        foo = Foo()
+        foo.bar = {1}
+        Foo.bar.add_callback(foo, lambda change: print(change))
+        foo.bar |= {1, 2}  # SetChange(removed=set(), added={2})
+    """
+    pass
@@ -1,4 +1,34 @@
-from typing import Callable, Type
+"""
+Traits which start the debugger when an attribute is accessed.
+
+The debug traits can be switched off globally, in which case they become
+plain storage: a disarmed :class:`BreakOnRead` or :class:`BreakOnWrite` costs
+exactly as much as a :class:`~traitlite.traits.BaseTrait`, and a disarmed
+:class:`BreakOnChange` or :class:`BreakOnChangeDelta` as much as a
+:class:`~traitlite.traits.HasCallback` or
+:class:`~traitlite.traits.HasCallbackDelta`. This is done by switching the
+class of each trait, so disarmed traits do not check a flag on every access.
+
+The traits are armed by default, unless the ``PYTHONBREAKPOINT`` environment
+variable is ``0``. The ``TRAITLITE_DEBUG`` environment variable overrides this:
+``0`` disarms them and any other value arms them. They can be armed and
+disarmed at runtime with :func:`arm` and :func:`disarm`.
+::
+
+    from traitlite import debug
+
+    class Foo:
+        bar = debug.BreakOnRead()
+        fizz = debug.BreakOnWrite()
+
+    debug.disarm()               # Disarms all debug traits.
+    debug.arm(Foo)               # Arms the debug traits of Foo.
+    debug.disarm(Foo, 'fizz')    # Disarms only Foo.fizz.
+"""
+from __future__ import annotations
+
+import os
+from weakref import WeakSet
 
 from .traits import (
     BaseTrait,
@@ -8,8 +38,115 @@ from .traits import (
     Value,
 )
 
+# Avoid importing typing at runtime, see traits.py.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Optional, Type
+
+
+def _armed_by_default() -> bool:
+    if 'TRAITLITE_DEBUG' in os.environ:
+        return os.environ['TRAITLITE_DEBUG'] != '0'
+    return os.environ.get('PYTHONBREAKPOINT') != '0'
+
+
+# Whether debug traits are armed when they are added to a class.
+armed = _armed_by_default()
 
-class BreakOnRead(BaseTrait):
+# Every debug trait which has been added to a class.
+_traits: WeakSet[_DebugTrait] = WeakSet()
+
+# The disarmed version of each debug trait class.
+_disarmed_classes: Dict[type, type] = {}
+
+
+class _DebugTrait(BaseTrait[Owner, Value]):
+    """
+    The base of the debug traits, which handles arming and disarming them.
+    This class should not be instantiated.
+    """
+    def __set_name__(self, owner: Type[Owner], name: str) -> None:
+        super().__set_name__(owner, name)
+        _traits.add(self)
+        if not armed:
+            _set_armed(self, False)
+
+
+def _disarmed_class(class_: type) -> type:
+    """Returns the class of the given debug trait class without the debug classes."""
+    if class_ not in _disarmed_classes:
+        # The mro without the debug classes is still a valid mro, like the
+        # ones created by resolve_mro.
+        bases = tuple(base for base in class_.__mro__ if not issubclass(base, _DebugTrait))
+        _disarmed_classes[class_] = type(class_.__name__, bases, {'armed_class': class_})
+    return _disarmed_classes[class_]
+
+
+def _set_armed(trait: Any, arm_trait: bool) -> None:
+    disarmed = 'armed_class' in type(trait).__dict__
+    if arm_trait and disarmed:
+        trait.__class__ = type(trait).armed_class
+    elif not arm_trait and not disarmed:
+        trait.__class__ = _disarmed_class(type(trait))
+
+
+def _select(owner: Optional[type], name: Optional[str]) -> Any:
+    """Returns the debug traits of the given class and attribute."""
+    if owner is None:
+        return list(_traits)
+
+    selected = []
+    for class_ in owner.__mro__:
+        for attribute, trait in vars(class_).items():
+            if trait in _traits and (name is None or attribute == name):
+                selected.append(trait)
+    return selected
+
+
+def arm(owner: Optional[type] = None, name: Optional[str] = None) -> None:
+    """
+    Arms debug traits, so that they start the debugger again.
+
+    Without arguments, all debug traits are armed, including the ones which
+    are created later.
+
+    :param owner: Only arm the debug traits of this class.
+    :type owner:  type
+    :param name:  Only arm the debug trait of this attribute of ``owner``.
+    :type name:   str
+    """
+    global armed
+    if owner is None:
+        armed = True
+    for trait in _select(owner, name):
+        _set_armed(trait, True)
+
+
+def disarm(owner: Optional[type] = None, name: Optional[str] = None) -> None:
+    """
+    Disarms debug traits, so that they only store the value.
+
+    Without arguments, all debug traits are disarmed, including the ones which
+    are created later.
+
+    :param owner: Only disarm the debug traits of this class.
+    :type owner:  type
+    :param name:  Only disarm the debug trait of this attribute of ``owner``.
+    :type name:   str
+    """
+    global armed
+    if owner is None:
+        armed = False
+    for trait in _select(owner, name):
+        _set_armed(trait, False)
+
+
+def is_armed(trait: BaseTrait) -> bool:
+    """Returns whether the given debug trait is armed."""
+    return 'armed_class' not in type(trait).__dict__
+
+
+class BreakOnRead(_DebugTrait[Owner, Value]):
     """
     A trait which starts the debugger when it is accessed. The method called to
     start the debugger is the one set in the PYTHONBREAKPOINT environment
@@ -32,7 +169,7 @@ class BreakOnRead(BaseTrait):
         return super().__get__(obj, objtype)
 
 
-class BreakOnWrite(BaseTrait):
+class BreakOnWrite(_DebugTrait[Owner, Value]):
     """
     A trait which starts the debugger when it is accessed. The method called to
     start the debugger is the one set in the PYTHONBREAKPOINT environment
@@ -66,7 +203,7 @@ class BreakOnWrite(BaseTrait):
         super().__set__(obj, value)
 
 
-class BreakOnChange(HasCallback):
+class BreakOnChange(_DebugTrait[Owner, Value], HasCallback[Owner, Value]):
     """
     A trait which starts the debugger when its value causes the specified callback
     to return True. The method called to start the debugger is the one set in the
@@ -86,17 +223,19 @@ class BreakOnChange(HasCallback):
         foo.bar = -1 # breakpoint() is called here.
     """
     def __init__(self, callback: Callable[[Value], bool]) -> None:
-        def break_on_true(value: Value) -> None:
-            """Call breakpoint if the specified callback evaluates to True."""
-            if callback(value):
-                breakpoint()
+        super().__init__()
+        self.condition = callback
 
-        # Pass the callback to the HasCallback base to be called when the value is
-        # changed.
-        super().__init__([break_on_true])
+    def __set__(self, obj: Owner, value: Value) -> None:
+        super().__set__(obj, value)
 
+        # The condition is not a callback of the HasCallback base, so that it
+        # is not called when the trait is disarmed.
+        if self.condition(value):
+            breakpoint()
 
-class BreakOnChangeDelta(HasCallbackDelta):
+
+class BreakOnChangeDelta(_DebugTrait[Owner, Value], HasCallbackDelta[Owner, Value]):
     """
     A trait which starts the debugger when its old and new values cause the specified
     callback to return True. The method called to start the debugger is the one set in the
@@ -115,12 +254,141 @@ class BreakOnChangeDelta(HasCallbackDelta):
         foo.bar = 5 # The new value is higher, so breakpoint is NOT called.
         foo.bar = 4 # The new value is lower, so breakpoint is called.
     """
-    def __init__(self, callback: Callable[[Value, Value], bool]) -> None:
-        def break_on_true(old: Value, new: Value) -> None:
-            """Call breakpoint if the specified callback evaluates to True."""
-            if callback(old, new):
-                breakpoint()
+    def __init__(self, callback: Callable[[Optional[Value], Value], bool]) -> None:
+        super().__init__()
+        self.condition = callback
+
+    def __set__(self, obj: Owner, value: Value) -> None:
+        old_value = self.value.get(obj)
+        super().__set__(obj, value)
+
+        # The condition is not a callback of the HasCallbackDelta base, so that
+        # it is not called when the trait is disarmed.
+        if self.condition(old_value, value):
+            breakpoint()
+
+
+class Watch(BaseTrait[Owner, Value]):
+    """
+    A trait which records a sample of the reads and writes of an attribute in
+    a bounded buffer, without stopping the process. Unlike the other debug
+    traits, it is not disarmed by :func:`disarm`, since it is meant to be used
+    in production.
+    ::
+
+        from traitlite.debug import Watch
+
+        class Foo:
+            bar = Watch(rate=0.01, stack_depth=5)
+
+        foo = Foo()
+        for i in range(1000):
+            foo.bar = i
+
+        # Roughly 10 writes were recorded, with the five innermost frames of
+        # the code which wrote them.
+        with open('bar.jsonl', 'w') as file:
+            Foo.bar.export(file)
+
+    Each record is a dict with the keys ``time``, ``event`` (``'read'`` or
+    ``'write'``), ``owner`` (the class name), ``id`` (the ``id`` of the
+    object), ``attribute``, ``value`` (its ``repr``), ``thread`` and, if
+    ``stack_depth`` is given, ``stack``. The buffer keeps the latest
+    ``capacity`` records.
+    """
+    def __init__(self, rate: float = 1.0, reads: bool = True, writes: bool = True,
+                 stack_depth: int = 0, capacity: int = 1024,
+                 max_value_length: int = 200) -> None:
+        """
+        :param rate:             The fraction of accesses to record.
+        :type rate:              float
+        :param reads:            Whether to record reads.
+        :type reads:             bool
+        :param writes:           Whether to record writes.
+        :type writes:            bool
+        :param stack_depth:      The number of frames of the accessing code to
+                                 record, or 0 to not record the stack.
+        :type stack_depth:       int
+        :param capacity:         The number of records to keep.
+        :type capacity:          int
+        :param max_value_length: The length at which the ``repr`` of the value is
+                                 cut off.
+        :type max_value_length:  int
+        """
+        super().__init__()
+        if not 0 <= rate <= 1:
+            raise Exception(f'The rate must be between 0 and 1, not {rate}')
+
+        import random
+        from collections import deque
+
+        self.rate = rate
+        self.reads = reads
+        self.writes = writes
+        self.stack_depth = stack_depth
+        self.max_value_length = max_value_length
+        self.random = random.Random().random
+        self.records: deque[Dict[str, Any]] = deque(maxlen=capacity)
+        # The number of accesses, including the ones which were not recorded.
+        self.accesses = 0
+
+    def __get__(self, obj: Owner, objtype: Type[Owner]) -> Value:
+        value = super().__get__(obj, objtype)
+        if obj is not None and self.reads:
+            self.accesses += 1
+            if self.rate >= 1 or self.random() < self.rate:
+                self.record('read', obj, value)
+        return value
+
+    def __set__(self, obj: Owner, value: Value) -> None:
+        super().__set__(obj, value)
+        if self.writes:
+            self.accesses += 1
+            if self.rate >= 1 or self.random() < self.rate:
+                self.record('write', obj, value)
+
+    def record(self, event: str, obj: Owner, value: Value) -> None:
+        """Adds a record of an access to the buffer."""
+        import sys
+        import threading
+        import time
+
+        try:
+            value_repr = repr(value)
+        except Exception as exception:
+            value_repr = f'<repr failed: {exception!r}>'
+
+        record = {
+            'time': time.time(),
+            'event': event,
+            'owner': type(obj).__name__,
+            'id': id(obj),
+            'attribute': self.name,
+            'value': value_repr[:self.max_value_length],
+            'thread': threading.current_thread().name,
+        }
+        if self.stack_depth > 0:
+            import traceback
+
+            # Skip this method and __get__ or __set__.
+            frames = traceback.extract_stack(sys._getframe(2), limit=self.stack_depth)
+            record['stack'] = [
+                f'{frame.filename}:{frame.lineno} in {frame.name}' for frame in reversed(frames)]
+        self.records.append(record)
+
+    def export(self, file: Optional[Any] = None) -> str:
+        """
+        Returns the records as JSON lines, oldest first. If a file object is
+        given, the lines are also written to it.
+        """
+        import json
+
+        lines = ''.join(json.dumps(record) + '\n' for record in list(self.records))
+        if file is not None:
+            file.write(lines)
+        return lines
 
-        # Pass the callback to the HasCallback base to be called when the value is
-        # changed.
-        super().__init__([break_on_true])
+    def clear(self) -> None:
+        """Removes all records and resets the access count."""
+        self.records.clear()
+        self.accesses = 0
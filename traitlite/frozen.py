@@ -0,0 +1,175 @@
+"""
+Frozen records of objects whose traits are no longer changed.
+
+Every read of a trait goes through ``__get__`` and the trait's storage, even
+for objects which are built once and then only read. :func:`freeze` copies
+the trait values of such an object into a frozen record: an instance of a
+subclass which keeps the values in ``__slots__``, so reads are plain
+attribute reads. Records cannot be changed, compare equal when their values
+are, and cache their hash, so they are cheap dictionary keys.
+::
+
+    from traitlite import ReadOnly, TypeChecked, freeze
+
+    class Point:
+        x = TypeChecked(float) + ReadOnly()
+        y = TypeChecked(float) + ReadOnly()
+
+        def __init__(self, x, y):
+            self.x = x
+            self.y = y
+
+    point = freeze(Point(1.0, 2.0))
+    print(point.x) # 1.0, without calling the trait
+    isinstance(point, Point) # True
+    point.x = 3.0 # Raises an exception
+
+    seen = {point}
+
+Classes whose instances are always frozen can use :func:`freeze_after_init`
+instead.
+"""
+from __future__ import annotations
+
+from weakref import WeakKeyDictionary
+
+from .traits import BaseTrait, _MISSING
+
+# Avoid importing typing at runtime, see traits.py.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Tuple, Type, TypeVar
+
+    T = TypeVar('T')
+
+
+_frozen_classes: WeakKeyDictionary[type, type] = WeakKeyDictionary()
+
+
+def trait_names(cls: type) -> Tuple[str, ...]:
+    """Returns the names of the traits of a class, base classes first."""
+    names: Dict[str, None] = {}
+    for klass in reversed(cls.__mro__):
+        for name, attribute in vars(klass).items():
+            if isinstance(attribute, BaseTrait):
+                names[name] = None
+    return tuple(names)
+
+
+class _FrozenRecord:
+    """
+    The methods shared by all frozen classes. The trait values are kept in
+    slots named after the traits, which are listed in ``__frozen_fields__``.
+    """
+    __slots__ = ()
+    __frozen_fields__: Tuple[str, ...] = ()
+    # A slot of each frozen class, which is set on the first call to __hash__.
+    __frozen_hash__: int
+
+    def __frozen_values__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name, _MISSING) for name in self.__frozen_fields__)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise Exception(f"'{self.__class__.__name__}' object is frozen")
+
+    def __delattr__(self, name: str) -> None:
+        raise Exception(f"'{self.__class__.__name__}' object is frozen")
+
+    def __eq__(self, other: Any) -> bool:
+        if other is self:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.__frozen_values__() == other.__frozen_values__()
+
+    def __hash__(self) -> int:
+        try:
+            return self.__frozen_hash__
+        except AttributeError:
+            value = hash((self.__class__, self.__frozen_values__()))
+            object.__setattr__(self, '__frozen_hash__', value)
+            return value
+
+
+def frozen_class(cls: Type[T]) -> Type[T]:
+    """
+    Returns the frozen subclass of a class with traits. It is created once
+    per class.
+    """
+    if issubclass(cls, _FrozenRecord):
+        return cls
+
+    frozen = _frozen_classes.get(cls)
+    if frozen is None:
+        fields = trait_names(cls)
+        frozen = type(cls.__name__, (_FrozenRecord, cls), {
+            '__slots__': fields + ('__frozen_hash__',),
+            '__frozen_fields__': fields,
+            '__module__': cls.__module__,
+            '__qualname__': cls.__qualname__,
+        })
+        _frozen_classes[cls] = frozen
+    return frozen
+
+
+def freeze(obj: T) -> T:
+    """
+    Returns a frozen record with the same trait values as the given object,
+    see the module documentation. Attributes which are not traits are copied
+    as well, but are not part of the hash or the comparison. The object
+    itself is not changed.
+
+    :param obj: An object with traits.
+    """
+    cls: Any = frozen_class(obj.__class__)
+    if cls is obj.__class__:
+        return obj
+
+    record = object.__new__(cls)
+    for name in cls.__frozen_fields__:
+        value = getattr(obj, name, _MISSING)
+        if value is not _MISSING:
+            object.__setattr__(record, name, value)
+
+    attributes = getattr(obj, '__dict__', None)
+    if attributes:
+        record.__dict__.update(attributes)
+    return record
+
+
+def freeze_after_init(cls: Type[T]) -> Type[T]:
+    """
+    A class decorator which makes every new instance a frozen record. The
+    ``__init__`` of the class runs on a normal instance, which is then
+    frozen, so it can set the traits as usual.
+    ::
+
+        from traitlite import ReadOnly, freeze_after_init
+
+        @freeze_after_init
+        class Point:
+            x = ReadOnly()
+            y = ReadOnly()
+
+            def __init__(self, x, y):
+                self.x = x
+                self.y = y
+
+        point = Point(1, 2)
+        {point: 'origin'} # Hashable, with a cached hash
+    """
+    frozen = frozen_class(cls)
+    init = cls.__init__
+
+    def __new__(frozen_cls: type, *args: Any, **kwargs: Any) -> Any:
+        obj = object.__new__(cls)
+        init(obj, *args, **kwargs)
+        return freeze(obj)
+
+    def __init__(self: Any, *args: Any, **kwargs: Any) -> None:
+        # The new instance has already been initialized by __new__.
+        pass
+
+    type.__setattr__(frozen, '__new__', __new__)
+    type.__setattr__(frozen, '__init__', __init__)
+    return frozen
@@ -0,0 +1,305 @@
+"""
+Indexes over the values of a trait, which are kept up to date as the values
+are set and their objects are garbage collected.
+
+Finding all objects with a certain value would otherwise mean iterating over
+every stored value. :class:`Indexed` keeps a reverse index from each value to
+the objects which have it:
+::
+
+    from traitlite import Indexed, TypeChecked
+
+    class Job:
+        status = TypeChecked(str) + Indexed()
+
+    jobs = [Job() for _ in range(1000)]
+    for i, job in enumerate(jobs):
+        job.status = 'failed' if i % 100 == 0 else 'done'
+
+    print(Job.status.count('failed')) # 10
+    for job in Job.status.find('failed'):
+        job.status = 'retry'
+
+The index does not keep the objects alive. Values are found by equality, so
+they must be hashable, and must not change their hash while they are stored.
+Unhashable values are stored but not indexed.
+
+Numeric attributes can be kept in order with :class:`RangeIndexed` instead,
+to find the objects with values in a range or the ones with the largest or
+smallest values:
+::
+
+    from traitlite import RangeIndexed, TypeChecked
+
+    class Request:
+        latency = TypeChecked(float) + RangeIndexed()
+
+    slow = Request.latency.range(100, 200)
+    worst = Request.latency.top_k(10)
+"""
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, bisect_right
+
+from .traits import BaseTrait
+from .weakref_utilities import _MISSING, ObservedWeakIdentityDictionary, observe
+
+# Avoid importing typing at runtime, see traits.py.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterator, List, Optional, Type
+
+    from .traits import Owner, Value
+
+
+class ValueIndex:
+    """
+    A reverse index from values to the ids of the objects which store them,
+    in the order the objects were given the value. It observes the storage of
+    a trait, see :func:`~traitlite.weakref_utilities.observe`.
+    """
+    # The storage is observed once the trait has a name.
+    storage: ObservedWeakIdentityDictionary
+
+    def __init__(self) -> None:
+        self.owners: Dict[Any, Dict[int, None]] = {}
+
+    def stored(self, key_id: int, old: Any, new: Any) -> None:
+        if old is new:
+            return
+        if old is not _MISSING:
+            self.removed(key_id, old)
+        try:
+            owners = self.owners.get(new)
+        except TypeError:
+            return
+        if owners is None:
+            owners = self.owners[new] = {}
+        owners[key_id] = None
+
+    def removed(self, key_id: int, old: Any) -> None:
+        try:
+            owners = self.owners.get(old)
+        except TypeError:
+            return
+        if owners is not None:
+            owners.pop(key_id, None)
+            if not owners:
+                del self.owners[old]
+
+    def find(self, value: Any) -> List[Any]:
+        owners = (self.storage.key(key_id) for key_id in self.owners.get(value, ()))
+        return [owner for owner in owners if owner is not None]
+
+    def count(self, value: Any) -> int:
+        return len(self.owners.get(value, ()))
+
+
+class Indexed(BaseTrait):
+    """
+    A trait which keeps a reverse index of its values, so the objects with a
+    given value can be found without looking at all others. See the module
+    documentation.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.index = ValueIndex()
+
+    def __set_name__(self, owner: Type[Owner], name: str) -> None:
+        super().__set_name__(owner, name)
+        self.index.storage = observe(self, self.index)
+
+    def find(self, value: Value) -> List[Owner]:
+        """
+        Returns the objects whose attribute is equal to the given value, in
+        the order they were given the value. This takes time proportional to
+        the number of objects found.
+        """
+        return self.index.find(value)
+
+    def count(self, value: Value) -> int:
+        """Returns the number of objects whose attribute is equal to the given value."""
+        return self.index.count(value)
+
+    def distinct(self) -> Iterator[Value]:
+        """Returns the distinct values of the attribute."""
+        return iter(list(self.index.owners))
+
+
+class _SortedList:
+    """
+    Values with the ids of their objects, sorted by value. They are kept in
+    buckets of at most ``2 * load`` items, so an item is inserted or removed
+    by moving the items of a single bucket. The values and ids are kept in
+    separate lists, so that searching only compares values.
+    """
+    def __init__(self, load: int = 512) -> None:
+        self.load = load
+        self.values: List[List[Any]] = []
+        self.ids: List[List[int]] = []
+        # The largest value of each bucket.
+        self.maxes: List[Any] = []
+        self.length = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def add(self, value: Any, key_id: int) -> None:
+        if not self.values:
+            self.values.append([value])
+            self.ids.append([key_id])
+            self.maxes.append(value)
+            self.length = 1
+            return
+
+        i = bisect_left(self.maxes, value)
+        if i == len(self.values):
+            # Larger than all values, so it goes at the end of the last bucket.
+            i -= 1
+            self.values[i].append(value)
+            self.ids[i].append(key_id)
+            self.maxes[i] = value
+        else:
+            j = bisect_right(self.values[i], value)
+            self.values[i].insert(j, value)
+            self.ids[i].insert(j, key_id)
+        self.length += 1
+
+        values = self.values[i]
+        if len(values) > 2 * self.load:
+            ids = self.ids[i]
+            self.values[i + 1:i + 1] = [values[self.load:]]
+            self.ids[i + 1:i + 1] = [ids[self.load:]]
+            del values[self.load:], ids[self.load:]
+            self.maxes[i:i + 1] = [values[-1], self.values[i + 1][-1]]
+
+    def remove(self, value: Any, key_id: int) -> None:
+        # Equal values may continue in the following buckets.
+        i = bisect_left(self.maxes, value)
+        j = bisect_left(self.values[i], value) if i < len(self.values) else 0
+        while i < len(self.values):
+            values, ids = self.values[i], self.ids[i]
+            while j < len(values) and values[j] == value:
+                if ids[j] == key_id:
+                    del values[j], ids[j]
+                    self.length -= 1
+                    if not values:
+                        del self.values[i], self.ids[i], self.maxes[i]
+                    elif j == len(values):
+                        self.maxes[i] = values[-1]
+                    return
+                j += 1
+            if j < len(values):
+                break
+            i += 1
+            j = 0
+        raise ValueError(value)
+
+    def irange(self, low: Any, high: Any) -> Iterator[int]:
+        """Yields the ids of the values from ``low`` to ``high`` (inclusive) in order."""
+        i = bisect_left(self.maxes, low)
+        if i == len(self.values):
+            return
+        j = bisect_left(self.values[i], low)
+        while i < len(self.values):
+            values = self.values[i]
+            end = bisect_right(values, high, j)
+            yield from self.ids[i][j:end]
+            if end < len(values):
+                return
+            i += 1
+            j = 0
+
+    def __iter__(self) -> Iterator[int]:
+        for ids in self.ids:
+            yield from ids
+
+    def __reversed__(self) -> Iterator[int]:
+        for ids in reversed(self.ids):
+            yield from reversed(ids)
+
+
+class RangeIndex:
+    """
+    The ids of the objects which store numeric values for a trait, sorted by
+    value. It observes the storage of a trait, see
+    :func:`~traitlite.weakref_utilities.observe`.
+    """
+    # The storage is observed once the trait has a name.
+    storage: ObservedWeakIdentityDictionary
+
+    def __init__(self) -> None:
+        self.items = _SortedList()
+
+    @staticmethod
+    def indexed(value: Any) -> bool:
+        """Returns whether a value can be put in order, which excludes NaN."""
+        if type(value) is int or type(value) is float:
+            return value == value
+        import numbers
+        return isinstance(value, numbers.Real) and value == value
+
+    def stored(self, key_id: int, old: Any, new: Any) -> None:
+        if old is new:
+            return
+        if old is not _MISSING:
+            self.removed(key_id, old)
+        if self.indexed(new):
+            self.items.add(new, key_id)
+
+    def removed(self, key_id: int, old: Any) -> None:
+        if self.indexed(old):
+            self.items.remove(old, key_id)
+
+    def owners(self, key_ids: Iterator[int], limit: Optional[int] = None) -> List[Any]:
+        """Returns the live owners with the given ids, at most ``limit`` of them."""
+        refs = self.storage.refs
+        owners: List[Any] = []
+        for key_id in key_ids:
+            if limit is not None and len(owners) >= limit:
+                break
+            # The ids come from the index, which may still hold an object
+            # whose entry is being removed.
+            wr = refs.get(key_id)
+            owner = None if wr is None else wr()
+            if owner is not None:
+                owners.append(owner)
+        return owners
+
+
+class RangeIndexed(BaseTrait):
+    """
+    A trait which keeps its numeric values in order, so the objects with
+    values in a range or with the largest or smallest values can be found
+    without looking at all others. See the module documentation. Values
+    which are not real numbers, and NaN, are stored but not indexed.
+
+    Queries take logarithmic time plus time proportional to the number of
+    objects returned. Setting a value takes logarithmic time plus moving
+    the items of a single bucket of the index.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.range_index = RangeIndex()
+
+    def __set_name__(self, owner: Type[Owner], name: str) -> None:
+        super().__set_name__(owner, name)
+        self.range_index.storage = observe(self, self.range_index)
+
+    def range(self, low: Any = None, high: Any = None) -> List[Owner]:
+        """
+        Returns the objects whose values are between ``low`` and ``high``
+        (inclusive) in ascending order. A bound of None is open.
+        """
+        low = -math.inf if low is None else low
+        high = math.inf if high is None else high
+        return self.range_index.owners(self.range_index.items.irange(low, high))
+
+    def top_k(self, k: int) -> List[Owner]:
+        """Returns the ``k`` objects with the largest values, largest first."""
+        return self.range_index.owners(reversed(self.range_index.items), k)
+
+    def bottom_k(self, k: int) -> List[Owner]:
+        """Returns the ``k`` objects with the smallest values, smallest first."""
+        return self.range_index.owners(iter(self.range_index.items), k)
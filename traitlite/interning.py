@@ -0,0 +1,154 @@
+"""
+Interned storage for attributes which hold few distinct values.
+
+Attributes like status codes or region names often hold one of a handful of
+values, but every object keeps its own copy if the values are created
+separately, for example when they are parsed from a file. :class:`Interned`
+replaces each new value by an equal one which is already stored, so equal
+values share one object.
+::
+
+    from traitlite import Interned, TypeChecked
+
+    class Request:
+        status = TypeChecked(str) + Interned()
+
+    requests = [Request() for _ in range(3)]
+    for request, status in zip(requests, 'ok,ok,failed'.split(',')):
+        request.status = status
+
+    requests[0].status is requests[1].status # True
+    print(len(Request.status.pool)) # 2
+    print(Request.status.pool.hit_rate) # 0.333...
+
+Most of these values, like strings and tuples, cannot be weakly referenced.
+Instead, the pool counts how many objects store each value, and forgets a
+value once it is no longer stored, when the attribute is set to another value
+or the object is garbage collected.
+"""
+from __future__ import annotations
+
+import math
+
+from .traits import BaseTrait
+from .weakref_utilities import _MISSING, ObservedWeakIdentityDictionary, observe
+
+# Avoid importing typing at runtime, see traits.py.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, List, Optional, Type
+
+    from .traits import Owner, Value
+
+
+def _key(value: Any) -> Any:
+    """
+    Returns a key which is only equal for values which can replace each
+    other. Equality alone is not enough, since ``1 == 1.0 == True`` and
+    ``0.0 == -0.0``.
+    """
+    value_type = type(value)
+    if value_type is str:
+        # Strings are only equal to strings, so they are their own keys.
+        return value
+    if value_type is tuple:
+        return value_type, tuple(map(_key, value))
+    if value_type is float:
+        return value_type, value, math.copysign(1.0, value)
+    return value_type, value
+
+
+class InternPool:
+    """
+    A pool of values, each of which is kept as long as it is stored by at
+    least one object. A pool can be shared by several :class:`Interned`
+    traits.
+    """
+    def __init__(self) -> None:
+        # Each key maps to the pooled value and the number of its users.
+        self.values: Dict[Any, List[Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of values which were already in the pool."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def acquire(self, value: Any) -> Any:
+        """
+        Returns the pooled value equal to the given one, adding it if there is
+        none, and counts one more user. Unhashable values are returned as is.
+        """
+        try:
+            key = value if type(value) is str else _key(value)
+            entry = self.values.get(key)
+        except TypeError:
+            return value
+
+        if entry is None:
+            self.misses += 1
+            self.values[key] = [value, 1]
+            return value
+
+        self.hits += 1
+        entry[1] += 1
+        return entry[0]
+
+    def release(self, value: Any) -> None:
+        """Counts one user less of a pooled value, removing it if it was the last."""
+        try:
+            key = value if type(value) is str else _key(value)
+            entry = self.values.get(key)
+        except TypeError:
+            return
+
+        if entry is None or entry[0] is not value:
+            return
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self.values[key]
+
+
+class _Interner:
+    """Interns the values stored for an :class:`Interned` trait, see observe()."""
+    # The storage is observed once the trait has a name.
+    storage: ObservedWeakIdentityDictionary
+
+    def __init__(self, pool: InternPool) -> None:
+        self.pool = pool
+
+    def stored(self, key_id: int, old: Any, new: Any) -> None:
+        pooled = self.pool.acquire(new)
+        if pooled is not new:
+            self.storage.data[key_id] = pooled
+        if old is not _MISSING:
+            self.pool.release(old)
+
+    def removed(self, key_id: int, old: Any) -> None:
+        self.pool.release(old)
+
+
+class Interned(BaseTrait):
+    """
+    A trait which stores an equal pooled object instead of each new value,
+    see the module documentation. Values are only interned with values of
+    the same type, and unhashable values are stored as they are.
+    """
+    def __init__(self, pool: Optional[InternPool] = None) -> None:
+        """
+        :param pool: The pool to take the values from, which can be shared
+                     with other traits. By default each trait has its own.
+        :type pool:  InternPool
+        """
+        super().__init__()
+        self.pool = pool if pool is not None else InternPool()
+
+    def __set_name__(self, owner: Type[Owner], name: str) -> None:
+        super().__set_name__(owner, name)
+        interner = _Interner(self.pool)
+        interner.storage = observe(self, interner)
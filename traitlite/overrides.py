@@ -0,0 +1,109 @@
+"""
+Temporary overrides of trait values, which are only seen in the current
+context, like the current thread or asyncio task.
+::
+
+    import asyncio
+    from traitlite import TypeChecked, override
+
+    class Config:
+        timeout = TypeChecked(float)
+
+    config = Config()
+    config.timeout = 1.0
+
+    async def handle(timeout):
+        with override(config, timeout=timeout):
+            await asyncio.sleep(0)
+            print(config.timeout) # The timeout of this request
+
+    async def main():
+        await asyncio.gather(handle(5.0), handle(10.0))
+        print(config.timeout) # 1.0
+
+    asyncio.run(main())
+
+The overrides are kept in a :class:`contextvars.ContextVar` of each trait,
+so the objects are not copied, reads take no locks, and tasks started in the
+``with`` block see the overrides as well.
+Only reading the attribute is affected: setting it still changes the value
+for all contexts, which the override hides until the block ends. Override
+values are not validated, and no callbacks are called for them.
+
+Reading an attribute costs one extra check until its trait is overridden
+for the first time, and a lookup in the trait's context variable afterwards.
+"""
+from __future__ import annotations
+
+import threading
+from contextvars import ContextVar
+
+from .traits import BaseTrait
+
+# Avoid importing typing at runtime, see traits.py.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from contextvars import Token
+    from typing import Any, List, Tuple
+
+    from .traits import Owner
+
+# Creating the context variable of a trait is not thread-safe otherwise.
+_lock = threading.Lock()
+
+
+def _trait(obj: Owner, name: str) -> BaseTrait:
+    """Returns the trait of the given object's class with the given name."""
+    for cls in type(obj).__mro__:
+        if name in vars(cls):
+            trait = vars(cls)[name]
+            if isinstance(trait, BaseTrait):
+                return trait
+            break
+    raise Exception(f"'{type(obj).__name__}.{name}' is not a trait")
+
+
+def _context_variable(trait: BaseTrait) -> ContextVar:
+    """Returns the context variable with the overrides of a trait, creating it if necessary."""
+    with _lock:
+        if trait.overrides is None:
+            trait.overrides = ContextVar(f'traitlite_overrides_{trait.name}', default=None)
+        return trait.overrides
+
+
+class override:
+    """
+    A context manager which overrides the values of traits of an object in
+    the current context, see the module documentation. Overrides can be
+    nested, and the inner ones take precedence.
+    ::
+
+        with override(config, timeout=5.0, retries=0):
+            ...
+    """
+    def __init__(self, obj: Owner, **values: Any) -> None:
+        """
+        :param obj:    The object whose attributes are overridden.
+        :param values: The attribute names and their values.
+        """
+        self.obj = obj
+        self.values = [(_trait(obj, name), value) for name, value in values.items()]
+        self.tokens: List[List[Tuple[ContextVar, Token]]] = []
+
+    def __enter__(self) -> Any:
+        tokens = []
+        for trait, value in self.values:
+            variable = trait.overrides or _context_variable(trait)
+            # Each trait maps the ids of the overridden objects to the objects
+            # and their values. Keeping the objects alive makes sure the ids
+            # are not reused while the mapping exists, since copied contexts
+            # can outlive the ``with`` block.
+            overrides = dict(variable.get() or {})
+            overrides[id(self.obj)] = (self.obj, value)
+            tokens.append((variable, variable.set(overrides)))
+        self.tokens.append(tokens)
+        return self.obj
+
+    def __exit__(self, *exc_info: Any) -> None:
+        for variable, token in reversed(self.tokens.pop()):
+            variable.reset(token)
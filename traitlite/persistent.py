@@ -0,0 +1,297 @@
+"""
+A persistent storage backend for traits which keeps numeric and fixed-width
+values in a memory-mapped file.
+
+The file consists of a 64 byte header followed by fixed-size records. Each
+record starts with a 64 bit presence mask (one bit per field) followed by the
+packed field values, using the little-endian :mod:`struct` formats given in
+the schema. Because the file is memory-mapped, reattaching an object to its
+record after a restart does not read anything; pages are only brought in when
+an attribute is actually accessed.
+
+Crash consistency
+-----------------
+* A field is written value first and presence bit second, and the record count
+  in the header is only increased once the new record has been zeroed. A
+  reader therefore never sees a field which is marked as present but was
+  never written.
+* The mapping is shared with the kernel's page cache, so every completed write
+  survives a crash of the *process* (including ``SIGKILL`` and ``os._exit``)
+  without calling :meth:`MappedStore.flush`.
+* After a crash of the *machine* only the state as of the last
+  :meth:`MappedStore.flush` is guaranteed. Pages written after that may or may
+  not have reached the disk, and not necessarily in the order they were
+  written.
+* Writes to several fields, or to several records, are not atomic as a group.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import zlib
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+    Type,
+)
+
+from .traits import BaseTrait
+from .weakref_utilities import WeakIdentityDictionary
+
+if TYPE_CHECKING:
+    from .traits import Owner, Value
+
+
+_MAGIC = b'TRAITLT1'
+_HEADER = struct.Struct('<8sIIQ')
+_HEADER_SIZE = 64
+_MASK = struct.Struct('<Q')
+
+
+class MappedStore:
+    """
+    A memory-mapped file of fixed-size records, shared by the
+    :class:`Persistent` traits of a class. The schema is a sequence of
+    ``(name, format)`` pairs, where each format is a single :mod:`struct`
+    format such as ``'d'``, ``'q'``, ``'?'`` or ``'16s'``. The schema must not
+    change between runs which use the same file.
+    ::
+
+        from traitlite.persistent import MappedStore, Persistent
+
+        store = MappedStore('points.bin', [('x', 'd'), ('y', 'd')])
+
+        class Point:
+            x = Persistent(store)
+            y = Persistent(store)
+
+        point = Point()
+        point.x = 1.5 # A new record is allocated on the first write.
+        index = store.index_of(point)
+
+        # After a restart, attach a new object to the existing record.
+        point = Point.__new__(Point)
+        store.attach(point, index)
+        print(point.x) # 1.5
+    """
+    def __init__(self, path: str, fields: Sequence[Tuple[str, str]],
+                 capacity: int = 1024) -> None:
+        """
+        :param path:     The file to store the records in. It is created if it
+                         does not exist yet.
+        :type path:      str
+        :param fields:   The ``(name, format)`` pairs making up a record.
+        :type fields:    list
+        :param capacity: The number of records to reserve space for initially.
+        :type capacity:  int
+        """
+        if not 0 < len(fields) <= 64:
+            raise Exception('A store must have between 1 and 64 fields.')
+        if capacity < 1:
+            raise Exception(f'The capacity must be at least 1, not {capacity}')
+
+        self.path = path
+        self.fields: Dict[str, Tuple[int, int, struct.Struct]] = {}
+
+        # Every record starts with the presence mask, followed by the values
+        # in schema order.
+        offset = _MASK.size
+        for bit, (name, format_) in enumerate(fields):
+            packer = struct.Struct('<' + format_)
+            self.fields[name] = (bit, offset, packer)
+            offset += packer.size
+        self.record_size = offset
+
+        schema = ';'.join(f'{name}:{format_}' for name, format_ in fields)
+        self.schema_crc = zlib.crc32(schema.encode())
+
+        self.records: WeakIdentityDictionary[Any, int] = WeakIdentityDictionary()
+
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            size = os.fstat(fd).st_size
+            if size == 0:
+                size = _HEADER_SIZE + capacity * self.record_size
+                os.ftruncate(fd, size)
+                self.mmap = mmap.mmap(fd, size)
+                _HEADER.pack_into(self.mmap, 0, _MAGIC, self.record_size,
+                                  self.schema_crc, 0)
+            else:
+                self.mmap = mmap.mmap(fd, size)
+                self._check_header()
+        finally:
+            # The mapping keeps its own reference to the file.
+            os.close(fd)
+
+    def _check_header(self) -> None:
+        magic, record_size, schema_crc, _ = _HEADER.unpack_from(self.mmap, 0)
+        if magic != _MAGIC:
+            raise Exception(f"'{self.path}' is not a traitlite store")
+        if record_size != self.record_size or schema_crc != self.schema_crc:
+            raise Exception(
+                f"The schema of '{self.path}' does not match the given fields")
+
+    def __len__(self) -> int:
+        return _HEADER.unpack_from(self.mmap, 0)[3]
+
+    @property
+    def capacity(self) -> int:
+        """The number of records which fit into the file without growing it."""
+        return (len(self.mmap) - _HEADER_SIZE) // self.record_size
+
+    def allocate(self, obj: Optional[Any] = None) -> int:
+        """
+        Appends a new, empty record and returns its index. If an object is
+        given, it is attached to the new record.
+        """
+        index = len(self)
+        if index >= self.capacity:
+            self.mmap.resize(_HEADER_SIZE + max(1, 2 * self.capacity) * self.record_size)
+
+        # Make sure the record is empty before it becomes visible.
+        start = self._offset(index)
+        self.mmap[start:start + self.record_size] = bytes(self.record_size)
+        _HEADER.pack_into(self.mmap, 0, _MAGIC, self.record_size,
+                          self.schema_crc, index + 1)
+
+        if obj is not None:
+            self.records[obj] = index
+        return index
+
+    def attach(self, obj: Any, index: int) -> None:
+        """
+        Attaches an object to an existing record. Nothing is read from the
+        record until one of the object's persistent attributes is accessed.
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(f"'{self.path}' has no record {index}")
+        self.records[obj] = index
+
+    def index_of(self, obj: Any) -> int:
+        """Returns the index of the record the given object is attached to."""
+        return self.records[obj]
+
+    def column(self, name: str) -> '_Column':
+        """Returns a mapping from attached objects to the values of a field."""
+        if name not in self.fields:
+            raise Exception(f"'{self.path}' has no field '{name}'")
+        return _Column(self, name)
+
+    def flush(self) -> None:
+        """Writes all changes to disk, see the module documentation."""
+        self.mmap.flush()
+
+    def close(self) -> None:
+        self.mmap.close()
+
+    def _offset(self, index: int) -> int:
+        return _HEADER_SIZE + index * self.record_size
+
+
+class _Column(MutableMapping[Any, Any]):
+    """
+    A mapping view of a single field of a :class:`MappedStore`, which is used
+    as the value storage of a :class:`Persistent` trait.
+    """
+    def __init__(self, store: MappedStore, name: str) -> None:
+        self.store = store
+        self.bit, self.offset, self.packer = store.fields[name]
+
+    def _present(self, start: int) -> bool:
+        return bool(_MASK.unpack_from(self.store.mmap, start)[0] >> self.bit & 1)
+
+    def __contains__(self, obj: Any) -> bool:
+        index = self.store.records.get(obj)
+        return index is not None and self._present(self.store._offset(index))
+
+    def __getitem__(self, obj: Any) -> Any:
+        start = self.store._offset(self.store.records[obj])
+        if not self._present(start):
+            raise KeyError(obj)
+        return self.packer.unpack_from(self.store.mmap, start + self.offset)[0]
+
+    def __setitem__(self, obj: Any, value: Any) -> None:
+        index = self.store.records.get(obj)
+        if index is None:
+            index = self.store.allocate(obj)
+        start = self.store._offset(index)
+        mm = self.store.mmap
+
+        # The value has to be written before it is marked as present.
+        self.packer.pack_into(mm, start + self.offset, value)
+        mask = _MASK.unpack_from(mm, start)[0]
+        _MASK.pack_into(mm, start, mask | 1 << self.bit)
+
+    def __delitem__(self, obj: Any) -> None:
+        if obj not in self:
+            raise KeyError(obj)
+        start = self.store._offset(self.store.records[obj])
+        mask = _MASK.unpack_from(self.store.mmap, start)[0]
+        _MASK.pack_into(self.store.mmap, start, mask & ~(1 << self.bit))
+
+    def __iter__(self) -> Iterator[Any]:
+        return (obj for obj in list(self.store.records.keys()) if obj in self)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class Persistent(BaseTrait):
+    """
+    A trait which stores its value in a field of a :class:`MappedStore`
+    instead of in memory. By default the field has the same name as the
+    attribute. Objects are given a new record the first time one of their
+    persistent attributes is set, unless they have been attached to an
+    existing record with :meth:`MappedStore.attach`.
+    ::
+
+        from traitlite import TypeChecked
+        from traitlite.persistent import MappedStore, Persistent
+
+        store = MappedStore('counters.bin', [('hits', 'q')])
+
+        class Counter:
+            hits = TypeChecked(int) + Persistent(store)
+
+            def __init__(self):
+                self.hits = 0
+
+        counter = Counter()
+        counter.hits += 1
+    """
+    def __init__(self, store: MappedStore, field: Optional[str] = None) -> None:
+        """
+        :param store: The store to keep the values in.
+        :type store:  MappedStore
+        :param field: The name of the field in the store, if it differs from
+                      the name of the attribute.
+        :type field:  str
+        """
+        super().__init__()
+        self.store = store
+        self.field = field
+
+    def __set_name__(self, owner: Type[Owner], name: str) -> None:
+        # The column is the storage before the traits combined with this one
+        # get their name, so that those which observe the storage, like
+        # Indexed, fail whichever order they were added in.
+        if type(self.value) is not WeakIdentityDictionary:
+            raise Exception(
+                f"The storage of '{name}' cannot be persistent: {type(self.value).__name__}")
+        self.value = self.column = self.store.column(self.field or name)
+        super().__set_name__(owner, name)
+
+    def __set__(self, obj: Owner, value: Value) -> None:
+        try:
+            super().__set__(obj, value)
+        except struct.error as error:
+            raise Exception(
+                f"The attribute '{obj.__class__.__name__}.{self.name}' "
+                f"cannot be stored as '{self.column.packer.format}': {error}") from error
@@ -0,0 +1,200 @@
+"""
+A sampling profiler for trait access.
+
+cProfile shows the time spent in traits as ``__get__`` and ``__set__`` frames,
+without saying which attribute they belong to. :func:`profile` instead
+samples the stacks of all threads at a fixed interval, and attributes every
+sample taken inside a trait to the owner class, the attribute, the phase
+(``'get'``, ``'set'``, ``'validator'`` or ``'callback'``) and the call site
+which accessed the attribute.
+::
+
+    import traitlite
+
+    with traitlite.profile() as profiler:
+        run_workload()
+
+    print(profiler.report(top=10))
+
+    # For flamegraph.pl, speedscope or similar tools.
+    with open('traits.folded', 'w') as file:
+        file.write(profiler.collapsed())
+
+Since it only looks at the stacks from a background thread, the profiled code
+runs without any instrumentation. The times are estimates: the number of
+samples multiplied by the interval.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+from collections import Counter
+
+from .traits import BaseTrait
+
+# Avoid importing typing at runtime, see traits.py.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from types import FrameType
+    from typing import Any, List, Optional, Tuple
+
+    Key = Tuple[str, str, str, str]
+
+
+_DESCRIPTOR_METHODS = {'__get__': 'get', '__set__': 'set'}
+
+
+def _trait_of(frame: FrameType) -> Optional[BaseTrait]:
+    """Returns the trait if the frame is one of its __get__ or __set__ methods."""
+    if frame.f_code.co_name not in _DESCRIPTOR_METHODS:
+        return None
+    trait = frame.f_locals.get('self')
+    return trait if isinstance(trait, BaseTrait) else None
+
+
+def _describe(frame: FrameType) -> str:
+    code = frame.f_code
+    return f'{code.co_filename}:{frame.f_lineno} ({code.co_name})'
+
+
+class Profiler:
+    """
+    Samples the stacks of all threads and counts the samples which were taken
+    inside traits. Use :func:`profile` to create one.
+    """
+    def __init__(self, interval: float = 0.001) -> None:
+        """
+        :param interval: The time between two samples in seconds.
+        :type interval:  float
+        """
+        self.interval = interval
+        # Samples by (owner, attribute, phase, call site).
+        self.samples: Counter[Key] = Counter()
+        # Samples by collapsed stack.
+        self.stacks: Counter[str] = Counter()
+        # All samples, including the ones outside of traits.
+        self.total = 0
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> Profiler:
+        """Starts sampling in a background thread."""
+        if self._thread is not None:
+            raise Exception('The profiler is already running')
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='traitlite-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops sampling. The results are kept."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> Profiler:
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    self.sample(frame)
+
+    def sample(self, frame: Optional[FrameType]) -> None:
+        """Counts a sample of the stack ending in the given frame."""
+        self.total += 1
+
+        # Walk from the innermost frame outwards, remembering the outermost
+        # trait frame and the innermost one, or -1 if there is none.
+        stack: List[FrameType] = []
+        outermost = innermost = -1
+        while frame is not None:
+            stack.append(frame)
+            if _trait_of(frame) is not None:
+                outermost = len(stack) - 1
+                if innermost < 0:
+                    innermost = outermost
+            frame = frame.f_back
+        if outermost < 0:
+            return
+
+        trait_frame = stack[outermost]
+        trait = trait_frame.f_locals['self']
+        obj = trait_frame.f_locals.get('obj')
+        owner = type(obj).__qualname__ if obj is not None else '?'
+        phase = _DESCRIPTOR_METHODS[trait_frame.f_code.co_name]
+
+        # Frames below the innermost trait frame are the validators or
+        # callbacks it calls.
+        if innermost > 0:
+            inner_locals = stack[innermost].f_locals
+            if 'validator' in inner_locals:
+                phase = 'validator'
+            elif 'callback' in inner_locals:
+                phase = 'callback'
+
+        call_site = _describe(stack[outermost + 1]) if outermost + 1 < len(stack) else '?'
+        self.samples[owner, trait.name or '?', phase, call_site] += 1
+
+        outer = ';'.join(
+            f'{frame.f_code.co_name} ({frame.f_code.co_filename}:{frame.f_lineno})'
+            for frame in reversed(stack[outermost + 1:]))
+        self.stacks[f'{outer};{owner}.{trait.name}:{phase}'.lstrip(';')] += 1
+
+    def top(self, n: int = 10) -> List[Tuple[str, str, int]]:
+        """
+        Returns the ``n`` attributes with the most samples as
+        ``(owner, attribute, samples)`` tuples.
+        """
+        attributes: Counter[Tuple[str, str]] = Counter()
+        for (owner, attribute, _, _), count in self.samples.items():
+            attributes[owner, attribute] += count
+        return [(owner, attribute, count)
+                for (owner, attribute), count in attributes.most_common(n)]
+
+    def report(self, top: int = 10) -> str:
+        """
+        Returns a text report of the ``top`` attributes with the most samples,
+        broken down by phase and call site.
+        """
+        lines = [f'{self.total} samples, {sum(self.samples.values())} in traits, '
+                 f'interval {self.interval * 1000:g} ms']
+        for owner, attribute, count in self.top(top):
+            lines.append(f'{count:8} {count * self.interval:10.3f}s  {owner}.{attribute}')
+            details = [(key, detail_count) for key, detail_count in self.samples.items()
+                       if key[:2] == (owner, attribute)]
+            details.sort(key=lambda item: -item[1])
+            for (_, _, phase, call_site), detail_count in details:
+                lines.append(f'{detail_count:8} {detail_count * self.interval:10.3f}s'
+                             f'      {phase:9} {call_site}')
+        return '\n'.join(lines) + '\n'
+
+    def collapsed(self) -> str:
+        """
+        Returns the samples in the collapsed stack format used by flame graph
+        tools: one line per stack, with the frames separated by semicolons
+        and followed by the number of samples.
+        """
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+def profile(interval: float = 0.001) -> Profiler:
+    """
+    Returns a :class:`Profiler` for trait access. Use it as a context manager,
+    or call :meth:`Profiler.start` and :meth:`Profiler.stop` to profile in the
+    background.
+
+    :param interval: The time between two samples in seconds.
+    :type interval:  float
+    """
+    return Profiler(interval)
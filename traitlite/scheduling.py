@@ -0,0 +1,334 @@
+"""
+Schedulers for delayed trait callbacks.
+
+Debounced and throttled callbacks (see :class:`~traitlite.traits.HasCallback`)
+are not called when the attribute is set, but some time later. All of these
+delayed calls share a single scheduler, so that thousands of objects do not
+need a thread or timer each.
+
+By default, the delayed calls are run by :class:`Scheduler` on a single
+background thread. :class:`AsyncioScheduler` instead runs them on an asyncio
+event loop, which is useful if the callbacks interact with other code running
+on the loop.
+"""
+from __future__ import annotations
+
+import heapq
+import os
+import threading
+import time
+import weakref
+from functools import partial
+from weakref import WeakSet
+
+from .weakref_utilities import WeakIdentityDictionary
+
+# Avoid importing typing at runtime, see traits.py.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+
+class Scheduler:
+    """
+    Calls functions after a delay. The pending calls are kept in a heap ordered
+    by their deadline, which is processed by a single daemon thread that is
+    started when the first call is scheduled.
+    ::
+
+        from traitlite.scheduling import Scheduler
+
+        scheduler = Scheduler()
+        scheduler.call_later(0.5, lambda: print('Half a second later'))
+
+    With ``threaded=False`` no thread is started and the due calls are run by
+    calling :meth:`run_pending`, for example from an existing main loop.
+    """
+    def __init__(self, clock: Optional[Callable[[], float]] = None,
+                 threaded: bool = True) -> None:
+        """
+        :param clock:    A monotonic clock returning seconds. Defaults to
+                         :func:`time.monotonic`.
+        :type clock:     callable
+        :param threaded: Whether to run the calls on a background thread.
+        :type threaded:  bool
+        """
+        self.clock = clock or time.monotonic
+        self.threaded = threaded
+
+        # The sequence number keeps calls with the same deadline in order and
+        # stops the heap from comparing the functions.
+        self.sequence = 0
+        self.reset()
+        _schedulers.add(self)
+
+    def reset(self) -> None:
+        """
+        Forgets the pending calls and the thread. This is done in the child
+        after a fork, where the thread no longer exists and the pending calls
+        are left to the parent.
+        """
+        self.queue: List[Tuple[float, int, Callable[[], Any]]] = []
+        self.condition = threading.Condition()
+        self.thread: Optional[threading.Thread] = None
+
+    def call_later(self, delay: float, func: Callable[[], Any]) -> None:
+        """
+        Calls the function without arguments after at least ``delay`` seconds.
+        """
+        with self.condition:
+            self.sequence += 1
+            heapq.heappush(self.queue, (self.clock() + delay, self.sequence, func))
+
+            if self.threaded and self.thread is None:
+                self.thread = threading.Thread(
+                    target=self._run, name='traitlite-scheduler', daemon=True)
+                self.thread.start()
+            self.condition.notify()
+
+    def run_pending(self) -> int:
+        """
+        Runs every call whose deadline has passed and returns the number of
+        calls which were run.
+        """
+        count = 0
+        while True:
+            with self.condition:
+                if not self.queue or self.queue[0][0] > self.clock():
+                    return count
+                _, _, func = heapq.heappop(self.queue)
+
+            func()
+            count += 1
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while not self.queue:
+                    self.condition.wait()
+                timeout = self.queue[0][0] - self.clock()
+                if timeout > 0:
+                    # Wake up early if an earlier call is scheduled.
+                    self.condition.wait(timeout)
+                    continue
+                _, _, func = heapq.heappop(self.queue)
+
+            # An exception in a callback must not stop the other callbacks.
+            try:
+                func()
+            except Exception:
+                import traceback
+                traceback.print_exc()
+
+
+class AsyncioScheduler:
+    """
+    Calls functions after a delay on an asyncio event loop. Attributes may be
+    set from any thread.
+    ::
+
+        import asyncio
+        from traitlite import HasCallback
+        from traitlite.scheduling import AsyncioScheduler
+
+        async def main():
+            scheduler = AsyncioScheduler(asyncio.get_running_loop())
+
+            class Foo:
+                bar = HasCallback([print], dispatch='debounce', scheduler=scheduler)
+    """
+    def __init__(self, loop: Any) -> None:
+        """
+        :param loop: The event loop to run the calls on.
+        :type loop:  asyncio.AbstractEventLoop
+        """
+        self.loop = loop
+        self.clock = loop.time
+
+    def call_later(self, delay: float, func: Callable[[], Any]) -> None:
+        """
+        Calls the function without arguments after at least ``delay`` seconds.
+        """
+        self.loop.call_soon_threadsafe(self.loop.call_later, delay, func)
+
+
+_default_scheduler: Optional[Scheduler] = None
+_default_lock = threading.Lock()
+
+# The schedulers and dispatchers which have to be reset after a fork.
+_schedulers: WeakSet[Scheduler] = WeakSet()
+_dispatchers: WeakSet[_Dispatcher] = WeakSet()
+
+
+def _after_fork_in_child() -> None:
+    global _default_lock
+    _default_lock = threading.Lock()
+    for scheduler in _schedulers:
+        scheduler.reset()
+    for dispatcher in _dispatchers:
+        dispatcher.reset()
+
+
+# Preforking servers import the traits in the parent and set them in the
+# children, which must start their own scheduler thread.
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def default_scheduler() -> Scheduler:
+    """Returns the scheduler shared by all traits which are not given one."""
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = Scheduler()
+        return _default_scheduler
+
+
+class _State:
+    """The delayed call of a single object."""
+    __slots__ = ('old', 'new', 'waiting', 'scheduled', 'deadline', 'last_call')
+
+    def __init__(self) -> None:
+        self.old: Any = None
+        self.new: Any = None
+        # Whether a value is waiting to be passed to the callbacks.
+        self.waiting = False
+        # Whether the scheduler will call fire for this object.
+        self.scheduled = False
+        self.deadline = 0.0
+        self.last_call = float('-inf')
+
+
+class _Dispatcher:
+    """
+    Delays calling the callbacks of a trait. ``call`` is called with the
+    object, the value before the first delayed change and the latest value.
+    """
+    def __init__(self, call: Callable[[Any, Any, Any], None], interval: float,
+                 scheduler: Any = None) -> None:
+        if interval <= 0:
+            raise Exception(f'The interval must be positive, not {interval}')
+
+        self.call = call
+        self.interval = interval
+        self.scheduler = scheduler
+        self.lock = threading.Lock()
+        self.states: WeakIdentityDictionary[Any, _State] = WeakIdentityDictionary()
+        _dispatchers.add(self)
+
+    def get_scheduler(self) -> Any:
+        if self.scheduler is None:
+            self.scheduler = default_scheduler()
+        return self.scheduler
+
+    def get_state(self, obj: Any, old: Any, new: Any) -> _State:
+        """Returns the state of the object with the new value waiting."""
+        state = self.states.get(obj)
+        if state is None:
+            state = self.states[obj] = _State()
+        if not state.waiting:
+            state.waiting = True
+            state.old = old
+        state.new = new
+        return state
+
+    def schedule(self, obj: Any, delay: float) -> None:
+        # The scheduler must not keep the object alive.
+        self.get_scheduler().call_later(delay, partial(self.fire, weakref.ref(obj)))
+
+    def take(self, state: _State) -> Tuple[Any, Any]:
+        """Returns the waiting values and clears them."""
+        values = state.old, state.new
+        state.old = state.new = None
+        state.waiting = False
+        return values
+
+    def __call__(self, obj: Any, old: Any, new: Any) -> None:
+        """Called instead of the callbacks when an attribute of the object is set."""
+        pass
+
+    def fire(self, ref: weakref.ref) -> None:
+        """
+        Called by the scheduler for the object the weak reference points to.
+        """
+        pass
+
+    def reset(self) -> None:
+        """Forgets the delayed calls, which are only run in the parent after a fork."""
+        self.lock = threading.Lock()
+        self.states = WeakIdentityDictionary()
+
+
+class _Debounce(_Dispatcher):
+    def __call__(self, obj: Any, old: Any, new: Any) -> None:
+        with self.lock:
+            state = self.get_state(obj, old, new)
+            state.deadline = self.get_scheduler().clock() + self.interval
+
+            # Rather than rescheduling on every change, fire checks whether
+            # the deadline moved and waits for the rest of the quiet period.
+            if state.scheduled:
+                return
+            state.scheduled = True
+        self.schedule(obj, self.interval)
+
+    def fire(self, ref: weakref.ref) -> None:
+        obj = ref()
+        if obj is None:
+            return
+
+        with self.lock:
+            state = self.states[obj]
+            remaining = state.deadline - self.get_scheduler().clock()
+            if remaining <= 0:
+                state.scheduled = False
+                old, new = self.take(state)
+
+        if remaining > 0:
+            self.schedule(obj, remaining)
+        else:
+            self.call(obj, old, new)
+
+
+class _Throttle(_Dispatcher):
+    def __call__(self, obj: Any, old: Any, new: Any) -> None:
+        now = self.get_scheduler().clock()
+        with self.lock:
+            state = self.states.get(obj)
+            if state is None:
+                state = self.states[obj] = _State()
+
+            # The first change after a quiet interval is passed on right away.
+            if not state.scheduled and now - state.last_call >= self.interval:
+                state.last_call = now
+                delay = None
+            else:
+                self.get_state(obj, old, new)
+                if state.scheduled:
+                    return
+                state.scheduled = True
+                delay = state.last_call + self.interval - now
+
+        if delay is None:
+            self.call(obj, old, new)
+        else:
+            self.schedule(obj, delay)
+
+    def fire(self, ref: weakref.ref) -> None:
+        obj = ref()
+        if obj is None:
+            return
+
+        with self.lock:
+            state = self.states[obj]
+            state.scheduled = False
+            state.last_call = self.get_scheduler().clock()
+            old, new = self.take(state)
+
+        self.call(obj, old, new)
+
+
+DISPATCHERS: Dict[str, Type[_Dispatcher]] = {
+    'debounce': _Debounce,
+    'throttle': _Throttle,
+}
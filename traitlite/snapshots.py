@@ -0,0 +1,81 @@
+"""
+Immutable snapshots of containers, for the ``snapshot`` mode of
+:class:`~traitlite.traits.HasCallbackDelta` and
+:class:`~traitlite.traits.HasValidatorDelta`.
+
+When a container is changed in place and assigned again, the old and the new
+value of the attribute are the same object. In snapshot mode, the traits keep
+a snapshot of each value when it is set, and pass it as the old value:
+::
+
+    from traitlite import HasCallbackDelta
+
+    def print_change(old, new):
+        print(old, new)
+
+    class Foo:
+        bar = HasCallbackDelta([print_change], snapshot=True)
+
+    foo = Foo()
+    foo.bar = [1] # None [1]
+    foo.bar.append(2)
+    foo.bar = foo.bar # [1] [1, 2]
+
+A snapshot is a shallow copy: it copies the references to the items, but
+shares the items themselves with the container. This is a single pass over
+the container in C, unlike ``copy.deepcopy``, which copies every item
+recursively. Items which are themselves changed in place also change in the
+snapshot, so a function which copies them can be passed as ``snapshot``
+instead.
+"""
+from __future__ import annotations
+
+# Avoid importing typing at runtime, see traits.py.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Tuple
+
+
+def _immutable(self: Any, *args: Any, **kwargs: Any) -> None:
+    raise Exception(f"'{self.__class__.__name__}' snapshots cannot be changed")
+
+
+class FrozenList(list):
+    """
+    A list which cannot be changed. Unlike a tuple, it is equal to a list with
+    the same items, so it can be compared with the new value.
+    """
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable  # type: ignore
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable  # type: ignore
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return list, (list(self),)
+
+
+class FrozenDict(dict):
+    """A dict which cannot be changed."""
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _immutable  # type: ignore
+    update = setdefault = pop = popitem = clear = _immutable  # type: ignore
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return dict, (dict(self),)
+
+
+def snapshot(value: Any) -> Any:
+    """
+    Returns an immutable shallow copy of a list, dict, set or bytearray, which
+    is equal to it. Other values are returned as they are.
+    """
+    if isinstance(value, list):
+        return FrozenList(value)
+    if isinstance(value, dict):
+        return FrozenDict(value)
+    if isinstance(value, set):
+        return frozenset(value)
+    if isinstance(value, bytearray):
+        return bytes(value)
+    return value
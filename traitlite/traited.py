@@ -0,0 +1,398 @@
+"""
+A class decorator which builds traits from annotations, similar to
+:mod:`dataclasses`.
+"""
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping
+
+from .traits import (
+    BaseTrait,
+    HasCallback,
+    HasValidator,
+    ReadOnly,
+    TypeChecked,
+    _MISSING,
+)
+from .typecheck import type_name
+from .validators import InlineValidator
+
+# Avoid importing typing at runtime, see traits.py.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Type
+
+
+class Field:
+    """
+    The options of a single field of a :func:`traited` class. Use
+    :func:`field` to create one.
+    """
+    def __init__(self, default: Any = _MISSING,
+                 default_factory: Optional[Callable[[], Any]] = None,
+                 read_only: bool = False,
+                 validators: Optional[List[Callable[[Any], Any]]] = None,
+                 callbacks: Optional[List[Callable[[Any], None]]] = None,
+                 traits: Optional[List[BaseTrait]] = None) -> None:
+        if default is not _MISSING and default_factory is not None:
+            raise Exception('A field cannot have both a default and a default_factory')
+
+        self.default = default
+        self.default_factory = default_factory
+        self.read_only = read_only
+        self.validators = list(validators or [])
+        self.callbacks = list(callbacks or [])
+        self.traits = list(traits or [])
+
+        # Set by traited.
+        self.name = ''
+        self.type: Any = None
+        self.trait: Any = None
+
+    @property
+    def has_default(self) -> bool:
+        return self.default is not _MISSING or self.default_factory is not None
+
+    def build(self) -> BaseTrait:
+        """Returns the trait for this field."""
+        trait: BaseTrait = TypeChecked(self.type)
+        if self.validators:
+            # The validators run before the type check, so they can convert
+            # the value.
+            trait = trait + HasValidator(self.validators)
+        if self.read_only:
+            trait = trait + ReadOnly()
+        for extra in self.traits:
+            trait = trait + extra
+        if self.callbacks:
+            trait = trait + HasCallback(self.callbacks)
+        return trait
+
+
+def field(default: Any = _MISSING, default_factory: Optional[Callable[[], Any]] = None,
+          read_only: bool = False,
+          validators: Optional[List[Callable[[Any], Any]]] = None,
+          callbacks: Optional[List[Callable[[Any], None]]] = None,
+          traits: Optional[List[BaseTrait]] = None) -> Any:
+    """
+    Declares the options of a field of a :func:`traited` class.
+
+    :param default:         The default value.
+    :param default_factory: A callable without arguments which returns the
+                            default value for every new object.
+    :type default_factory:  callable
+    :param read_only:       Whether the attribute can only be set once.
+    :type read_only:        bool
+    :param validators:      Validators as for :class:`~traitlite.traits.HasValidator`.
+    :type validators:       list
+    :param callbacks:       Callbacks as for :class:`~traitlite.traits.HasCallback`.
+    :type callbacks:        list
+    :param traits:          Further traits which are added to the field's trait.
+    :type traits:           list
+    """
+    return Field(default, default_factory, read_only, validators, callbacks, traits)
+
+
+def _type_error(obj: Any, field: Field, value: Any) -> None:
+    raise Exception(
+        f"The attribute '{obj.__class__.__name__}.{field.name}' "
+        f"is of type '{type_name(field.type)}', not '{type(value).__name__}'")
+
+
+def _annotations(cls: type) -> Dict[str, Any]:
+    annotations = cls.__dict__.get('__annotations__', {})
+    if any(isinstance(annotation, str) for annotation in annotations.values()):
+        # Postponed annotations have to be evaluated, which needs typing.
+        from typing import get_type_hints
+        hints = get_type_hints(cls)
+        annotations = {name: hints[name] for name in annotations}
+
+    typing = sys.modules.get('typing')
+    return {
+        name: annotation for name, annotation in annotations.items()
+        if typing is None or getattr(annotation, '__origin__', None) is not typing.ClassVar
+        and annotation is not typing.ClassVar
+    }
+
+
+def _make_function(name: str, source: str, namespace: Dict[str, Any]) -> Callable:
+    exec(source, namespace)
+    return namespace[name]
+
+
+def _make_init(cls: type, fields: List[Field]) -> Callable:
+    namespace: Dict[str, Any] = {'_MISSING': _MISSING, '_type_error': _type_error}
+    parameters = []
+    body = []
+    callbacks = []
+
+    seen_default = False
+    for i, field in enumerate(fields):
+        name = field.name
+        namespace[f'_field_{i}'] = field
+        trait = field.trait
+
+        if field.default_factory is not None:
+            namespace[f'_factory_{i}'] = field.default_factory
+            parameters.append(f'{name}=_MISSING')
+            body.append(f'    if {name} is _MISSING: {name} = _factory_{i}()')
+        elif field.default is not _MISSING:
+            namespace[f'_default_{i}'] = field.default
+            parameters.append(f'{name}=_default_{i}')
+        elif seen_default:
+            raise Exception(
+                f"The field '{cls.__name__}.{name}' without a default follows a "
+                "field with a default")
+        else:
+            parameters.append(name)
+        seen_default = seen_default or field.has_default
+
+        if field.traits:
+            # Further traits may do anything, so the value is set through the
+            # whole trait instead.
+            namespace[f'_trait_{i}'] = trait
+            body.append(f'    _trait_{i}.__set__(self, {name})')
+            continue
+
+        for j, validator in enumerate(field.validators):
+            if isinstance(validator, InlineValidator):
+                body.extend(validator.inline(name, f'_validator_{i}_{j}', namespace))
+                continue
+            namespace[f'_validator_{i}_{j}'] = validator
+            body.append(f'    {name} = _validator_{i}_{j}({name})')
+
+        namespace[f'_accepted_{i}'] = trait.accepted
+        namespace[f'_check_{i}'] = trait.check
+        body.append(f'    if type({name}) not in _accepted_{i} and not _check_{i}({name}):')
+        body.append(f'        _type_error(self, _field_{i}, {name})')
+
+        # The storage is looked up on each call, since it can be replaced
+        # after the class is created, for example by versioned.
+        namespace[f'_trait_{i}'] = trait
+        body.append(f'    _trait_{i}.value[self] = {name}')
+
+        for j, callback in enumerate(field.callbacks):
+            namespace[f'_callback_{i}_{j}'] = callback
+            callbacks.append(f'    _callback_{i}_{j}({name})')
+
+    if hasattr(cls, '__post_init__'):
+        body.append('    self.__post_init__()')
+
+    # The callbacks see the fully constructed object.
+    body.extend(callbacks)
+
+    source = f"def __init__(self, {', '.join(parameters)}):\n" + '\n'.join(body or ['    pass'])
+    return _make_function('__init__', source, namespace)
+
+
+def _make_repr(fields: List[Field]) -> Callable:
+    items = ', '.join(f'{field.name}={{self.{field.name}!r}}' for field in fields)
+    source = (
+        'def __repr__(self):\n'
+        f"    return f'{{self.__class__.__qualname__}}({items})'\n")
+    return _make_function('__repr__', source, {})
+
+
+def _make_eq(fields: List[Field]) -> Callable:
+    values = ''.join(f'self.{field.name}, ' for field in fields)
+    other_values = ''.join(f'other.{field.name}, ' for field in fields)
+    source = (
+        'def __eq__(self, other):\n'
+        # An object is equal to itself without comparing the fields.
+        '    if other is self:\n'
+        '        return True\n'
+        '    if other.__class__ is not self.__class__:\n'
+        '        return NotImplemented\n'
+        f'    return ({values}) == ({other_values})\n')
+    return _make_function('__eq__', source, {})
+
+
+class RecordError(Exception):
+    """
+    An error in a single record passed to ``from_records``. The index of the
+    record, the record itself and the original exception are kept as
+    attributes.
+    """
+    def __init__(self, index: int, record: Any, error: Exception) -> None:
+        super().__init__(f'Record {index}: {error}')
+        self.index = index
+        self.record = record
+        self.error = error
+
+
+_BOOLEANS = {'true': True, 'false': False, 'yes': True, 'no': False, '1': True, '0': False}
+
+
+def _parse_bool(text: str) -> bool:
+    try:
+        return _BOOLEANS[text.strip().lower()]
+    except KeyError:
+        raise Exception(f"'{text}' is not a boolean") from None
+
+
+def _converter(field: Field, converters: Dict[str, Callable[[Any], Any]]) -> Optional[Callable]:
+    """
+    Returns the function converting the raw values of a field, or None if they
+    are used as they are. Strings are parsed for int, float, complex and bool
+    fields, and ints are turned into floats for float fields, since that is
+    what CSV and JSON give.
+    """
+    if field.name in converters:
+        return converters[field.name]
+
+    if field.type is float:
+        return lambda value: value if type(value) is float else float(value)
+    parsers: Dict[Any, Callable[[str], Any]] = {int: int, complex: complex, bool: _parse_bool}
+    parser = parsers.get(field.type)
+    if parser is None:
+        return None
+    return lambda value: parser(value) if type(value) is str else value
+
+
+def from_records(cls: Type, records: Iterable[Any],
+                  converters: Optional[Dict[str, Callable[[Any], Any]]] = None,
+                  on_error: Optional[Callable[[RecordError], None]] = None) -> Iterator[Any]:
+    """
+    Creates objects of a :func:`traited` class from an iterable of records,
+    such as the rows of a :class:`csv.DictReader` or parsed JSON lines, and
+    yields them one by one. It is available as a class method of every
+    traited class.
+    ::
+
+        import csv
+        from traitlite import traited
+
+        @traited
+        class Row:
+            name: str
+            count: int
+
+        errors = []
+        with open('rows.csv') as file:
+            for row in Row.from_records(csv.DictReader(file), on_error=errors.append):
+                ...
+
+    Records are dicts mapping field names to values, or sequences with the
+    values in field order. Missing fields get their default, and keys which are
+    not fields are ignored. Every object is created through the generated
+    ``__init__``, so validators, type checks and callbacks run as usual. How
+    each field is converted is worked out once, before the first record.
+
+    The records are consumed lazily, so memory does not grow with the input.
+
+    :param records:    The records to create objects from.
+    :type records:     iterable
+    :param converters: Functions converting the raw value of a field, by field
+                       name. By default, strings are parsed for ``int``,
+                       ``float``, ``complex`` and ``bool`` fields.
+    :type converters:  dict
+    :param on_error:   Called with a :class:`RecordError` for every record
+                       which could not be converted, after which the record is
+                       skipped. If not given, the error is raised.
+    :type on_error:    callable
+    """
+    plan = [(field.name, _converter(field, converters or {}))
+            for field in cls.__traited_fields__]
+
+    for index, record in enumerate(records):
+        try:
+            if isinstance(record, Mapping):
+                arguments = {}
+                for name, convert in plan:
+                    if name in record:
+                        value = record[name]
+                        arguments[name] = value if convert is None else convert(value)
+                obj = cls(**arguments)
+            else:
+                obj = cls(*[value if convert is None else convert(value)
+                            for (_, convert), value in zip(plan, record)])
+        except Exception as error:
+            if on_error is None:
+                raise RecordError(index, record, error) from error
+            on_error(RecordError(index, record, error))
+            continue
+        yield obj
+
+
+def traited(cls: Optional[type] = None, *, init: bool = True, repr: bool = True,
+            eq: bool = True) -> Any:
+    """
+    A class decorator which turns annotated class attributes into traits and
+    generates ``__init__``, ``__repr__`` and ``__eq__`` methods.
+    ::
+
+        from traitlite import field, traited
+
+        def print_value(value):
+            print('New value is:', value)
+
+        @traited
+        class Foo:
+            bar: int
+            fizz: str = field('a', read_only=True)
+            buzz: list = field(default_factory=list, callbacks=[print_value])
+
+        foo = Foo(3)     # New value is: []
+        print(foo)       # Foo(bar=3, fizz='a', buzz=[])
+        foo.bar = 3.0    # Raises an exception
+        foo.fizz = 'b'   # Raises an exception because of read-only
+        foo.buzz = [1]   # New value is: [1]
+
+    Every field is type checked against its annotation. The generated
+    ``__init__`` checks and stores all fields in a single function, rather
+    than going through the trait of each field, and calls the callbacks of
+    the fields only after all of them are set and ``__post_init__`` (if
+    defined) has run. Fields with further ``traits`` are set through their
+    trait instead.
+
+    Like with dataclasses, a generated ``__eq__`` makes the objects unhashable
+    unless the class defines ``__hash__`` itself, since equal objects must
+    have equal hashes. Pass ``eq=False`` to keep comparing and hashing the
+    objects by identity, or see :func:`~traitlite.frozen.freeze` for hashable
+    objects.
+
+    Traited classes with a generated ``__init__`` also get a ``from_records``
+    class method, which creates objects from a stream of records, see
+    :func:`from_records`.
+
+    :param init: Whether to generate ``__init__``.
+    :type init:  bool
+    :param repr: Whether to generate ``__repr__``.
+    :type repr:  bool
+    :param eq:   Whether to generate ``__eq__``, which compares the fields.
+    :type eq:    bool
+    """
+    def wrap(cls: Type) -> Type:
+        fields: Dict[str, Field] = {}
+        for base in reversed(cls.__mro__[1:]):
+            for base_field in getattr(base, '__traited_fields__', ()):
+                fields[base_field.name] = base_field
+
+        for name, annotation in _annotations(cls).items():
+            default = cls.__dict__.get(name, _MISSING)
+            field = default if isinstance(default, Field) else Field(default)
+            field.name = name
+            field.type = annotation
+            field.trait = field.build()
+
+            setattr(cls, name, field.trait)
+            field.trait.__set_name__(cls, name)
+            fields[name] = field
+
+        cls.__traited_fields__ = tuple(fields.values())
+        if init:
+            cls.__init__ = _make_init(cls, list(fields.values()))
+        if repr:
+            cls.__repr__ = _make_repr(list(fields.values()))
+        if eq:
+            # The hash set by Python for an ``__eq__`` in the class body is
+            # None, so only a ``__hash__`` written in the class body is kept.
+            if cls.__dict__.get('__hash__', None) is None:
+                cls.__hash__ = None  # type: ignore
+            cls.__eq__ = _make_eq(list(fields.values()))
+        if init:
+            cls.from_records = classmethod(from_records)
+        return cls
+
+    return wrap if cls is None else wrap(cls)
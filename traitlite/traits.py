@@ -1,84 +1,151 @@
-import copy
-import inspect
-from weakref import WeakKeyDictionary
-from typing import (
-    Any,
-    Callable,
-    List,
-    Generic,
-    Optional,
-    Tuple,
-    Type,
-    TypeVar,
-)
-
-from .weakref_utilities import DefaultWeakKeyDictionary
-
-
-Owner = TypeVar('Owner')
-Value = TypeVar('Value')
-
-
-def resolve_mro(obj1: 'BaseTrait', obj2: 'BaseTrait') -> Tuple[Type, ...]:
+from __future__ import annotations
+
+from .typecheck import compile_type, type_name
+from .validators import InlineValidator, compile_validators
+from .weakref_utilities import _MISSING, DefaultWeakIdentityDictionary, WeakIdentityDictionary
+
+# typing, inspect and copy are comparatively expensive to import, so they are
+# only imported for type checking or where they are actually used. This keeps
+# `import traitlite` cheap for short-lived processes. Type checkers treat
+# TYPE_CHECKING as True.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import (
+        Any,
+        Callable,
+        Generic,
+        List,
+        MutableMapping,
+        Optional,
+        Tuple,
+        Type,
+        TypeVar,
+    )
+
+    Owner = TypeVar('Owner')
+    Value = TypeVar('Value')
+
+    class _TraitBase(Generic[Owner, Value]):
+        pass
+else:
+    class _TraitBase:
+        # At runtime traits do not need Generic in their mro, but annotations
+        # like HasCallback[Foo, int] must still work when they are evaluated.
+        __class_getitem__ = classmethod(lambda cls, item: cls)
+
+    # The type variables are only subscripted at runtime, which ignores them.
+    Owner = Value = object
+
+
+# Exact types for which comparing with == is cheap and always gives a bool.
+_SCALAR_TYPES = frozenset([int, float, complex, str, bytes, bool, type(None)])
+
+
+def resolve_mro(obj1: BaseTrait, obj2: BaseTrait) -> Tuple[Type, ...]:
     """
     Create a type tuple which contains no duplicates and is in an order
     which can be used to instantiate a subclass.
     """
-    obj1_mro = inspect.getmro(obj1.__class__)
-    obj2_mro = inspect.getmro(obj2.__class__)
+    obj1_mro = obj1.__class__.__mro__
+    obj2_mro = obj2.__class__.__mro__
 
     # Get the reverse order of the mro so we start at object and add only new
     # classes.
     mro = ([i for i in obj1_mro[::-1]] +
            [i for i in obj2_mro[::-1] if i not in obj1_mro])
 
-    # Having generic in here causes problems at runtime.
-    if Generic in mro:
-        mro.remove(Generic)  # type: ignore
-
     # Reverse again to get the correct ordering.
     return tuple(mro[::-1])
 
 
-class BaseTrait(Generic[Owner, Value]):
+def count_parameters(func: Callable) -> int:
+    """
+    Returns the number of parameters in the signature of the given callable.
+    """
+    import inspect
+    return len(inspect.signature(func).parameters)
+
+
+class BaseTrait(_TraitBase[Owner, Value]):
     """
     The base class of all traits. While this can be instantiated, it does
     not provide any functionality by itself.
     """
+    # The context variable with the overrides of this trait, which is only
+    # created when it is overridden for the first time, see
+    # traitlite.overrides. Until then, reading the attribute does not look
+    # for overrides.
+    overrides: Any = None
+
     def __init__(self) -> None:
         self.name: Optional[str] = None
-        self.value: WeakKeyDictionary[Owner, Value] = WeakKeyDictionary()
+        self.value: MutableMapping[Owner, Value] = WeakIdentityDictionary()
 
     def __set_name__(self, owner: Type[Owner], name: str) -> None:
         self.name = name
 
     def __get__(self, obj: Owner, objtype: Type[Owner]) -> Value:
         if obj is None:
-            return self
-        elif obj not in self.value:
+            return self  # type: ignore
+        if self.overrides is not None:
+            value = self.overridden(obj)
+            if value is not _MISSING:
+                return value
+
+        try:
+            return self.value[obj]
+        except KeyError:
             raise AttributeError(
-                f"'{objtype.__name__}' object has no attribute '{self.name}'")
-
-        return self.value[obj]
+                f"'{objtype.__name__}' object has no attribute '{self.name}'") from None
 
     def __set__(self, obj: Owner, value: Value) -> None:
         self.value[obj] = value
 
-    def __add__(self, other: 'BaseTrait') -> 'BaseTrait':
+    def overridden(self, obj: Owner) -> Any:
+        """
+        Returns the value of the attribute overridden in the current context,
+        or ``_MISSING``. See :mod:`traitlite.overrides`.
+        """
+        overrides = self.overrides.get()
+        if overrides is None:
+            return _MISSING
+        entry = overrides.get(id(obj))
+        return _MISSING if entry is None else entry[1]
+
+    def aggregate(self, *names: str) -> Any:
+        """
+        Returns the aggregates of this attribute over all live objects, which
+        are kept up to date as values are set. The names can be ``'count'``,
+        ``'sum'``, ``'mean'``, ``'min'`` and ``'max'``. See
+        :mod:`traitlite.aggregates`.
+        ::
+
+            from traitlite import TypeChecked
+
+            class Connection:
+                bytes_sent = TypeChecked(int)
+
+            stats = Connection.bytes_sent.aggregate('sum', 'max')
+            print(stats.sum, stats.max)
+        """
+        from .aggregates import aggregate
+        return aggregate(self, names)
+
+    def __add__(self, other: BaseTrait) -> BaseTrait:
         if not isinstance(other, BaseTrait):
             raise Exception('Traits can only be added with other traits')
 
         name = self.__class__.__name__ + '_' + other.__class__.__name__
         bases = resolve_mro(self, other)
 
-        new_obj_type: Type[object] = type(name, bases, {})
+        new_obj_type: Type[BaseTrait] = type(name, bases, {})
         new_obj = object.__new__(new_obj_type)
         new_obj.__dict__.update(other.__dict__)
         new_obj.__dict__.update(self.__dict__)
         return new_obj
 
 
-class ReadOnly(BaseTrait):
+class ReadOnly(BaseTrait[Owner, Value]):
     """
     A trait which makes an attribute read-only after it has been set for the
     first time.
@@ -102,7 +169,94 @@ class ReadOnly(BaseTrait):
         super().__set__(obj, value)
 
 
-class TypeChecked(BaseTrait):
+class Default(BaseTrait[Owner, Value]):
+    """
+    A trait which gives an attribute a default value, which is only created
+    when the attribute is read before it has been set. Objects which never
+    read the attribute do not pay for it, and do not need an ``__init__``
+    assigning it.
+    ::
+
+        from traitlite import Default, TypeChecked
+
+        class Foo:
+            bar = TypeChecked(int) + Default(0)
+            fizz = TypeChecked(list) + Default(default_factory=list)
+
+        foo = Foo()
+        print(foo.bar) # 0
+        foo.fizz.append(1) # The list is stored on the first read
+        print(foo.fizz) # [1]
+
+    A plain default is shared by all objects and is not stored, so it should
+    be immutable. A value from ``default_factory`` is stored on the first read,
+    without running any validators or callbacks unless ``hooks`` is True. In
+    that case the default is set like any other value, so it is validated and
+    the callbacks are called for it.
+    """
+    def __init__(self, default: Any = None,
+                 default_factory: Optional[Callable[[], Value]] = None,
+                 hooks: bool = False) -> None:
+        """
+        :param default:         The default value.
+        :param default_factory: A function without arguments which returns the
+                                default value for each object.
+        :type default_factory:  callable
+        :param hooks:           Whether the default is set through the trait,
+                                running validators and callbacks.
+        :type hooks:            bool
+        """
+        super().__init__()
+        if default is not None and default_factory is not None:
+            raise Exception('Only one of default and default_factory can be given')
+
+        self.default = default
+        self.default_factory = default_factory
+        self.hooks = hooks
+        self.direct_get = True
+
+    def __set_name__(self, owner: Type[Owner], name: str) -> None:
+        super().__set_name__(owner, name)
+
+        # The value can be read directly, unless a trait combined with this
+        # one does something on reads, like Watch.
+        mro = type(self).__mro__
+        self.direct_get = not any(
+            '__get__' in vars(cls) for cls in mro[mro.index(Default) + 1:mro.index(BaseTrait)])
+
+    def __get__(self, obj: Owner, objtype: Type[Owner]) -> Value:
+        if obj is None:
+            return self  # type: ignore
+        if self.overrides is not None:
+            value = self.overridden(obj)
+            if value is not _MISSING:
+                return value
+        if self.direct_get:
+            stored: Any = self.value.get(obj, _MISSING)
+            return self.materialize(obj) if stored is _MISSING else stored
+        if obj not in self.value:
+            return self.materialize(obj)
+        return super().__get__(obj, objtype)
+
+    def materialize(self, obj: Owner) -> Value:
+        """Returns the default value for an object whose attribute is not set."""
+        if self.default_factory is None:
+            if not self.hooks:
+                return self.default
+            value = self.default
+        else:
+            value = self.default_factory()
+
+        if self.hooks:
+            self.__set__(obj, value)
+            # The validators may have changed the value.
+            return self.value[obj]
+
+        self.value[obj] = value
+        return value
+
+
+class TypeChecked(BaseTrait[Owner, Value]):
     """
     A trait which performs a type check whenever the attribute is given a
     new value.
@@ -118,33 +272,145 @@ class TypeChecked(BaseTrait):
 
         foo = Foo(3) # This is okay
         foo = Foo(3.0) # This raises an exception
+
+    Besides classes, annotations from the typing module such as ``Optional``,
+    ``Union``, ``Literal``, ``List[int]``, ``Dict[str, float]``, ``Tuple`` and
+    runtime checkable protocols can be used. The annotation is compiled once
+    when the trait is created.
+    ::
+
+        from typing import List, Optional
+        from traitlite import TypeChecked
+
+        class Foo:
+            bar = TypeChecked(Optional[int])
+            fizz = TypeChecked(List[int], container_check='first', sample_size=10)
+
+        foo = Foo()
+        foo.bar = None # This is okay
+        foo.fizz = list(range(100000)) # Only the first 10 elements are checked
+        foo.fizz = ['a'] # This raises an exception
     """
-    def __init__(self, type_: Type[object]) -> None:
+    def __init__(self, type_: Any, container_check: str = 'full',
+                 sample_size: int = 16) -> None:
         """
-        :param type_: The type to check against:
-        :type type_:  type
+        :param type_:           The type to check against.
+        :type type_:            type
+        :param container_check: How the elements of containers are checked:
+                                ``'full'``, ``'first'`` or ``'sample'``. See
+                                :func:`traitlite.typecheck.compile_type`.
+        :type container_check:  str
+        :param sample_size:     The number of elements to check for ``'first'``
+                                and ``'sample'``.
+        :type sample_size:      int
         """
         super().__init__()
-        self.type: Type[object] = type_
+        self.type: Any = type_
+        self.accepted, self.check = compile_type(type_, container_check, sample_size)
 
     def __set__(self, obj: Owner, value: Value) -> None:
-        if (isinstance(value, bool) and not issubclass(self.type, bool)) \
-                or not isinstance(value, self.type):
+        if type(value) not in self.accepted and not self.check(value):
             raise Exception(
                 f"The attribute '{obj.__class__.__name__}.{self.name}' "
-                f"is of type '{self.type.__name__}', not '{type(value).__name__}'")
+                f"is of type '{type_name(self.type)}', not '{type(value).__name__}'")
         super().__set__(obj, value)
 
 
-class _BaseHasCallback(BaseTrait):
+class _BaseHasCallback(BaseTrait[Owner, Value]):
     """
     A base trait for traits implementing callbacks on value change.
     This class should not be instantiated.
+
+    It implements the ``notify`` policies, which are described in
+    :class:`HasCallback`.
     """
-    pass
+    notify_policies = ('always', 'changed', 'identity', 'digest')
+    dispatch_modes = ('immediate', 'debounce', 'throttle')
 
+    # Calls the callbacks later for the debounce and throttle dispatch modes.
+    dispatcher = None
 
-class HasCallback(_BaseHasCallback, Generic[Owner, Value]):
+    def __init__(self, notify: Any = 'always', dispatch: str = 'immediate',
+                 interval: float = 0.1, scheduler: Any = None) -> None:
+        super().__init__()
+        if notify not in self.notify_policies and not callable(notify):
+            raise Exception(
+                f"notify must be one of {', '.join(self.notify_policies)} or a "
+                f"callable, not '{notify}'")
+        if dispatch not in self.dispatch_modes:
+            raise Exception(
+                f"dispatch must be one of {', '.join(self.dispatch_modes)}, "
+                f"not '{dispatch}'")
+
+        self.notify = notify
+        self.suppressed = 0
+        self.digests: WeakIdentityDictionary[Owner, bytes] = WeakIdentityDictionary()
+
+        self.dispatch = dispatch
+        if dispatch != 'immediate':
+            # The scheduler and its threads are only needed for delayed calls.
+            from .scheduling import DISPATCHERS
+            self.dispatcher = DISPATCHERS[dispatch](self.call_callbacks, interval, scheduler)
+
+    def call_callbacks(self, obj: Owner, old: Any, new: Any) -> None:
+        """
+        Calls the callbacks of the object. ``old`` is ``_MISSING`` if the
+        attribute was not set.
+        """
+        pass
+
+    def is_unchanged(self, obj: Owner, old: Any, new: Any) -> bool:
+        """
+        Returns True if the callbacks should not be called for setting the
+        attribute of the given object from ``old`` to ``new``, according to the
+        notify policy. ``old`` is ``_MISSING`` if the attribute was not set.
+        """
+        notify = self.notify
+        if notify == 'digest':
+            digest = self.digest(new)
+            if digest is not None:
+                unchanged = self.digests.get(obj) == digest
+                self.digests[obj] = digest
+                return unchanged
+            # The next buffer must not be compared with an older one.
+            self.digests.pop(obj, None)
+            notify = 'changed'
+
+        if old is _MISSING:
+            return False
+        if old is new:
+            return notify != 'always'
+        if notify == 'identity':
+            return False
+        if notify == 'changed':
+            if type(old) is type(new) and type(new) in _SCALAR_TYPES:
+                return old == new
+            try:
+                return bool(old == new)
+            except Exception:
+                # Some types, like numpy arrays, have no truth value for ==.
+                return False
+        return bool(notify(old, new))
+
+    @staticmethod
+    def digest(value: Any) -> Optional[bytes]:
+        """
+        Returns a digest of the value's buffer, or None if it does not support
+        the buffer protocol.
+        """
+        try:
+            view = memoryview(value)
+        except TypeError:
+            return None
+
+        # Only contiguous buffers can be hashed without copying them.
+        data = view.cast('B') if view.c_contiguous else view.tobytes()
+
+        import hashlib
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class HasCallback(_BaseHasCallback[Owner, Value]):
     """
     A trait which introduces callbacks which are called after the given
     attribute has been given a new value. The callbacks are callable
@@ -181,27 +447,124 @@ class HasCallback(_BaseHasCallback, Generic[Owner, Value]):
         foo = Foo()
 
         foo.bar = 3 # New value is: 3
+
+    To skip the callbacks when the value did not change, pass a ``notify``
+    policy:
+    ::
+
+        from traitlite import HasCallback
+
+        def print_value(value):
+            print('New value is:', value)
+
+        class Foo:
+            bar = HasCallback([print_value], notify='changed')
+
+        foo = Foo()
+
+        foo.bar = 3 # New value is: 3
+        foo.bar = 3 # Nothing is printed
+        print(Foo.bar.suppressed) # 1
+
+    The ``notify`` policy decides whether the callbacks are called when the
+    attribute is set:
+
+    * ``'always'``: on every assignment.
+    * ``'changed'``: only if the new value is not equal to the old value.
+    * ``'identity'``: only if the new value is not the old object.
+    * ``'digest'``: only if a digest of the new value differs from the digest of
+      the previous value. This works for large buffers such as ``bytes``,
+      ``bytearray`` and arrays, including ones which were changed in place.
+      Values which do not support the buffer protocol are compared with ``==``.
+    * A callable taking the old and new values, which returns True if the
+      values should be considered equal.
+
+    The number of assignments which did not call the callbacks is counted in
+    :attr:`suppressed`.
+
+    Attributes which change very often can delay their callbacks with a
+    ``dispatch`` mode:
+    ::
+
+        from traitlite import HasCallback
+
+        def print_value(value):
+            print('New value is:', value)
+
+        class Sensor:
+            reading = HasCallback([print_value], dispatch='throttle', interval=0.1)
+
+        sensor = Sensor()
+
+        for i in range(1000):
+            sensor.reading = i # Prints at most every 100 ms
+
+    * ``'immediate'``: the callbacks are called when the attribute is set.
+    * ``'debounce'``: the callbacks are called with the latest value once the
+      attribute was not set for ``interval`` seconds.
+    * ``'throttle'``: the callbacks are called at most once every ``interval``
+      seconds. The first change is passed on right away, and the latest value
+      is always passed on at the end of the interval.
+
+    Delayed callbacks are run by a single scheduler shared by all traits (see
+    :mod:`traitlite.scheduling`), so they are called from its thread rather
+    than from the one setting the attribute. For :class:`HasCallbackDelta`, the
+    old value is the value before the first delayed change.
     """
-    def __init__(self, callbacks: Optional[List[Callable[[Value], None]]] = None) -> None:
+    def __init__(self, callbacks: Optional[List[Callable[[Value], None]]] = None,
+                 notify: Any = 'always', dispatch: str = 'immediate',
+                 interval: float = 0.1, scheduler: Any = None) -> None:
         """
         :param callbacks: A list of callbacks to use for every instance of this trait.
         :type callbacks:  list
+        :param notify:    When to call the callbacks, see :class:`HasCallback`.
+        :type notify:     str or callable
+        :param dispatch:  ``'immediate'``, ``'debounce'`` or ``'throttle'``, see
+                          :class:`HasCallback`.
+        :type dispatch:   str
+        :param interval:  The interval in seconds for debouncing and throttling.
+        :type interval:   float
+        :param scheduler: The scheduler running the delayed callbacks. Defaults
+                          to a scheduler shared by all traits.
+        :type scheduler:  traitlite.scheduling.Scheduler
         """
-        super().__init__()
+        super().__init__(notify, dispatch, interval, scheduler)
 
         for callback in callbacks or []:
             self.check_callback(callback)
 
-        self.callbacks: DefaultWeakKeyDictionary[Any, List[Callable[[Value], None]]] = \
-            DefaultWeakKeyDictionary(lambda: copy.copy(callbacks or []))
+        self.callbacks: DefaultWeakIdentityDictionary[Any, List[Callable[[Value], None]]] = \
+            DefaultWeakIdentityDictionary(lambda: list(callbacks or []))
+        # Whether any instance can have callbacks. Until then, setting the
+        # attribute only stores the value.
+        self.has_callbacks = bool(callbacks)
 
     def __set__(self, obj: Owner, value: Value) -> None:
-        super().__set__(obj, value)
+        if not self.has_callbacks:
+            super().__set__(obj, value)
+            return
+
+        if self.notify == 'always':
+            old_value = _MISSING
+            super().__set__(obj, value)
+        else:
+            old_value = self.value.get(obj, _MISSING)
+            super().__set__(obj, value)
+            if self.is_unchanged(obj, old_value, value):
+                self.suppressed += 1
+                return
+
+        if self.dispatcher is not None:
+            self.dispatcher(obj, old_value, value)
+            return
 
         for callback in self.callbacks[obj]:
-            self.check_callback(callback)
             callback(value)
 
+    def call_callbacks(self, obj: Owner, old: Any, new: Value) -> None:
+        for callback in self.callbacks[obj]:
+            callback(new)
+
     def add_callback(self, obj: Owner, func: Callable[[Value], None]) -> None:
         """
         Adds a callback to be called after the value is changed. The callback
@@ -221,6 +584,7 @@ class HasCallback(_BaseHasCallback, Generic[Owner, Value]):
         """
         self.check_callback(func)
         self.callbacks[obj].append(func)
+        self.has_callbacks = True
 
     @staticmethod
     def check_callback(func: Callable[[Value], None]) -> None:
@@ -231,11 +595,11 @@ class HasCallback(_BaseHasCallback, Generic[Owner, Value]):
         :param func: A compatible callback function.
         :type func:  Callable[[Value], None]
         """
-        if len(inspect.signature(func).parameters) != 1:
+        if count_parameters(func) != 1:
             raise Exception('The callback must only take a single argument.')
 
 
-class HasCallbackDelta(_BaseHasCallback, Generic[Owner, Value]):
+class HasCallbackDelta(_BaseHasCallback[Owner, Value]):
     """
     A trait which introduces callbacks which are called after the given
     attribute has been given a new value. The callbacks are callable
@@ -276,29 +640,89 @@ class HasCallbackDelta(_BaseHasCallback, Generic[Owner, Value]):
 
         foo.bar = 3 # Old value: None, New value: 3
         foo.bar = 4 # Old value: 3, New value: 4
+
+    Like :class:`HasCallback`, a ``notify`` policy can be passed to skip the
+    callbacks when the value did not change, and a ``dispatch`` mode to
+    debounce or throttle them.
+
+    A list, dict or set which is changed in place and assigned again is both
+    the old and the new value. With ``snapshot=True``, the old value is an
+    immutable copy taken when it was set instead, see
+    :mod:`traitlite.snapshots`.
     """
-    def __init__(self, callbacks: Optional[List[Callable[[Value, Value], None]]] = None) -> None:
+    def __init__(self, callbacks: Optional[List[Callable[[Value, Value], None]]] = None,
+                 notify: Any = 'always', dispatch: str = 'immediate',
+                 interval: float = 0.1, scheduler: Any = None,
+                 snapshot: Any = False) -> None:
         """
         :param callbacks: A list of callbacks to use for every instance of this trait.
         :type callbacks:  list
+        :param notify:    When to call the callbacks, see :class:`HasCallback`.
+        :type notify:     str or callable
+        :param dispatch:  ``'immediate'``, ``'debounce'`` or ``'throttle'``, see
+                          :class:`HasCallback`.
+        :type dispatch:   str
+        :param interval:  The interval in seconds for debouncing and throttling.
+        :type interval:   float
+        :param scheduler: The scheduler running the delayed callbacks. Defaults
+                          to a scheduler shared by all traits.
+        :type scheduler:  traitlite.scheduling.Scheduler
+        :param snapshot:  Whether to pass a snapshot of the old value, or a
+                          function which returns the snapshot of a value.
+        :type snapshot:   bool or callable
         """
-        super().__init__()
+        super().__init__(notify, dispatch, interval, scheduler)
         for callback in callbacks or []:
             self.check_callback(callback)
 
-        self.callbacks: DefaultWeakKeyDictionary[Any, List[Callable[[Value, Value], None]]] = \
-            DefaultWeakKeyDictionary(lambda: copy.copy(callbacks or []))
+        self.callbacks: DefaultWeakIdentityDictionary[Any, List[Callable[[Value, Value], None]]] = \
+            DefaultWeakIdentityDictionary(lambda: list(callbacks or []))
+        self.callback_snapshot: Optional[Callable[[Value], Any]] = None
+        self.callback_snapshots: WeakIdentityDictionary[Owner, Any] = WeakIdentityDictionary()
+        if snapshot:
+            if snapshot is True:
+                from .snapshots import snapshot
+            self.callback_snapshot = snapshot
+        # Whether any instance can have callbacks. Until then, setting the
+        # attribute only stores the value. Snapshots are taken from the start,
+        # so that callbacks added later get them too.
+        self.has_callbacks = bool(callbacks) or self.callback_snapshot is not None
 
     def __set__(self, obj: Owner, value: Value) -> None:
+        if not self.has_callbacks:
+            super().__set__(obj, value)
+            return
+
         # Save a reference to the old value for the callback.
-        old_value = self.value.get(obj, None)
+        if self.callback_snapshot is None:
+            old_value = self.value.get(obj, _MISSING)
+        else:
+            old_value = self.callback_snapshots.get(obj, _MISSING)
+            if old_value is _MISSING:
+                # The value may have been stored without this trait.
+                old_value = self.value.get(obj, _MISSING)
 
         super().__set__(obj, value)
+        if self.callback_snapshot is not None:
+            self.callback_snapshots[obj] = self.callback_snapshot(self.value[obj])
+
+        if self.notify != 'always' and self.is_unchanged(obj, old_value, value):
+            self.suppressed += 1
+            return
+
+        if self.dispatcher is not None:
+            self.dispatcher(obj, old_value, value)
+        else:
+            self.call_callbacks(obj, old_value, value)
+
+    def call_callbacks(self, obj: Owner, old: Any, new: Value) -> None:
+        if old is _MISSING:
+            old = None
 
         # This provides the callback function with the old and new values,
         # respectively.
         for callback in self.callbacks[obj]:
-            callback(old_value, value)
+            callback(old, new)
 
     def add_callback(self, obj: Owner, func: Callable[[Value, Value], None]) -> None:
         """
@@ -321,6 +745,7 @@ class HasCallbackDelta(_BaseHasCallback, Generic[Owner, Value]):
         """
         self.check_callback(func)
         self.callbacks[obj].append(func)
+        self.has_callbacks = True
 
     @staticmethod
     def check_callback(func: Callable[[Value, Value], None]) -> None:
@@ -331,11 +756,11 @@ class HasCallbackDelta(_BaseHasCallback, Generic[Owner, Value]):
         :param func: A compatible callback function.
         :type func:  Callable[[Value, Value], None]
         """
-        if len(inspect.signature(func).parameters) != 2:
+        if count_parameters(func) != 2:
             raise Exception('The callback must take two arguments.')
 
 
-class _BaseHasValidator(BaseTrait):
+class _BaseHasValidator(BaseTrait[Owner, Value]):
     """
     A base class for traits implementing value validation. This should not
     be instantiated.
@@ -354,7 +779,7 @@ class _BaseHasValidator(BaseTrait):
         return super().__add__(other)
 
 
-class HasValidator(_BaseHasValidator, Generic[Owner, Value]):
+class HasValidator(_BaseHasValidator[Owner, Value]):
     """
     A trait which introduces validators which are called before the given
     attribute is given a new value. The validators take the new value as
@@ -404,11 +829,21 @@ class HasValidator(_BaseHasValidator, Generic[Owner, Value]):
         for validator in validators or []:
             self.check_validator(validator)
 
-        self.validators: DefaultWeakKeyDictionary[Any, List[Callable[[Value], Value]]] = \
-            DefaultWeakKeyDictionary(lambda: copy.copy(validators or []))
+        self.validators: DefaultWeakIdentityDictionary[Any, List[Callable[[Value], Value]]] = \
+            DefaultWeakIdentityDictionary(lambda: list(validators or []))
+
+        # The validators compiled into a single function, for the instances
+        # which have had validators added and for all others.
+        self.pipelines: WeakIdentityDictionary[Any, Callable[[Value], Value]] = \
+            WeakIdentityDictionary()
+        self.default_pipeline = compile_validators(validators or [])
+        # Whether any instance can have validators. Until then, setting the
+        # attribute only stores the value.
+        self.has_validators = bool(validators)
 
     def __set__(self, obj: Owner, value: Value) -> None:
-        for validator in self.validators[obj]:
+        if self.has_validators:
+            validator = self.pipelines.get(obj, self.default_pipeline)
             value = validator(value)
         super().__set__(obj, value)
 
@@ -430,6 +865,8 @@ class HasValidator(_BaseHasValidator, Generic[Owner, Value]):
         """
         self.check_validator(func)
         self.validators[obj].append(func)
+        self.pipelines[obj] = compile_validators(self.validators[obj])
+        self.has_validators = True
 
     @staticmethod
     def check_validator(func: Callable[[Value], Value]):
@@ -440,11 +877,11 @@ class HasValidator(_BaseHasValidator, Generic[Owner, Value]):
         :param func: A compatible validator function.
         :type func:  Callable[[Value], Value]
         """
-        if len(inspect.signature(func).parameters) != 1:
+        if count_parameters(func) != 1:
             raise Exception('The validator must take a single argument.')
 
 
-class HasValidatorDelta(_BaseHasValidator, Generic[Owner, Value]):
+class HasValidatorDelta(_BaseHasValidator[Owner, Value]):
     """
     A trait which introduces validators which are called before the given
     attribute is given a new value. The validators take the new value as
@@ -486,30 +923,60 @@ class HasValidatorDelta(_BaseHasValidator, Generic[Owner, Value]):
         print(foo.bar) # 3
         foo.bar = -1
         print(foo.bar) # 3
+
+    Like :class:`HasCallbackDelta`, the validators can be given a snapshot of
+    the old value with ``snapshot=True``, see :mod:`traitlite.snapshots`.
     """
-    def __init__(self, validators: Optional[List[Callable[[Value, Value], Value]]] = None) -> None:
+    def __init__(self, validators: Optional[List[Callable[[Value, Value], Value]]] = None,
+                 snapshot: Any = False) -> None:
         """
         :param validators: A list of validators to use for every instance of this trait.
         :type validators:  list
+        :param snapshot:   Whether to pass a snapshot of the old value, or a
+                           function which returns the snapshot of a value.
+        :type snapshot:    bool or callable
         """
         super().__init__()
         for validator in validators or []:
             self.check_validator(validator)
 
-        self.validators: DefaultWeakKeyDictionary[Any, List[Callable[[Value, Value], Value]]] = \
-            DefaultWeakKeyDictionary(lambda: copy.copy(validators or []))
+        self.validators: \
+            DefaultWeakIdentityDictionary[Any, List[Callable[[Value, Value], Value]]] = \
+            DefaultWeakIdentityDictionary(lambda: list(validators or []))
+
+        # The validators compiled into a single function, for the instances
+        # which have had validators added and for all others.
+        self.pipelines: WeakIdentityDictionary[Any, Callable[[Value, Value], Value]] = \
+            WeakIdentityDictionary()
+        self.default_pipeline = compile_validators(validators or [], delta=True)
+        # Whether any instance can have validators. Until then, setting the
+        # attribute only stores the value.
+        self.has_validators = bool(validators)
+
+        self.validator_snapshot: Optional[Callable[[Value], Any]] = None
+        self.validator_snapshots: WeakIdentityDictionary[Owner, Any] = WeakIdentityDictionary()
+        if snapshot:
+            if snapshot is True:
+                from .snapshots import snapshot
+            self.validator_snapshot = snapshot
 
     def __set__(self, obj: Owner, value: Value) -> None:
-        old_value = self.value.get(obj, None)
-
-        # Each validator gets the output from the previous one as the
-        # old value.
-        for validator in self.validators[obj]:
-            prev_value = value
+        if self.has_validators:
+            if self.validator_snapshot is None:
+                old_value = self.value.get(obj, None)
+            else:
+                old_value = self.validator_snapshots.get(obj, _MISSING)
+                if old_value is _MISSING:
+                    old_value = self.value.get(obj, None)
+
+            # Each validator gets the output from the previous one as the
+            # old value.
+            validator = self.pipelines.get(obj, self.default_pipeline)
             value = validator(old_value, value)
-            old_value = prev_value
 
         super().__set__(obj, value)
+        if self.validator_snapshot is not None:
+            self.validator_snapshots[obj] = self.validator_snapshot(self.value[obj])
 
     def add_validator(self, obj: Owner, func: Callable[[Value, Value], Value]) -> None:
         """
@@ -528,6 +995,8 @@ class HasValidatorDelta(_BaseHasValidator, Generic[Owner, Value]):
         """
         self.check_validator(func)
         self.validators[obj].append(func)
+        self.pipelines[obj] = compile_validators(self.validators[obj], delta=True)
+        self.has_validators = True
 
     @staticmethod
     def check_validator(func: Callable[[Value, Value], Value]):
@@ -538,5 +1007,8 @@ class HasValidatorDelta(_BaseHasValidator, Generic[Owner, Value]):
         :param func: A compatible validator function.
         :type func:  Callable[[Value], Value]
         """
-        if len(inspect.signature(func).parameters) != 2:
+        # Inline validators only look at the new value.
+        if isinstance(func, InlineValidator):
+            return
+        if count_parameters(func) != 2:
             raise Exception('The validator must take two arguments.')
@@ -0,0 +1,245 @@
+"""
+Compiles type annotations into checker functions for :class:`TypeChecked`.
+
+An annotation is compiled once into a function which takes a value and returns
+whether it matches. Plain classes, ``Any``, ``Optional``, ``Union``,
+``Literal``, runtime checkable protocols and the ``List``, ``Set``,
+``FrozenSet``, ``Dict``, ``Tuple`` generics (and their ``collections.abc``
+equivalents) are supported.
+
+Whether a value matches an annotation often only depends on its type. For those
+annotations, the types of accepted values are remembered, so that later values
+of the same type can be accepted with a single set lookup.
+"""
+from __future__ import annotations
+
+import abc
+import sys
+from itertools import islice
+
+# Avoid importing typing at runtime, see traits.py.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterable, Set, Tuple
+
+    Checker = Callable[[Any], bool]
+
+
+CONTAINER_CHECKS = ('full', 'first', 'sample')
+
+
+def type_name(type_: Any) -> str:
+    """Returns a readable name for a class or annotation."""
+    if isinstance(type_, type) and getattr(type_, '__origin__', None) is None:
+        return type_.__name__
+    return str(type_).replace('typing.', '')
+
+
+def compile_type(type_: Any, container_check: str = 'full',
+                 sample_size: int = 16) -> Tuple[Set[type], Checker]:
+    """
+    Compiles an annotation into a checker function.
+
+    Returns a set of types for which every value is known to match, and the
+    checker itself. The set grows as the checker accepts new types, so a value
+    whose exact type is in the set does not need to be checked again.
+
+    :param type_:           The class or annotation to check against.
+    :type type_:            type
+    :param container_check: How the elements of containers are checked: all of
+                            them (``'full'``), only the first ``sample_size``
+                            (``'first'``) or ``sample_size`` randomly chosen ones
+                            (``'sample'``). Sets and mappings cannot be sampled
+                            randomly without a full scan, so ``'sample'`` checks
+                            their first elements instead.
+    :type container_check:  str
+    :param sample_size:     The number of elements to check for ``'first'`` and
+                            ``'sample'``.
+    :type sample_size:      int
+    """
+    if container_check not in CONTAINER_CHECKS:
+        raise Exception(
+            f"container_check must be one of {', '.join(CONTAINER_CHECKS)}, "
+            f"not '{container_check}'")
+
+    compiler = _Compiler(container_check, sample_size)
+    check, by_type = compiler.compile(type_)
+
+    accepted: Set[type] = set()
+    if not by_type:
+        return accepted, check
+
+    # Exact instances of a plain class are accepted without calling the checker.
+    if isinstance(type_, type) and getattr(type_, '__origin__', None) is None:
+        accepted.add(type_)
+
+    def check_and_remember(value: Any) -> bool:
+        if check(value):
+            accepted.add(type(value))
+            return True
+        return False
+
+    return accepted, check_and_remember
+
+
+class _Compiler:
+    """
+    Turns annotations into checkers. Every compile method returns the checker
+    and whether the result of the checker only depends on the type of the
+    value.
+    """
+    def __init__(self, container_check: str, sample_size: int) -> None:
+        self.container_check = container_check
+        self.sample_size = sample_size
+
+    def compile(self, type_: Any) -> Tuple[Checker, bool]:
+        # Annotations come from typing, which has then already been imported
+        # by whoever created them.
+        loaded = sys.modules.get('typing')
+
+        # Any is a class itself in newer python versions.
+        if loaded is not None and type_ is loaded.Any:
+            return (lambda value: True), True
+        if isinstance(type_, type) and getattr(type_, '__origin__', None) is None:
+            return self.compile_class(type_)
+
+        import typing
+
+        origin = getattr(type_, '__origin__', None)
+        args = [arg for arg in getattr(type_, '__args__', None) or ()
+                if not isinstance(arg, typing.TypeVar)]
+
+        if origin is typing.Union or type(type_).__name__ == 'UnionType':
+            return self.compile_union(args)
+        if origin is getattr(typing, 'Literal', None):
+            return self.compile_literal(args)
+        if origin is tuple:
+            return self.compile_tuple(args)
+        if isinstance(origin, type):
+            from collections.abc import Collection, Mapping
+
+            if not args:
+                return self.compile_class(origin)
+            if issubclass(origin, Mapping) and len(args) == 2:
+                return self.compile_mapping(origin, *args)
+            if issubclass(origin, Collection) and len(args) == 1:
+                return self.compile_collection(origin, args[0])
+
+        raise Exception(f"TypeChecked does not support '{type_name(type_)}'")
+
+    def compile_class(self, class_: type) -> Tuple[Checker, bool]:
+        if getattr(class_, '_is_protocol', False):
+            if not getattr(class_, '_is_runtime_protocol', False):
+                raise Exception(
+                    f"The protocol '{class_.__name__}' must be runtime_checkable")
+            # Protocols look at the attributes of each value, not its type.
+            return (lambda value: isinstance(value, class_)), False
+
+        # Bool is a subclass of int, but the two are not interchangeable.
+        if issubclass(bool, class_) and class_ is not bool:
+            def check(value: Any) -> bool:
+                return isinstance(value, class_) and not isinstance(value, bool)
+        else:
+            def check(value: Any) -> bool:
+                return isinstance(value, class_)
+
+        # Metaclasses with their own instance checks may look at the value.
+        by_type = type(class_) is type or isinstance(class_, abc.ABCMeta)
+        return check, by_type
+
+    def compile_union(self, args: list) -> Tuple[Checker, bool]:
+        compiled = [self.compile(arg) for arg in args]
+        checks = tuple(check for check, _ in compiled)
+
+        def check(value: Any) -> bool:
+            for check_arg in checks:
+                if check_arg(value):
+                    return True
+            return False
+
+        return check, all(by_type for _, by_type in compiled)
+
+    def compile_literal(self, args: list) -> Tuple[Checker, bool]:
+        # Compare types as well, so that Literal[1] accepts neither True nor 1.0.
+        allowed = frozenset((type(arg), arg) for arg in args)
+
+        def check(value: Any) -> bool:
+            try:
+                return (type(value), value) in allowed
+            except TypeError:
+                # Unhashable values cannot be literals.
+                return False
+
+        return check, False
+
+    def compile_tuple(self, args: list) -> Tuple[Checker, bool]:
+        if len(args) == 2 and args[1] is Ellipsis:
+            return self.compile_collection(tuple, args[0])
+
+        # Tuple[()] is the empty tuple.
+        if args == [()]:
+            args = []
+        checks = tuple(self.compile(arg)[0] for arg in args)
+        length = len(checks)
+
+        def check(value: Any) -> bool:
+            if not isinstance(value, tuple) or len(value) != length:
+                return False
+            for check_item, item in zip(checks, value):
+                if not check_item(item):
+                    return False
+            return True
+
+        return check, False
+
+    def compile_collection(self, origin: type, item_type: Any) -> Tuple[Checker, bool]:
+        check_item, _ = self.compile(item_type)
+        select = self.selector()
+
+        def check(value: Any) -> bool:
+            if not isinstance(value, origin):
+                return False
+            for item in select(value):
+                if not check_item(item):
+                    return False
+            return True
+
+        return check, False
+
+    def compile_mapping(self, origin: Any, key_type: Any,
+                        value_type: Any) -> Tuple[Checker, bool]:
+        check_key, _ = self.compile(key_type)
+        check_value, _ = self.compile(value_type)
+        select = self.selector()
+
+        def check(value: Any) -> bool:
+            if not isinstance(value, origin):
+                return False
+            for key in select(value):
+                if not check_key(key) or not check_value(value[key]):
+                    return False
+            return True
+
+        return check, False
+
+    def selector(self) -> Callable[[Any], Iterable[Any]]:
+        """Returns a function which picks the elements of a container to check."""
+        size = self.sample_size
+        if self.container_check == 'full':
+            return iter
+
+        def first(container: Any) -> Iterable[Any]:
+            return islice(container, size)
+
+        if self.container_check == 'first':
+            return first
+
+        import random
+        from collections.abc import Sequence
+
+        def sample(container: Any) -> Iterable[Any]:
+            if len(container) <= size or not isinstance(container, Sequence):
+                return first(container)
+            return (container[i] for i in random.sample(range(len(container)), size))
+
+        return sample
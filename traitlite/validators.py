@@ -0,0 +1,161 @@
+"""
+Compiles the validators of :class:`~traitlite.traits.HasValidator` and
+:class:`~traitlite.traits.HasValidatorDelta` into a single function.
+
+Instead of looping over the validators on every assignment, the list of
+validators is turned into the source of one function which calls them one
+after the other, and which is only rebuilt when a validator is added. The
+declarative validators :class:`Bounds` and :class:`Predicate` are written out
+inline, so they do not cost a function call at all.
+"""
+from __future__ import annotations
+
+# Avoid importing typing at runtime, see traits.py.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class InlineValidator:
+    """
+    The base class of validators which the compiler writes out inline. They
+    can be used with both :class:`~traitlite.traits.HasValidator` and
+    :class:`~traitlite.traits.HasValidatorDelta`, and only look at the new
+    value.
+    """
+    _validate: Optional[Callable[[Any], Any]] = None
+
+    def __call__(self, value: Any) -> Any:
+        if self._validate is None:
+            self._validate = compile_validators([self])
+        return self._validate(value)
+
+    def inline(self, name: str, prefix: str, namespace: Dict[str, Any]) -> List[str]:
+        """
+        Returns the indented lines which validate the variable ``name``. Any
+        objects they need are added to the namespace with names starting
+        with ``prefix``.
+        """
+        return []
+
+
+class Bounds(InlineValidator):
+    """
+    A validator which makes sure the value lies between ``low`` and ``high``
+    (inclusive), either by raising an exception or by clamping it.
+    ::
+
+        from traitlite import Bounds, HasValidator
+
+        class Foo:
+            percentage = HasValidator([Bounds(0, 100, clamp=True)])
+            count = HasValidator([Bounds(low=0)])
+
+        foo = Foo()
+        foo.percentage = 120
+        print(foo.percentage) # 100
+        foo.count = -1 # Raises an exception
+    """
+    def __init__(self, low: Any = None, high: Any = None, clamp: bool = False) -> None:
+        """
+        :param low:   The lowest allowed value, or None for no lower bound.
+        :param high:  The highest allowed value, or None for no upper bound.
+        :param clamp: Whether values outside of the bounds are replaced by the
+                      nearest bound instead of raising an exception.
+        :type clamp:  bool
+        """
+        self.low = low
+        self.high = high
+        self.clamp = clamp
+
+    def inline(self, name: str, prefix: str, namespace: Dict[str, Any]) -> List[str]:
+        namespace[f'{prefix}_error'] = self.error
+        lines = []
+        for bound, comparison, suffix in [(self.low, '<', 'low'), (self.high, '>', 'high')]:
+            if bound is None:
+                continue
+            bound_name = f'{prefix}_{suffix}'
+            namespace[bound_name] = bound
+            lines.append(f'    if {name} {comparison} {bound_name}:')
+            if self.clamp:
+                lines.append(f'        {name} = {bound_name}')
+            else:
+                lines.append(f'        {prefix}_error({name})')
+        return lines
+
+    def error(self, value: Any) -> None:
+        raise Exception(f'The value {value!r} is not between {self.low} and {self.high}')
+
+
+class Predicate(InlineValidator):
+    """
+    A validator which raises an exception if the given function returns False
+    for the value. The value itself is never changed.
+    ::
+
+        from traitlite import HasValidator, Predicate
+
+        class Foo:
+            name = HasValidator([Predicate(str.isidentifier, 'must be an identifier')])
+
+        foo = Foo()
+        foo.name = 'a b' # Raises an exception
+    """
+    def __init__(self, func: Callable[[Any], bool], message: str = 'is not valid') -> None:
+        """
+        :param func:    A function which returns whether a value is valid.
+        :type func:     callable
+        :param message: The end of the exception message, after the value.
+        :type message:  str
+        """
+        self.func = func
+        self.message = message
+
+    def inline(self, name: str, prefix: str, namespace: Dict[str, Any]) -> List[str]:
+        namespace[f'{prefix}_func'] = self.func
+        namespace[f'{prefix}_error'] = self.error
+        return [f'    if not {prefix}_func({name}):',
+                f'        {prefix}_error({name})']
+
+    def error(self, value: Any) -> None:
+        raise Exception(f'The value {value!r} {self.message}')
+
+
+def compile_validators(validators: Sequence[Callable], delta: bool = False) -> Callable:
+    """
+    Returns a function which runs the given validators one after the other.
+    It takes the new value, or the old and new values if ``delta`` is True,
+    and returns the validated value.
+
+    For ``delta``, every validator gets the value before the previous
+    validator as the old value, like :class:`~traitlite.traits.HasValidatorDelta`.
+    """
+    namespace: Dict[str, Any] = {}
+    lines = []
+
+    # Whether the value before the current validator is needed as the old
+    # value of a later validator.
+    needs_old = [False] * len(validators)
+    later_delta = False
+    for i in reversed(range(len(validators))):
+        needs_old[i] = later_delta
+        later_delta = later_delta or not isinstance(validators[i], InlineValidator)
+
+    for i, validator in enumerate(validators):
+        if delta and needs_old[i]:
+            lines.append('    previous = value')
+
+        if isinstance(validator, InlineValidator):
+            lines.extend(validator.inline('value', f'_v{i}', namespace))
+        else:
+            namespace[f'_v{i}'] = validator
+            arguments = 'old, value' if delta else 'value'
+            lines.append(f'    value = _v{i}({arguments})')
+
+        if delta and needs_old[i]:
+            lines.append('    old = previous')
+
+    parameters = 'old, value' if delta else 'value'
+    source = f'def validate({parameters}):\n' + '\n'.join(lines + ['    return value'])
+    exec(source, namespace)
+    return namespace['validate']
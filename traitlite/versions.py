@@ -0,0 +1,301 @@
+"""
+Consistent reads of several attributes of an object while other threads
+change them.
+
+Each trait stores its values separately, so a thread reading two attributes
+while another thread sets both can see the old value of one and the new
+value of the other. The traits of a :func:`versioned` class instead keep
+all values of an object in one version, a dict which is never changed once
+it has been published. Setting an attribute publishes a new version, and
+:func:`transaction` publishes several changes at once. :func:`snapshot`
+gives a view of the current version:
+::
+
+    from traitlite import TypeChecked, snapshot, transaction, versioned
+
+    @versioned
+    class Account:
+        balance = TypeChecked(int)
+        pending = TypeChecked(int)
+
+    account = Account()
+    with transaction(account):
+        account.balance = 100
+        account.pending = 0
+
+    # In another thread:
+    with transaction(account):
+        account.balance -= 10
+        account.pending += 10
+
+    # In a reader thread, this always sees both or neither change:
+    with snapshot(account) as view:
+        total = view.balance + view.pending
+
+Readers do not take locks: publishing a version replaces a single reference,
+which is atomic, and a snapshot holds the values of one version. Writers to
+the same object take a lock, so they do not lose each other's changes. Old
+versions and their snapshots are reclaimed like any other object once no
+reader refers to them.
+
+Inside a transaction, the thread running it reads its own changes, and other
+threads read the last published version. If the transaction raises an
+exception, its changes are discarded. Validators and callbacks run when an
+attribute is set, not when the transaction is published.
+"""
+from __future__ import annotations
+
+import threading
+from collections.abc import MutableMapping
+
+from .frozen import trait_names
+from .weakref_utilities import WeakIdentityDictionary
+
+# Avoid importing typing at runtime, see traits.py.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterator, Optional, Tuple, Type, TypeVar
+
+    from .traits import Owner
+
+    T = TypeVar('T')
+
+
+class _Versions:
+    """The versions of an object: the published one and the one being written."""
+    __slots__ = ('current', 'pending', 'writer', 'depth', 'lock', 'snapshot')
+
+    def __init__(self) -> None:
+        self.current: Dict[str, Any] = {}
+        # The version changed by the transaction of the writer thread.
+        self.pending: Optional[Dict[str, Any]] = None
+        self.writer: Optional[int] = None
+        self.depth = 0
+        self.lock = threading.RLock()
+        # The published version with its snapshot, until the next version
+        # is published.
+        self.snapshot: Optional[Tuple[Dict[str, Any], Snapshot]] = None
+
+    def visible(self) -> Dict[str, Any]:
+        """Returns the version the current thread reads."""
+        if self.pending is not None and self.writer == threading.get_ident():
+            return self.pending
+        return self.current
+
+
+# The versions of all objects of versioned classes. Creating an entry is
+# guarded by a lock, so that threads do not create two for the same object.
+_versions: WeakIdentityDictionary[Any, _Versions] = WeakIdentityDictionary()
+_versions_lock = threading.Lock()
+
+
+def _versions_of(obj: Owner) -> _Versions:
+    versions = _versions.get(obj)
+    if versions is None:
+        with _versions_lock:
+            versions = _versions.get(obj)
+            if versions is None:
+                versions = _versions[obj] = _Versions()
+    return versions
+
+
+class VersionedStorage(MutableMapping):
+    """
+    The value storage of a trait of a :func:`versioned` class, which keeps
+    the values in the versions of their objects.
+    """
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __getitem__(self, key: Owner) -> Any:
+        versions = _versions.data.get(id(key))
+        if versions is None:
+            raise KeyError(key)
+        values = versions.current
+        if versions.pending is not None and versions.writer == threading.get_ident():
+            values = versions.pending
+        return values[self.name]
+
+    def get(self, key: Owner, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: Any) -> bool:
+        versions = _versions.get(key)
+        return versions is not None and self.name in versions.visible()
+
+    def __setitem__(self, key: Owner, value: Any) -> None:
+        versions = _versions_of(key)
+        with versions.lock:
+            if versions.pending is not None:
+                versions.pending[self.name] = value
+            else:
+                values = dict(versions.current)
+                values[self.name] = value
+                versions.current = values
+                versions.snapshot = None
+
+    def __delitem__(self, key: Owner) -> None:
+        versions = _versions_of(key)
+        with versions.lock:
+            if self.name not in versions.visible():
+                raise KeyError(key)
+            if versions.pending is not None:
+                del versions.pending[self.name]
+            else:
+                values = dict(versions.current)
+                del values[self.name]
+                versions.current = values
+                versions.snapshot = None
+
+    def __iter__(self) -> Iterator[Owner]:
+        for key in list(_versions):
+            if key in self:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} of {self.name!r}>'
+
+
+def versioned(cls: Type[T]) -> Type[T]:
+    """
+    A class decorator which keeps the values of all traits of the class,
+    including those of its base classes, in versions. See the module
+    documentation. Subclasses must be decorated as well.
+    """
+    for name in trait_names(cls):
+        trait = getattr(cls, name)
+        storage = trait.value
+        if isinstance(storage, VersionedStorage):
+            continue
+        if type(storage) is not WeakIdentityDictionary:
+            raise Exception(
+                f"The storage of '{cls.__name__}.{name}' cannot be versioned: "
+                f"{type(storage).__name__}")
+
+        trait.value = VersionedStorage(trait.name)
+        for key, value in storage.items():
+            trait.value[key] = value
+
+    setattr(cls, '__snapshot_class__', _snapshot_class(cls))
+    return cls
+
+
+class transaction:
+    """
+    A context manager which publishes all attributes set on an object in the
+    ``with`` block as one version, see the module documentation. Other
+    threads setting attributes of the object wait until it is published.
+    Transactions on the same object can be nested.
+    """
+    def __init__(self, obj: Owner) -> None:
+        self.obj = obj
+        self.versions = _versions_of(obj)
+
+    def __enter__(self) -> Any:
+        versions = self.versions
+        versions.lock.acquire()
+        if not versions.depth:
+            versions.pending = dict(versions.current)
+            versions.writer = threading.get_ident()
+        versions.depth += 1
+        return self.obj
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        versions = self.versions
+        versions.depth -= 1
+        # Nested transactions are part of the outermost one, which publishes
+        # or discards all changes.
+        if not versions.depth:
+            if exc_type is None and versions.pending is not None:
+                versions.current = versions.pending
+                versions.snapshot = None
+            versions.pending = None
+            versions.writer = None
+        versions.lock.release()
+
+
+class Snapshot:
+    """
+    The trait values of an object in one version, which are kept in slots
+    named after the traits. Each versioned class has its own subclass.
+    Snapshots cannot be changed, so a snapshot is shared by all readers of
+    the same version. Reading an attribute which was not set raises
+    AttributeError.
+
+    A snapshot is its own context manager, so it can be used in a ``with``
+    block or kept as it is.
+    """
+    __slots__: Tuple[str, ...] = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise Exception(f"'{self.__class__.__name__}' object is a snapshot")
+
+    def __delattr__(self, name: str) -> None:
+        raise Exception(f"'{self.__class__.__name__}' object is a snapshot")
+
+    def __enter__(self) -> Snapshot:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+    def __repr__(self) -> str:
+        values = ', '.join(f'{name}={getattr(self, name)!r}'
+                           for name in self.__slots__ if hasattr(self, name))
+        return f'{self.__class__.__name__}({values})'
+
+
+def _snapshot_class(cls: type) -> Type[Snapshot]:
+    names = trait_names(cls)
+    return type(f'{cls.__name__}Snapshot', (Snapshot,), {
+        '__slots__': names,
+        '__module__': cls.__module__,
+        '__qualname__': f'{cls.__qualname__}Snapshot',
+    })
+
+
+def _make_snapshot(snapshot_class: Type[Snapshot], values: Dict[str, Any]) -> Snapshot:
+    view = object.__new__(snapshot_class)
+    for name, value in values.items():
+        object.__setattr__(view, name, value)
+    return view
+
+
+def snapshot(obj: Owner) -> Snapshot:
+    """
+    Returns a :class:`Snapshot` of the current version of an object, see the
+    module documentation. The snapshot of a version is only created once.
+    Inside a transaction, the thread running it gets a snapshot of its
+    changes so far.
+    ::
+
+        with snapshot(account) as view:
+            total = view.balance + view.pending
+    """
+    # Subclasses of versioned classes must be versioned themselves, or
+    # their own traits would be missing from the snapshot.
+    snapshot_class = type(obj).__dict__.get('__snapshot_class__')
+    if snapshot_class is None:
+        raise Exception(f"'{type(obj).__name__}' is not a versioned class")
+
+    versions = _versions.data.get(id(obj))
+    if versions is None:
+        return _make_snapshot(snapshot_class, {})
+    if versions.pending is not None and versions.writer == threading.get_ident():
+        return _make_snapshot(snapshot_class, versions.pending)
+
+    # The published version and its snapshot are read separately, so the
+    # snapshot is only used if it belongs to the version.
+    values = versions.current
+    cached = versions.snapshot
+    if cached is not None and cached[0] is values:
+        return cached[1]
+    view = _make_snapshot(snapshot_class, values)
+    versions.snapshot = (values, view)
+    return view
@@ -1,22 +1,49 @@
-import collections
+from __future__ import annotations
+
 import weakref
+from collections.abc import MutableMapping, Set
+
+# Avoid importing typing at runtime, see traits.py.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import (
+        Any,
+        Callable,
+        Dict,
+        Iterable,
+        Iterator,
+        List,
+        Mapping,
+        Optional,
+        Tuple,
+        TypeVar,
+    )
+
+    KT = TypeVar('KT')
+    VT = TypeVar('VT')
 
-from typing import (
-    Any,
-    Callable,
-    Iterable,
-    Iterator,
-    List,
-    Mapping,
-    TypeVar,
-)
+    class _WeakKeyDictionary(weakref.WeakKeyDictionary, Mapping[KT, VT]):
+        pass
 
+    class _MutableMapping(MutableMapping[KT, VT]):
+        pass
+else:
+    class _WeakKeyDictionary(weakref.WeakKeyDictionary):
+        # WeakKeyDictionary is already a mapping at runtime, so the type
+        # arguments are only needed when type checking.
+        __class_getitem__ = classmethod(lambda cls, item: cls)
 
-KT = TypeVar('KT')
-VT = TypeVar('VT')
+    class _MutableMapping(MutableMapping):
+        __class_getitem__ = classmethod(lambda cls, item: cls)
 
+    # The type variables are only subscripted at runtime, which ignores them.
+    KT = VT = object
 
-class DefaultWeakKeyDictionary(weakref.WeakKeyDictionary, Mapping[KT, VT]):
+# Marks a missing value where None is a valid value.
+_MISSING = object()
+
+
+class DefaultWeakKeyDictionary(_WeakKeyDictionary[KT, VT]):
     def __init__(self, factory: Callable[[], VT]) -> None:
         super().__init__()
         self.factory = factory
@@ -27,8 +54,178 @@ class DefaultWeakKeyDictionary(weakref.WeakKeyDictionary, Mapping[KT, VT]):
         return super().__getitem__(key)
 
 
-class OrderedSet(collections.abc.Set):
-    def __init__(self, elements: Iterable[Any] = None) -> None:
+class WeakIdentityDictionary(_MutableMapping[KT, VT]):
+    """
+    A dictionary with weak references to its keys, like WeakKeyDictionary,
+    which compares the keys by identity. The keys' ``__hash__`` and ``__eq__``
+    are never called, so the cost of a lookup does not depend on them and
+    unhashable objects can be used as keys.
+
+    The values are stored by ``id()`` of the key. An entry is removed as soon
+    as its key is garbage collected, before the id can be reused.
+    """
+    def __init__(self) -> None:
+        self.data: Dict[int, VT] = {}
+        self.refs: Dict[int, weakref.KeyedRef] = {}
+
+        # The callback only has a weak reference to the dictionary, so that
+        # the keys do not keep it alive.
+        def remove(wr: weakref.KeyedRef, selfref=weakref.ref(self)) -> None:
+            self = selfref()
+            if self is not None:
+                self.collected(wr.key)
+        self._remove = remove
+
+    def collected(self, key_id: int) -> None:
+        """Removes the entry of a key which has been garbage collected."""
+        self.data.pop(key_id, None)
+        self.refs.pop(key_id, None)
+
+    def __getitem__(self, key: KT) -> VT:
+        return self.data[id(key)]
+
+    def __setitem__(self, key: KT, value: VT) -> None:
+        key_id = id(key)
+        if key_id not in self.refs:
+            self.refs[key_id] = weakref.KeyedRef(key, self._remove, key_id)
+        self.data[key_id] = value
+
+    def __delitem__(self, key: KT) -> None:
+        key_id = id(key)
+        del self.data[key_id]
+        # Dropping the reference also drops its callback.
+        del self.refs[key_id]
+
+    def __contains__(self, key: Any) -> bool:
+        return id(key) in self.data
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self.data.get(id(key), default)
+
+    def pop(self, key: KT, default: Any = _MISSING) -> VT:
+        key_id = id(key)
+        if key_id not in self.data:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        del self.refs[key_id]
+        return self.data.pop(key_id)
+
+    def __iter__(self) -> Iterator[KT]:
+        # Keys may be collected while iterating.
+        for wr in list(self.refs.values()):
+            key = wr()
+            if key is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} with {len(self)} entries>'
+
+
+class ObservedWeakIdentityDictionary(WeakIdentityDictionary[KT, VT]):
+    """
+    A :class:`WeakIdentityDictionary` which tells its observers about every
+    change, including entries removed because their key was collected. The
+    observers are objects with two methods, which get the id of the key:
+
+    * ``stored(key_id, old, new)``, after a value has been stored. ``old`` is
+      the previous value, or the module's ``_MISSING`` marker.
+    * ``removed(key_id, old)``, after an entry has been removed.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.observers: List[Any] = []
+
+    def __setitem__(self, key: KT, value: VT) -> None:
+        key_id = id(key)
+        old = self.data.get(key_id, _MISSING)
+        if old is _MISSING and key_id not in self.refs:
+            self.refs[key_id] = weakref.KeyedRef(key, self._remove, key_id)
+        self.data[key_id] = value
+        for observer in self.observers:
+            observer.stored(key_id, old, value)
+
+    def __delitem__(self, key: KT) -> None:
+        old = self.data[id(key)]
+        super().__delitem__(key)
+        for observer in self.observers:
+            observer.removed(id(key), old)
+
+    def pop(self, key: KT, default: Any = _MISSING) -> VT:
+        if key not in self:
+            return super().pop(key, default)
+        old = super().pop(key)
+        for observer in self.observers:
+            observer.removed(id(key), old)
+        return old
+
+    def collected(self, key_id: int) -> None:
+        old = self.data.get(key_id, _MISSING)
+        super().collected(key_id)
+        if old is not _MISSING:
+            for observer in self.observers:
+                observer.removed(key_id, old)
+
+    def key(self, key_id: int) -> Optional[KT]:
+        """Returns the key with the given id, or None if it is not in the dictionary."""
+        wr = self.refs.get(key_id)
+        return None if wr is None else wr()
+
+    def value_of(self, key_id: int, default: Any = _MISSING) -> Any:
+        """Returns the value of the key with the given id."""
+        return self.data.get(key_id, default)
+
+    def id_items(self) -> List[Tuple[int, VT]]:
+        """Returns the ids of the keys with their values."""
+        return list(self.data.items())
+
+
+def observe(obj: Any, observer: Any) -> ObservedWeakIdentityDictionary:
+    """
+    Adds an observer to the value storage of a trait, turning the storage
+    into an :class:`ObservedWeakIdentityDictionary` first if necessary. Traits
+    combined with each other share their storage, so several of them can
+    observe it. The observer is told about the values which are already
+    stored.
+    """
+    storage = obj.value
+    if not isinstance(storage, ObservedWeakIdentityDictionary):
+        if type(storage) is not WeakIdentityDictionary:
+            raise Exception(
+                f"The storage of '{obj.name}' cannot be observed: {type(storage).__name__}")
+        # The storage may already be in use, for example by the generated
+        # __init__ of a traited class, so it is changed in place rather than
+        # replaced. The weak references call back into the same object.
+        storage.__class__ = ObservedWeakIdentityDictionary
+        setattr(storage, 'observers', [])
+
+    for key_id, value in storage.id_items():
+        observer.stored(key_id, _MISSING, value)
+    storage.observers.append(observer)
+    return storage
+
+
+class DefaultWeakIdentityDictionary(WeakIdentityDictionary[KT, VT]):
+    """
+    A :class:`WeakIdentityDictionary` which creates missing values with the
+    given factory, like ``collections.defaultdict``.
+    """
+    def __init__(self, factory: Callable[[], VT]) -> None:
+        super().__init__()
+        self.factory = factory
+
+    def __getitem__(self, key: KT) -> VT:
+        key_id = id(key)
+        if key_id not in self.data:
+            self[key] = self.factory()
+        return self.data[key_id]
+
+
+class OrderedSet(Set):
+    def __init__(self, elements: Optional[Iterable[Any]] = None) -> None:
         super().__init__()
         self.data: List[Any] = []
 